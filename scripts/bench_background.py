@@ -0,0 +1,72 @@
+"""Benchmark: tło zastępcze (bez A1111) — stary gradient PIL linia po linii vs NumPy.
+
+Użycie:
+  python scripts/bench_background.py --repeat 5
+
+Dla każdego stylu z `visual.STYLES` i rozmiarów 720x1280 / 1080x1920 podaje
+średni czas renderu i obrazy/s (bez zapisu JPEG, bez tekstu).
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageDraw
+
+from yt_brainrot import visual
+
+SIZES = [(720, 1280), (1080, 1920)]
+
+
+def legacy_gradient(size):
+    """The previous fallback: one draw.line per row plus 30 random ellipses."""
+    img = Image.new('RGB', size, color=(30, 10, 40))
+    draw = ImageDraw.Draw(img)
+    for i in range(size[1]):
+        r = int(30 + (i / size[1]) * 200)
+        g = int(10 + (i / size[1]) * 120)
+        b = int(40 + (i / size[1]) * 160)
+        draw.line([(0, i), (size[0], i)], fill=(r, g, b))
+    for _ in range(30):
+        x, y = random.randint(0, size[0]), random.randint(0, size[1])
+        rr = random.randint(20, 200)
+        color = tuple(random.randint(100, 255) for _ in range(3))
+        draw.ellipse([x - rr, y - rr, x + rr, y + rr], outline=color, width=2)
+    return img
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def run(repeat: int):
+    rows = []
+    for size in SIZES:
+        rows.append(('legacy (PIL)', size, _time(lambda: legacy_gradient(size), repeat)))
+        for style in visual.STYLES:
+            rows.append((style, size, _time(lambda: visual.render_background(size, style=style, seed=1), repeat)))
+
+    print(f'{"style":<14} {"size":>10} {"seconds":>9} {"img/s":>7}')
+    for style, size, sec in rows:
+        print(f'{style:<14} {size[0]:>4}x{size[1]:<5} {sec:>9.3f} {1 / sec:>7.2f}')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark profili kodowania dla shortów ze statycznym tłem.
+
+Użycie:
+  python scripts/bench_encoding.py --duration 30
+  python scripts/bench_encoding.py --duration 30 --output scripts/bench_encoding.md
+
+Renderuje ten sam syntetyczny obraz + WAV przez `editor.create_short_single_pass`
+dla każdej kombinacji z `CASES` i wypisuje czas ścienny oraz rozmiar pliku.
+Z `--output` zapisuje tabelę w Markdown razem z hostem (CPU, liczba rdzeni)
+i wersją ffmpeg. Ostatni pomiar jest w `scripts/bench_encoding.md`.
+
+Porównuje profile na libx264; wybór kodera i presetu dla hosta robi
+`python scripts/encoders.py benchmark`.
+"""
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from yt_brainrot import editor
+from bench_render import make_fixture_image, make_fixture_wav
+
+# (profile, preset override, crf override)
+CASES = [
+    ('default', None, None),
+    ('default', 'medium', None),
+    ('still', 'medium', None),
+    ('still', None, None),
+    ('still', 'ultrafast', 23),
+]
+
+
+def _cpu_model() -> str:
+    try:
+        with open('/proc/cpuinfo', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _ffmpeg_version() -> str:
+    p = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, check=False)
+    # 'ffmpeg version 7.0.2-static https://...  Copyright (c) ...'
+    return (p.stdout.splitlines() or ['ffmpeg ?'])[0].split(' Copyright')[0].strip()
+
+
+def write_results(rows, duration: float, path: str):
+    """Write `rows` as a Markdown table with the host and ffmpeg build they were measured on."""
+    lines = [
+        '# Benchmark profili kodowania',
+        '',
+        f'Wygenerowane przez `python scripts/bench_encoding.py --duration {duration:g} --output {path}`',
+        f'({time.strftime("%Y-%m-%d")}).',
+        '',
+        f'- host: {_cpu_model()}, rdzenie: {os.cpu_count()}, {platform.system()} {platform.release()}',
+        f'- ffmpeg: {_ffmpeg_version()}',
+        f'- wejście: {duration:g} s audio, obraz 720x1280, wyjście 1080x1920, libx264',
+        '',
+        '| profile | preset | crf | wall [s] | size [KiB] |',
+        '|---|---|---:|---:|---:|',
+    ]
+    lines += [f'| {profile} | {preset} | {crf} | {wall:.1f} | {size / 1024:.0f} |'
+              for profile, preset, crf, wall, size in rows]
+    Path(path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def run(duration: float):
+    rows = []
+    with tempfile.TemporaryDirectory() as d:
+        workdir = Path(d)
+        image = make_fixture_image(workdir / 'bg.jpg')
+        audio = make_fixture_wav(workdir / 'speech.wav', duration)
+        for i, (profile, preset, crf) in enumerate(CASES):
+            out = workdir / f'case_{i}.mp4'
+            opts = editor.resolve_profile(profile, preset, crf, encoder='x264')
+            t0 = time.perf_counter()
+            editor.create_short_single_pass(str(image), str(audio), str(out),
+                                            profile=profile, preset=preset, crf=crf, encoder='x264')
+            rows.append((profile, opts['preset'], opts['crf'], time.perf_counter() - t0, out.stat().st_size))
+
+    print(f'{"profile":<9} {"preset":<10} {"crf":>3} {"wall [s]":>10} {"size [KiB]":>12}')
+    for profile, preset, crf, wall, size in rows:
+        print(f'{profile:<9} {preset:<10} {crf:>3} {wall:>10.1f} {size / 1024:>12.0f}')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--output', help='write the results table (Markdown) to this file')
+    args = parser.parse_args()
+    rows = run(args.duration)
+    if args.output:
+        write_results(rows, args.duration, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark: `piper` uruchamiany na każde zdanie vs długo żyjący proces (`piper_server`).
+
+Użycie:
+  python scripts/bench_piper.py --count 10                  # prawdziwy piper z PATH / PIPER_BIN
+  python scripts/bench_piper.py --fake --load-seconds 1.5   # zastępczy piper (bez modelu)
+
+Zastępczy piper to mały skrypt Pythona, który przy starcie czeka
+`--load-seconds` (ładowanie modelu ONNX), a na zdanie `--per-char` sekund na
+znak; obsługuje oba tryby (`--text/--output` i `--json-input`).
+"""
+import argparse
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from yt_brainrot import piper_server, tts
+
+FAKE_PIPER = '''#!{python}
+import json, sys, time, wave
+
+args = sys.argv[1:]
+time.sleep({load})
+
+
+def synth(text, out):
+    time.sleep({per_char} * len(text))
+    with wave.open(out, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(22050)
+        w.writeframes(b'\\x00\\x00' * 220 * max(1, len(text)))
+
+
+if '--json-input' in args:
+    for line in sys.stdin:
+        req = json.loads(line)
+        synth(req['text'], req['output_file'])
+        print(req['output_file'], flush=True)
+else:
+    synth(args[args.index('--text') + 1], args[args.index('--output') + 1])
+'''
+
+
+def make_fake_piper(directory, load_seconds: float = 1.0, per_char: float = 0.001) -> str:
+    """Write an executable stand-in for the piper CLI; returns its path."""
+    path = Path(directory) / 'piper'
+    path.write_text(FAKE_PIPER.format(python=sys.executable, load=load_seconds, per_char=per_char))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+SENTENCES = [
+    'Kot znalazł pilota do wszechświata.',
+    'Każde naciśnięcie zmieniało jedną regułę rzeczywistości.',
+    'Grawitacja działała tylko we wtorki.',
+    'Na końcu pilot sam wcisnął przycisk.',
+]
+
+
+def run(count: int, voice=None):
+    rows = []
+    with tempfile.TemporaryDirectory() as d:
+        texts = [SENTENCES[i % len(SENTENCES)] for i in range(count)]
+
+        t0 = time.perf_counter()
+        for i, text in enumerate(texts):
+            subprocess.run(tts._choose_piper_cmd(str(Path(d) / f'spawn_{i}.wav'), text, voice, None), check=True)
+        rows.append(('spawn per call', time.perf_counter() - t0))
+
+        proc = piper_server.PiperProcess(voice)
+        try:
+            t0 = time.perf_counter()
+            proc.synthesize(texts[0], str(Path(d) / 'warm_0.wav'))
+            first = time.perf_counter() - t0
+            for i, text in enumerate(texts[1:], start=1):
+                proc.synthesize(text, str(Path(d) / f'warm_{i}.wav'))
+            rows.append(('persistent', time.perf_counter() - t0))
+            rows.append(('  first call', first))
+        finally:
+            proc.close()
+
+    print(f'{"mode":<16} {"total [s]":>10} {"per call [ms]":>14}')
+    for mode, sec in rows:
+        n = 1 if mode.strip() == 'first call' else count
+        print(f'{mode:<16} {sec:>10.2f} {1000 * sec / n:>14.0f}')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--voice', default=None)
+    parser.add_argument('--fake', action='store_true', help='use a stand-in piper instead of the real one')
+    parser.add_argument('--load-seconds', type=float, default=1.0, help='stand-in model load time')
+    parser.add_argument('--per-char', type=float, default=0.001, help='stand-in synthesis time per character')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as d:
+        if args.fake:
+            os.environ['PIPER_BIN'] = make_fake_piper(d, args.load_seconds, args.per_char)
+        run(args.count, args.voice)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: dwuetapowy render (720x1280 + upscale) vs render jednoprzebiegowy.
+
+Użycie:
+  python scripts/bench_render.py --duration 30 --repeat 3
+
+Generuje syntetyczny obraz 720x1280 i WAV (sinus), a następnie mierzy czas
+ścienny i rozmiar pliku wynikowego dla obu ścieżek montażu.
+"""
+import argparse
+import math
+import struct
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from yt_brainrot import editor
+
+
+def make_fixture_wav(path: Path, duration: float, rate: int = 22050) -> Path:
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        frames = bytearray()
+        for i in range(int(duration * rate)):
+            frames += struct.pack('<h', int(8000 * math.sin(2 * math.pi * 220 * i / rate)))
+        w.writeframes(bytes(frames))
+    return path
+
+
+def make_fixture_image(path: Path, size=(720, 1280)) -> Path:
+    from PIL import Image, ImageDraw
+    img = Image.new('RGB', size, color='black')
+    draw = ImageDraw.Draw(img)
+    for y in range(0, size[1], 4):
+        draw.line([(0, y), (size[0], y)], fill=(30 + y % 200, 10 + y % 120, 40 + y % 160))
+    draw.ellipse((100, 300, 620, 820), outline=(255, 200, 40), width=6)
+    img.save(path, quality=85)
+    return path
+
+
+def two_step(image: Path, audio: Path, workdir: Path) -> Path:
+    small = workdir / 'two_step_small.mp4'
+    final = workdir / 'two_step.mp4'
+    editor.create_short_from_image(str(image), str(audio), str(small), width=720, height=1280)
+    editor.upscale_video_to_1080x1920(str(small), str(final))
+    return final
+
+
+def single_pass(image: Path, audio: Path, workdir: Path) -> Path:
+    final = workdir / 'single_pass.mp4'
+    editor.create_short_single_pass(str(image), str(audio), str(final))
+    return final
+
+
+def run(duration: float, repeat: int):
+    with tempfile.TemporaryDirectory() as d:
+        workdir = Path(d)
+        image = make_fixture_image(workdir / 'bg.jpg')
+        audio = make_fixture_wav(workdir / 'speech.wav', duration)
+        rows = []
+        for name, fn in [('two-step', two_step), ('single-pass', single_pass)]:
+            times = []
+            out = None
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                out = fn(image, audio, workdir)
+                times.append(time.perf_counter() - t0)
+            rows.append((name, min(times), out.stat().st_size))
+
+    print(f'{"path":<12} {"best wall [s]":>14} {"size [KiB]":>11}')
+    for name, best, size in rows:
+        print(f'{name:<12} {best:>14.2f} {size / 1024:>11.0f}')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    run(args.duration, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark: pojedyncze żądania txt2img vs `generate_images_a1111_batch`.
+
+Użycie:
+  python scripts/bench_sd_batch.py --count 8 --overhead 1.5 --per-image 0.8
+
+Uruchamia lokalny zastępczy serwer A1111, który dla każdego żądania czeka
+`overhead` sekund (ładowanie modelu/VAE, kolejka, kodowanie odpowiedzi) plus
+`per-image` sekund na każdy obraz, i porównuje czas N osobnych wywołań
+`generate_image_a1111` z jednym wywołaniem wsadowym (ten sam prompt, różne seedy).
+"""
+import argparse
+import base64
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from yt_brainrot import sd_a1111
+
+
+def _tiny_jpeg() -> str:
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new('RGB', (72, 128), color=(120, 40, 160)).save(buf, format='JPEG')
+    return base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def start_fake_a1111(overhead: float, per_image: float):
+    """Start a stand-in A1111 on a free localhost port; returns (server, host, stats)."""
+    image = _tiny_jpeg()
+    stats = {'requests': 0, 'images': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body: dict):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._send({'version': 'stand-in'})
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            n = int(payload.get('batch_size', 1)) * int(payload.get('n_iter', 1))
+            seed = payload.get('seed', -1)
+            if seed in (-1, None):
+                seed = int(time.time() * 1000) % 1_000_000
+            with lock:
+                stats['requests'] += 1
+                stats['images'] += n
+            time.sleep(overhead + per_image * n)
+            info = {'seed': seed, 'all_seeds': [seed + k for k in range(n)], 'prompt': payload.get('prompt')}
+            self._send({'images': [image] * n, 'info': json.dumps(info)})
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}', stats
+
+
+def run(count: int, overhead: float, per_image: float, max_batch: int):
+    server, host, stats = start_fake_a1111(overhead, per_image)
+    prompt = 'surreal meme style, absurd brainrot aesthetic'
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            outs = [str(Path(d) / f'bg_{i}.jpg') for i in range(count)]
+
+            stats.update(requests=0, images=0)
+            t0 = time.perf_counter()
+            for i, out in enumerate(outs):
+                sd_a1111.generate_image_a1111(prompt, out, host=host, width=720, height=1280,
+                                              seed=1000 + i, use_cache=False)
+            rows.append(('single', time.perf_counter() - t0, stats['requests']))
+
+            stats.update(requests=0, images=0)
+            t0 = time.perf_counter()
+            sd_a1111.generate_images_a1111_batch([prompt] * count, outs, host=host,
+                                                 seeds=[2000 + i for i in range(count)],
+                                                 max_batch=max_batch, use_cache=False)
+            rows.append((f'batch (max {max_batch})', time.perf_counter() - t0, stats['requests']))
+    finally:
+        server.shutdown()
+
+    print(f'{"mode":<16} {"wall [s]":>9} {"txt2img calls":>14}')
+    for mode, wall, calls in rows:
+        print(f'{mode:<16} {wall:>9.2f} {calls:>14}')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=8)
+    parser.add_argument('--overhead', type=float, default=1.5, help='simulated seconds per request')
+    parser.add_argument('--per-image', type=float, default=0.8, help='simulated seconds per image')
+    parser.add_argument('--max-batch', type=int, default=sd_a1111.MAX_BATCH)
+    args = parser.parse_args()
+    run(args.count, args.overhead, args.per_image, args.max_batch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""CLI wyboru kodera wideo (`yt_brainrot/encoders.py`).
+
+Użycie:
+  python scripts/encoders.py list                        # kodery dostępne w tym ffmpeg
+  python scripts/encoders.py benchmark --profile still   # zmierz i zapisz domyślny koder hosta
+  python scripts/encoders.py benchmark --metric vmaf --threshold 95 --encoders x264,x265
+  python scripts/encoders.py show                        # zapisany wybór
+  python scripts/encoders.py reset                       # wróć do libx264
+
+Benchmark koduje referencyjny short (1080x1920, `--seconds` s) każdym koderem
+i presetem, liczy SSIM/VMAF względem bezstratnej referencji i zapisuje
+najszybszy wariant z wynikiem >= progu w `ENCODER_FILE`.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from yt_brainrot import editor, encoders
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('list')
+    p = sub.add_parser('benchmark')
+    p.add_argument('--profile', choices=sorted(editor.ENCODING_PROFILES), action='append',
+                   help='profile(s) to benchmark (default: all)')
+    p.add_argument('--metric', choices=['ssim', 'vmaf'], default='ssim')
+    p.add_argument('--threshold', type=float, default=None, help='default: 0.98 SSIM / 93 VMAF')
+    p.add_argument('--seconds', type=float, default=5.0, help='length of the reference short')
+    p.add_argument('--encoders', default=None, help='comma separated subset of: ' + ','.join(encoders.ENCODERS))
+    p.add_argument('--size', default='1080x1920')
+    p.add_argument('--dry-run', action='store_true', help='do not save the choice')
+    sub.add_parser('show')
+    sub.add_parser('reset')
+    args = parser.parse_args()
+
+    if args.cmd == 'list':
+        usable = encoders.available()
+        for name, spec in encoders.ENCODERS.items():
+            state = 'available' if name in usable else 'unavailable'
+            print(f"{name:<7} {spec['codec']:<11} {'hw' if spec['hw'] else 'cpu':<4} {state}")
+    elif args.cmd == 'benchmark':
+        names = args.encoders.split(',') if args.encoders else None
+        width, height = (int(v) for v in args.size.lower().split('x'))
+        for profile in args.profile or sorted(editor.ENCODING_PROFILES):
+            print(f'== profile {profile}')
+            report = encoders.benchmark(profile, metric=args.metric, threshold=args.threshold,
+                                        seconds=args.seconds, encoders=names, size=(width, height),
+                                        save=not args.dry_run)
+            if report['choice']:
+                print(f"-> {report['choice']['encoder']} / {report['choice']['preset']}"
+                      f"{' (not saved)' if args.dry_run else ''}")
+            else:
+                print(f"-> nothing reached {report['metric']} {report['threshold']}; keeping the current default")
+    elif args.cmd == 'show':
+        print(json.dumps(encoders.load_choice() or {'profiles': {}, 'default': encoders.DEFAULT}, indent=2))
+    elif args.cmd == 'reset':
+        encoders.reset_choice()
+        print('host default:', encoders.DEFAULT)
+
+
+if __name__ == '__main__':
+    main()
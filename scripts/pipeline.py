@@ -2,14 +2,25 @@
 
 U7Cżycie:
   python scripts/pipeline.py --count 3 --outdir outputs --publish
+
+Przy --count > 1 etapy kolejnych shortów nakładają się (StageScheduler);
+--sequential przywraca wykonanie short po shorcie. Z --publish gotowe shorty
+trafiają do kolejki publikacji (`yt_brainrot/publish_queue.py`), którą
+opróżniają wątki w tle; na końcu wysyłane jest to, co jeszcze czeka.
 """
 import argparse
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from yt_brainrot import llm, tts, visual, editor, publisher
-from yt_brainrot import sd_a1111
+from yt_brainrot import registry
+from yt_brainrot.scheduler import StageScheduler
 import time
 
+# backends are imported on first use, so `--help` / `--count 0` start instantly
+llm, tts, visual, editor, publish_queue, sd_a1111 = (
+    registry.lazy(name) for name in ('llm', 'tts', 'visual', 'editor', 'publish_queue', 'sd'))
+
 
 def make_dirs(base: Path):
     for d in ['input', 'audio', 'images', 'videos', 'publish']:
@@ -24,49 +35,223 @@ def build_metadata(text: str) -> tuple[str, str, list[str]]:
     return title, description, tags
 
 
-def run_once(outdir: Path, index: int, publish: bool = False):
-    prompt = None
-    story = llm.generate_story(prompt)
-    print(f'LLM -> {story}')
+def prefetch_backgrounds(outdir: Path, stories: list[str], image_prompt: str | None = None,
+                         size: tuple[int, int] = (720, 1280), indices: list[int] | None = None) -> dict[int, Path]:
+    """Generate A1111 backgrounds for `stories` in as few txt2img calls as possible.
+
+    `indices` are the shorts' 1-based numbers (default 1..len(stories), like
+    `run_once`). Returns {index: image path}; empty when A1111 is unavailable so
+    each short falls back to its own generation.
+    """
+    if not stories or not sd_a1111.is_server_alive():
+        return {}
+    indices = indices or list(range(1, len(stories) + 1))
+    prompts = [image_prompt or story for story in stories]
+    outs = [str(outdir / 'images' / f'bg_{i}.jpg') for i in indices]
+    try:
+        results = sd_a1111.generate_images_a1111_batch(prompts, outs, width=size[0], height=size[1])
+    except Exception as e:
+        print('A1111 batch prefetch failed:', e)
+        return {}
+    print(f'A1111 prefetched {len(results)} backgrounds')
+    return {i: Path(r['path']) for i, r in zip(indices, results)}
+
+
+class BackgroundBatcher:
+    """Sends backgrounds to A1111 as stories finish, batching whatever is ready.
+
+    While one `generate_images_a1111_batch` call runs, later stories queue up;
+    the next call takes up to `max_batch` of them (default `SD_MAX_BATCH`).
+    `submit` returns a Future of {index: image path} for `stage_image`.
+    """
+
+    def __init__(self, outdir: Path, executor: ThreadPoolExecutor, max_batch: int | None = None):
+        self.outdir = outdir
+        self.max_batch = max_batch
+        self._executor = executor
+        self._pending: list[tuple[int, str, Future]] = []
+        self._lock = threading.Lock()
+        self._busy = False
+
+    def submit(self, index: int, story: str) -> Future:
+        fut = Future()
+        with self._lock:
+            self._pending.append((index, story, fut))
+            start, self._busy = not self._busy, True
+        if start:
+            self._executor.submit(self._drain)
+        return fut
+
+    def _drain(self):
+        n = max(1, self.max_batch or sd_a1111.MAX_BATCH)
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending[:n], self._pending[n:]
+                if not batch:
+                    self._busy = False
+                    return
+            try:
+                paths = prefetch_backgrounds(self.outdir, [story for _, story, _ in batch],
+                                             indices=[index for index, _, _ in batch])
+            except Exception as e:
+                print('A1111 batch prefetch failed:', e)
+                paths = {}
+            for index, _, fut in batch:
+                fut.set_result({index: paths[index]} if index in paths else {})
 
+
+def stage_story(index: int) -> str:
+    story = llm.generate_story(None)
+    print(f'[{index}] LLM -> {story}')
+    return story
+
+
+def stage_tts(outdir: Path, index: int, story: str) -> Path:
     audio_path = outdir / 'audio' / f'audio_{index}.wav'
     # default voice/speed can be configured via env vars or left None
     voice = os.environ.get('TTS_VOICE')
     speed = os.environ.get('TTS_SPEED')
-    meta = tts.tts_to_wav(story, str(audio_path), voice=voice, speed=float(speed) if speed else None)
-    print('TTS generated:', meta)
+    # TTS_WORKERS > 1 synthesizes sentence chunks in parallel (TTS_PAUSE_MS between them)
+    meta = tts.tts_to_wav_chunked(story, str(audio_path), voice=voice, speed=float(speed) if speed else None)
+    print(f'[{index}] TTS generated:', meta)
+    # may point into the TTS cache; meta['duration'] is also recorded in audio_info,
+    # so stage_video renders with it instead of probing the file again
+    return Path(meta['path'])
+
+
+def stage_story_tts(outdir: Path, index: int) -> tuple[str, Path]:
+    """Stream the story sentence by sentence into TTS; audio starts with the first sentence."""
+    audio_path = outdir / 'audio' / f'audio_{index}.wav'
+    voice = os.environ.get('TTS_VOICE')
+    speed = os.environ.get('TTS_SPEED')
+    t0 = time.perf_counter()
+    meta = tts.tts_sentences_to_wav(llm.stream_sentences(None), str(audio_path), voice=voice,
+                                    speed=float(speed) if speed else None)
+    story = meta['text']
+    print(f'[{index}] LLM -> {story}')
+    print(f"[{index}] TTS generated ({meta['sentences']} sentences, first audio after "
+          f"{meta['firstAudioSeconds']}s, total {time.perf_counter() - t0:.1f}s):", meta['path'])
+    return story, Path(meta['path'])
+
 
+def stage_image(outdir: Path, index: int, story: str, background: Future | None = None) -> Path:
     image_path = outdir / 'images' / f'bg_{index}.jpg'
-    # Generate at 720x1280 then upscale to 1080x1920 later to save VRAM
+    # Generate at 720x1280; the editor scales to 1080x1920 in the final encode
     small_size = (720, 1280)
+    prefetched = background.result().get(index) if background else None
+    if prefetched:
+        return prefetched
     try:
         if sd_a1111.is_server_alive():
-            print('A1111 server detected — generating via A1111 (720x1280)')
+            print(f'[{index}] A1111 server detected — generating via A1111 (720x1280)')
             sd_a1111.generate_image_a1111(story, str(image_path), width=small_size[0], height=small_size[1])
         else:
             raise RuntimeError('A1111 not available')
     except Exception:
-        print('A1111 not available — using fallback visual generator (PIL)')
-        visual.create_background_from_prompt(story, str(image_path), size=small_size)
-    print('Image generated:', image_path)
+        print(f'[{index}] A1111 not available — using fallback visual generator (PIL)')
+        visual.create_background_from_prompt(story, str(image_path), size=small_size,
+                                             style=os.environ.get('BG_STYLE', 'gradient'))
+    print(f'[{index}] Image generated:', image_path)
+    return image_path
 
-    # Create video at small resolution first
-    small_video = outdir / 'videos' / f'short_small_{index}.mp4'
-    editor.create_short_from_image(str(image_path), str(audio_path), str(small_video), width=small_size[0], height=small_size[1])
-    print('Small video created:', small_video)
 
-    # Upscale to final 1080x1920
+def stage_video(outdir: Path, index: int, image_path: Path, audio_path: Path, profile: str | None = None) -> Path:
+    # Render final 1080x1920 straight from the 720x1280 image (single encode);
+    # the encoder is VIDEO_ENCODER or the host's benchmarked default (scripts/encoders.py);
+    # BRAND_INTRO/BRAND_OUTRO are encoded once and attached by stream copy
     final_video = outdir / 'videos' / f'short_{index}.mp4'
-    editor.upscale_video_to_1080x1920(str(small_video), str(final_video))
-    print('Upscaled final video:', final_video)
+    editor.create_short_single_pass(str(image_path), str(audio_path), str(final_video), profile=profile,
+                                    **editor.segments.from_env())
+    print(f'[{index}] Final video created:', final_video)
+    return final_video
 
+
+def stage_publish(index: int, final_video: Path, story: str):
+    # the upload itself runs in the publish queue's workers (see main)
     title, description, tags = build_metadata(story)
+    try:
+        entry = publish_queue.get_queue().enqueue(str(final_video), title, description, tags)
+        print(f'[{index}] Queued for publish:', entry['key'][:12], entry['status'])
+    except Exception as e:
+        print(f'[{index}] Publish queue failed:', e)
+
+
+def finish_publish():
+    """Upload what is still due, then stop the workers; retries stay queued on disk."""
+    q = publish_queue.get_queue()
+    try:
+        for entry in q.drain():
+            print(f"Publish {entry['key'][:12]}: {entry['status']}", entry['error'] or entry['result'])
+    finally:
+        q.stop()
+    print('Publish queue:', q.counts())
+
+
+def run_once(outdir: Path, index: int, publish: bool = False, profile: str | None = None,
+             story: str | None = None, background: Future | None = None, stream_tts: bool = False) -> Path:
+    if story is None and stream_tts:
+        story, audio_path = stage_story_tts(outdir, index)
+    else:
+        if story is None:
+            story = stage_story(index)
+        audio_path = stage_tts(outdir, index, story)
+    image_path = stage_image(outdir, index, story, background)
+    final_video = stage_video(outdir, index, image_path, audio_path, profile)
     if publish:
-        try:
-            res = publisher.publish_to_postiz(str(final_video), title, description, tags)
-            print('Published:', res)
-        except Exception as e:
-            print('Publish failed (configure Postiz):', e)
+        stage_publish(index, final_video, story)
+    return final_video
+
+
+# Concurrency per stage: LLM and A1111 share one GPU, ffmpeg already uses all cores.
+STAGE_LIMITS = {'story': 1, 'tts': 2, 'image': 1, 'video': 1, 'publish': 1}
+
+
+def run_pipelined(base: Path, count: int, publish: bool = False, profile: str | None = None,
+                  image_prompt: str | None = None, limits: dict | None = None,
+                  max_in_flight: int = 3, stream_tts: bool = False) -> list:
+    """Run `count` shorts with overlapping stages; returns results in index order.
+
+    Each result is the final video path or the exception that stopped that short.
+    With `stream_tts` story and TTS run together in the 'story' stage.
+    """
+    limits = dict(STAGE_LIMITS, **(limits or {}))
+    with StageScheduler(limits, max_in_flight=max_in_flight) as sched, \
+            ThreadPoolExecutor(max_workers=1) as prefetch:
+        # With a shared image prompt the backgrounds do not depend on stories,
+        # so the whole run is batched on the GPU right away; otherwise each
+        # story's background is queued as soon as the story is written.
+        shared = None
+        if image_prompt:
+            shared = prefetch.submit(prefetch_backgrounds, base, [image_prompt] * count, image_prompt)
+        batcher = BackgroundBatcher(base, prefetch)
+
+        def job(index: int) -> Path:
+            if stream_tts:
+                story, audio_path = sched.run('story', stage_story_tts, base, index)
+                audio = Future()
+                audio.set_result(audio_path)
+            else:
+                story = sched.run('story', stage_story, index)
+                audio = sched.submit('tts', stage_tts, base, index, story)
+            background = shared if shared is not None else batcher.submit(index, story)
+            image = sched.submit('image', stage_image, base, index, story, background)
+            final_video = sched.run('video', stage_video, base, index, image.result(), audio.result(), profile)
+            if publish:
+                sched.run('publish', stage_publish, index, final_video, story)
+            return final_video
+
+        t0 = time.perf_counter()
+        results = sched.map(job, range(1, count + 1))
+        elapsed = time.perf_counter() - t0
+        stats = sched.stats()
+
+    done = sum(1 for r in results if not isinstance(r, Exception))
+    for i, r in enumerate(results, start=1):
+        print(f'[{i}]', 'FAILED:' if isinstance(r, Exception) else 'OK:', r)
+    print('Stage time [s]:', ', '.join(f"{k}={v['seconds']:.1f}" for k, v in stats.items()))
+    if elapsed > 0:
+        print(f'{done}/{count} shorts in {elapsed:.1f}s ({done * 3600 / elapsed:.1f} shorts/hour)')
+    return results
 
 
 def main():
@@ -74,14 +259,61 @@ def main():
     parser.add_argument('--count', type=int, default=1)
     parser.add_argument('--outdir', type=str, default='outputs')
     parser.add_argument('--publish', action='store_true')
+    parser.add_argument('--profile', choices=sorted(editor.ENCODING_PROFILES), default='default',
+                        help="encoding profile, e.g. 'still' for static backgrounds")
+    parser.add_argument('--encoder', choices=sorted(editor.encoders.ENCODERS), default=None,
+                        help='video encoder; default: VIDEO_ENCODER or the host benchmark choice')
+    parser.add_argument('--intro', type=str, default=None, help='intro image or clip (default: BRAND_INTRO)')
+    parser.add_argument('--outro', type=str, default=None, help='outro image or clip (default: BRAND_OUTRO)')
+    parser.add_argument('--image-prompt', type=str, default=None,
+                        help='shared A1111 prompt for all backgrounds (batched into few txt2img calls)')
+    parser.add_argument('--sequential', action='store_true',
+                        help='run shorts one after another instead of overlapping stages')
+    parser.add_argument('--stage-limit', action='append', default=[], metavar='STAGE=N',
+                        help=f'concurrency per stage (default: {STAGE_LIMITS})')
+    parser.add_argument('--max-in-flight', type=int, default=3,
+                        help='shorts being worked on at the same time')
+    parser.add_argument('--stream-tts', action='store_true',
+                        help='stream the story from Ollama and start TTS on the first finished sentence')
     args = parser.parse_args()
+    if args.encoder:
+        os.environ['VIDEO_ENCODER'] = args.encoder
+    if args.intro:
+        os.environ['BRAND_INTRO'] = args.intro
+    if args.outro:
+        os.environ['BRAND_OUTRO'] = args.outro
 
     base = Path(args.outdir)
     make_dirs(base)
 
-    for i in range(args.count):
-        run_once(base, i + 1, publish=args.publish)
-        time.sleep(1)
+    limits = {}
+    for item in args.stage_limit:
+        stage, _, n = item.partition('=')
+        if stage not in STAGE_LIMITS or not n.isdigit():
+            parser.error(f'invalid --stage-limit {item!r}')
+        limits[stage] = int(n)
+
+    if args.publish:
+        # uploads run next to generation at their own pace
+        publish_queue.get_queue().start()
+    try:
+        if args.sequential:
+            # short by short; only a shared image prompt lets backgrounds run ahead of the stories
+            with ThreadPoolExecutor(max_workers=1) as ex:
+                background = None
+                if args.image_prompt:
+                    background = ex.submit(prefetch_backgrounds, base, [args.image_prompt] * args.count,
+                                           args.image_prompt)
+                for i in range(args.count):
+                    run_once(base, i + 1, publish=args.publish, profile=args.profile, background=background,
+                             stream_tts=args.stream_tts)
+        else:
+            run_pipelined(base, args.count, publish=args.publish, profile=args.profile,
+                          image_prompt=args.image_prompt, limits=limits, max_in_flight=args.max_in_flight,
+                          stream_tts=args.stream_tts)
+    finally:
+        if args.publish:
+            finish_publish()
 
 
 if __name__ == '__main__':
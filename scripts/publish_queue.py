@@ -0,0 +1,71 @@
+"""CLI kolejki publikacji (`yt_brainrot/publish_queue.py`).
+
+Użycie:
+  python scripts/publish_queue.py list [--status queued|uploading|published|failed] [--limit 20]
+  python scripts/publish_queue.py stats
+  python scripts/publish_queue.py add outputs/videos/short_1.mp4 --title "..." --tags brainrot,shorts
+  python scripts/publish_queue.py drain [--workers 2]   # wyślij wszystko, co jest teraz do wysłania
+  python scripts/publish_queue.py retry KLUCZ           # ponów wpis w stanie failed
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from yt_brainrot import publish_queue
+
+
+def _line(entry: dict) -> str:
+    when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['updatedAt']))
+    extra = entry['error'] if entry['status'] != 'published' else json.dumps(entry['result'])
+    if entry['status'] == 'queued' and entry['attempts']:
+        extra = f"retry in {max(0, entry['nextAt'] - time.time()):.0f}s: {extra}"
+    return f"{entry['key'][:12]}  {entry['status']:<9} {entry['attempts']:>2}  {when}  {entry['video']}  {extra or ''}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('list')
+    p.add_argument('--status', default=None)
+    p.add_argument('--limit', type=int, default=20)
+    sub.add_parser('stats')
+    p = sub.add_parser('add')
+    p.add_argument('video')
+    p.add_argument('--title', default='')
+    p.add_argument('--description', default='')
+    p.add_argument('--tags', default='brainrot,shorts', help='comma separated')
+    p.add_argument('--key', default=None, help='idempotency key (default: SHA-256 of the video)')
+    p = sub.add_parser('drain')
+    p.add_argument('--workers', type=int, default=None)
+    p = sub.add_parser('retry')
+    p.add_argument('key')
+    args = parser.parse_args()
+
+    q = publish_queue.get_queue()
+    if args.cmd == 'list':
+        for entry in q.list(args.status, args.limit):
+            print(_line(entry))
+    elif args.cmd == 'stats':
+        print(json.dumps(q.stats(), indent=2))
+    elif args.cmd == 'add':
+        tags = [t for t in args.tags.split(',') if t]
+        print(_line(q.enqueue(args.video, args.title, args.description, tags, key=args.key)))
+    elif args.cmd == 'drain':
+        for entry in q.drain(args.workers):
+            print(_line(entry))
+        print(json.dumps(q.counts()))
+    elif args.cmd == 'retry':
+        matches = [e for e in q.list('failed', limit=1000) if e['key'].startswith(args.key)]
+        if len(matches) != 1:
+            parser.error(f'{len(matches)} failed entries match {args.key!r}')
+        print(_line(q.retry(matches[0]['key'])))
+
+
+if __name__ == '__main__':
+    main()
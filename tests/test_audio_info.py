@@ -0,0 +1,70 @@
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import wave
+from pathlib import Path
+import pytest
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import audio_info
+
+
+def _wav(path, seconds, rate=22050, channels=1, width=2):
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(b'\x00' * width * channels * int(seconds * rate))
+    return str(path)
+
+
+def test_wav_header_parsing(tmp_path):
+    assert audio_info.wav_duration(_wav(tmp_path / 'a.wav', 2.5)) == 2.5
+    assert audio_info.wav_duration(_wav(tmp_path / 'b.wav', 1.0, rate=48000, channels=2)) == 1.0
+
+    # streamed writer: sizes left as 0xFFFFFFFF, an odd-sized chunk before `fmt `
+    fmt = struct.pack('<HHIIHH', 1, 1, 16000, 32000, 2, 16)
+    junk = b'LIST' + struct.pack('<I', 3) + b'abc\x00'
+    streamed = tmp_path / 'streamed.wav'
+    streamed.write_bytes(b'RIFF' + struct.pack('<I', 0xFFFFFFFF) + b'WAVE' + junk
+                         + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+                         + b'data' + struct.pack('<I', 0xFFFFFFFF) + b'\x00' * 16000 * 2 * 3)
+    assert audio_info.wav_duration(str(streamed)) == 3.0
+
+    not_wav = tmp_path / 'x.wav'
+    not_wav.write_bytes(b'ID3 not really audio')
+    with pytest.raises(ValueError):
+        audio_info.wav_duration(str(not_wav))
+
+
+def test_duration_is_cached_by_mtime_and_remembered(tmp_path, monkeypatch):
+    audio_info.clear()
+    calls = []
+    real = audio_info.wav_duration
+    monkeypatch.setattr(audio_info, 'wav_duration', lambda p: calls.append(p) or real(p))
+    monkeypatch.setattr(audio_info, '_probe_duration', lambda p: pytest.fail('WAV must not be probed'))
+
+    path = _wav(tmp_path / 'speech.wav', 1.5)
+    assert audio_info.duration(path) == 1.5
+    assert audio_info.duration(path) == 1.5
+    assert len(calls) == 1
+
+    _wav(path, 4.0)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert audio_info.duration(path) == 4.0 and len(calls) == 2
+
+    other = _wav(tmp_path / 'tts.wav', 0.5)
+    audio_info.remember(other, 0.5)
+    assert audio_info.duration(other) == 0.5 and len(calls) == 2
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg not installed')
+def test_other_formats_fall_back_to_ffmpeg(tmp_path):
+    audio_info.clear()
+    out = tmp_path / 'tone.m4a'
+    subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'sine=duration=2', str(out)], check=True)
+    assert abs(audio_info.duration(str(out)) - 2.0) < 0.1
+    assert audio_info.stats()['probes'] == 1
+    assert audio_info.try_duration(str(tmp_path / 'missing.wav')) is None
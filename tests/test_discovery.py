@@ -0,0 +1,82 @@
+import json
+import socket
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import discovery, health, llm, tts
+
+
+def _isolate(monkeypatch, tmp_path):
+    monkeypatch.setenv('DISCOVERY_FILE', str(tmp_path / 'endpoints.json'))
+    monkeypatch.setattr(discovery, '_known', {})
+    monkeypatch.setattr(discovery, '_loaded', False)
+    health.reset()
+
+
+def _server():
+    """TTS stand-in that only answers form-encoded POSTs on /api/tts."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            hits.append(self.path)
+            form = self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded')
+            if self.path == '/api/tts' and form:
+                self.send_response(200)
+                self.send_header('Content-Type', 'audio/wav')
+                self.send_header('Content-Length', '4')
+                self.end_headers()
+                self.wfile.write(b'RIFF')
+            else:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}', hits
+
+
+def test_tts_endpoint_is_probed_once_and_persisted(tmp_path, monkeypatch):
+    _isolate(monkeypatch, tmp_path)
+    server, url, hits = _server()
+    try:
+        assert tts._try_http_tts(url, 'hej', str(tmp_path / 'a.wav'), None, None)
+        probes = len(hits)
+        assert probes > 1
+        assert tts._try_http_tts(url, 'hej', str(tmp_path / 'b.wav'), None, None)
+        assert len(hits) == probes + 1 and hits[-1] == '/api/tts'
+    finally:
+        server.shutdown()
+    saved = json.loads((tmp_path / 'endpoints.json').read_text())
+    assert saved[f'tts:{url}'] == {'path': '/api/tts', 'encoding': 'form', 'response': 'audio'}
+
+
+def test_unreachable_url_is_skipped(tmp_path, monkeypatch):
+    _isolate(monkeypatch, tmp_path)
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        url = f'http://127.0.0.1:{s.getsockname()[1]}'
+    calls = []
+    orig = discovery.discover
+
+    def counting(kind, base, candidates, attempt):
+        return orig(kind, base, candidates, lambda c, p: calls.append(c) or attempt(c, p))
+
+    monkeypatch.setattr(discovery, 'discover', counting)
+    assert llm._generate_http(url, 'x', 'm') is None
+    assert llm._generate_http(url, 'x', 'm') is None
+    assert calls == []  # health reports the URL down: no candidate is tried
+    assert health.status('ollama', url)['state'] == 'down'
@@ -0,0 +1,56 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+import pytest
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import editor, encoders
+
+
+def test_profiles_translate_per_encoder_and_host_default(tmp_path, monkeypatch):
+    monkeypatch.setenv('ENCODER_FILE', str(tmp_path / 'encoder.json'))
+    monkeypatch.delenv('VIDEO_ENCODER', raising=False)
+
+    opts = editor.resolve_profile('still')
+    assert opts['encoder'] == 'x264'
+    _, args, tail = encoders.ffmpeg_args(opts)
+    assert args[:6] == ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '20'] and '-tune' in args
+    assert tail == ''
+
+    _, args, _ = encoders.ffmpeg_args(editor.resolve_profile('still', encoder='x265'))
+    assert args[:6] == ['-c:v', 'libx265', '-preset', 'veryfast', '-crf', '24'] and '-tune' not in args
+    _, args, _ = encoders.ffmpeg_args(editor.resolve_profile('default', encoder='svtav1'))
+    assert args[:6] == ['-c:v', 'libsvtav1', '-preset', '5', '-crf', '30']
+    in_args, args, tail = encoders.ffmpeg_args(editor.resolve_profile('default', encoder='vaapi'))
+    assert in_args[0] == '-vaapi_device' and tail.endswith('hwupload') and '-qp' in args
+
+    (tmp_path / 'encoder.json').write_text(json.dumps(
+        {'profiles': {'still': {'encoder': 'x265', 'preset': 'ultrafast', 'score': 0.99}}}))
+    assert editor.resolve_profile('still')['encoder'] == 'x265'
+    assert editor.resolve_profile('still')['preset'] == 'ultrafast'
+    assert editor.resolve_profile('still', preset='medium')['preset'] == 'medium'
+    assert editor.resolve_profile('default')['encoder'] == 'x264'
+    monkeypatch.setenv('VIDEO_ENCODER', 'x264')
+    assert editor.resolve_profile('still')['encoder'] == 'x264'
+    with pytest.raises(ValueError):
+        editor.resolve_profile('still', encoder='mpeg1')
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg not installed')
+def test_benchmark_saves_fastest_encoder_meeting_quality(tmp_path, monkeypatch):
+    monkeypatch.setenv('ENCODER_FILE', str(tmp_path / 'encoder.json'))
+    monkeypatch.delenv('VIDEO_ENCODER', raising=False)
+    monkeypatch.setitem(encoders.ENCODERS, 'x264', dict(encoders.ENCODERS['x264'], presets=['ultrafast', 'medium']))
+    report = encoders.benchmark('still', metric='ssim', threshold=0.9, seconds=1.0, encoders=['x264'],
+                                size=(144, 256), log=lambda line: None)
+    assert [r['preset'] for r in report['results']] == ['ultrafast', 'medium']
+    assert all(r['ok'] and 0.9 <= r['score'] <= 1.0 for r in report['results'])
+    assert report['choice']['encoder'] == 'x264'
+    saved = encoders.load_choice()['profiles']['still']
+    assert saved['preset'] == report['choice']['preset'] and saved['metric'] == 'ssim'
+    assert editor.resolve_profile('still')['preset'] == saved['preset']
+
+    strict = encoders.benchmark('still', threshold=1.01, seconds=1.0, encoders=['x264'], size=(144, 256),
+                                save=False, log=lambda line: None)
+    assert strict['choice'] is None
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import health
+
+
+def test_ttl_cache_and_circuit_breaker(monkeypatch):
+    health.reset()
+    calls = []
+    up = {'value': True}
+
+    def check(target):
+        calls.append(target)
+        if not up['value']:
+            raise RuntimeError('refused')
+
+    monkeypatch.setitem(health.CHECKS, 'fake', (check, 60.0))
+    monkeypatch.setattr(health, 'FAILURES', 2)
+    monkeypatch.setattr(health, 'OPEN_SECONDS', 60.0)
+
+    assert health.is_up('fake', 'http://x') and health.is_up('fake', 'http://x/')
+    assert len(calls) == 1  # second call served from the TTL cache
+
+    up['value'] = False
+    health.report('fake', 'http://x', ok=False, error='reset')
+    assert not health.is_up('fake', 'http://x')
+    assert health.status('fake', 'http://x')['circuit'] == 'closed'
+    health.report('fake', 'http://x', ok=False, error='reset')
+    st = health.status('fake', 'http://x')
+    assert st['circuit'] == 'open' and st['state'] == 'down'
+    for _ in range(5):
+        assert not health.is_up('fake', 'http://x')
+    assert len(calls) == 1  # open circuit: no probes
+
+    health.report('fake', 'http://x', ok=True)
+    assert health.is_up('fake', 'http://x')
@@ -0,0 +1,94 @@
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import http_client
+
+
+def _server(statuses):
+    """Local HTTP/1.1 server answering with `statuses` in turn; records client ports."""
+    seen = {'ports': set(), 'hits': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            seen['ports'].add(self.client_address[1])
+            status = statuses[min(seen['hits'], len(statuses) - 1)]
+            seen['hits'] += 1
+            self.send_response(status)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        do_GET = do_POST = _reply
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}', seen
+
+
+def test_keep_alive_retries_and_stats(monkeypatch):
+    monkeypatch.setattr(http_client, 'BACKOFF', 0.0)
+    server, url, seen = _server([200])
+    try:
+        for _ in range(5):
+            assert http_client.get(url + '/ping', backend='health').status_code == 200
+        assert len(seen['ports']) == 1  # one pooled connection
+        st = http_client.stats()[url]
+        assert st['requests'] >= 5 and st['errors'] == 0
+    finally:
+        server.shutdown()
+
+    server, url, seen = _server([503, 503, 200])
+    try:
+        assert http_client.get(url, retries=2).status_code == 200
+        assert seen['hits'] == 3
+        seen['hits'] = 0
+        assert http_client.post(url, json={}).status_code == 503  # POST is not retried on 5xx
+        assert seen['hits'] == 1
+    finally:
+        server.shutdown()
+
+
+def test_post_is_not_retried_once_the_request_was_sent(monkeypatch):
+    import socket
+    import requests
+    monkeypatch.setattr(http_client, 'BACKOFF', 0.0)
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(8)
+    hits = []
+
+    def hang_up():
+        # read the request, then drop the connection without answering
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            hits.append(conn.recv(65536))
+            conn.close()
+
+    threading.Thread(target=hang_up, daemon=True).start()
+    url = f'http://127.0.0.1:{listener.getsockname()[1]}/generate'
+    try:
+        try:
+            http_client.post(url, json={'prompt': 'x'}, retries=2)
+        except requests.exceptions.ConnectionError:
+            pass
+        assert len(hits) == 1
+        try:
+            http_client.get(url, retries=2)
+        except requests.exceptions.ConnectionError:
+            pass
+        assert len(hits) == 4
+    finally:
+        listener.close()
@@ -0,0 +1,41 @@
+import base64
+import json
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import image_cache, sd_a1111
+from yt_brainrot.disk_cache import DiskCache
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, seed):
+        self._seed = seed
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'images': [base64.b64encode(b'JPEG%d' % self._seed).decode()],
+                'info': json.dumps({'seed': self._seed})}
+
+
+def test_repeat_payload_served_from_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cache, '_cache', DiskCache(tmp_path / 'cache', 1 << 20, '.img'))
+    monkeypatch.setattr(sd_a1111, 'is_server_alive', lambda host: True)
+    posts = []
+    monkeypatch.setattr(sd_a1111.http_client, 'post', lambda url, json, **kw: posts.append(json) or _Resp(1234))
+
+    first = sd_a1111.generate_image_a1111('kot', str(tmp_path / 'a.jpg'), width=720, height=1280)
+    again = sd_a1111.generate_image_a1111('kot', str(tmp_path / 'b.jpg'), width=720, height=1280)
+    by_seed = sd_a1111.generate_image_a1111('kot', str(tmp_path / 'c.jpg'), width=720, height=1280, seed=1234)
+    other = sd_a1111.generate_image_a1111('kot', str(tmp_path / 'd.jpg'), width=720, height=1280, steps=30)
+
+    # seed=-1 always asks A1111 again; the result is reachable by its resolved seed
+    assert len(posts) == 3
+    assert first['cached'] is False and again['cached'] is False and other['cached'] is False
+    assert by_seed['cached'] is True
+    assert by_seed['seed'] == 1234
+    assert (tmp_path / 'c.jpg').read_bytes() == b'JPEG1234'
@@ -0,0 +1,55 @@
+import sys
+import threading
+from pathlib import Path
+import pytest
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import jobs
+
+
+def test_job_progress_result_and_bounded_queue(tmp_path):
+    q = jobs.JobQueue(tmp_path / 'jobs.sqlite3', workers=1, max_queued=2)
+    release = threading.Event()
+    seen = {}
+
+    def work(job_id, update):
+        update({'steps': {'story': {'status': 'completed'}}})
+        seen['partial'] = q.get(job_id)['result']
+        release.wait(5)
+        return {'steps': {'story': {'status': 'completed'}, 'video': {'status': 'completed'}}}
+
+    def boom(job_id, update):
+        raise RuntimeError('ffmpeg missing')
+
+    first = q.submit('run-pipeline', work, payload={'storyPrompt': 'x'})
+    second = q.submit('run-pipeline', boom)
+    with pytest.raises(jobs.QueueFull):
+        q.submit('run-pipeline', work)
+    release.set()
+    q._pool.shutdown(wait=True)
+
+    assert seen['partial'] == {'steps': {'story': {'status': 'completed'}}}
+    done = q.get(first['jobId'])
+    assert done['status'] == 'completed' and 'video' in done['result']['steps']
+    assert done['payload'] == {'storyPrompt': 'x'}
+    failed = q.get(second['jobId'])
+    assert failed['status'] == 'failed' and failed['error'] == 'ffmpeg missing'
+    assert q.pending() == 0
+    assert [j['jobId'] for j in q.list()] == [second['jobId'], first['jobId']]
+
+
+def test_jobs_of_a_dead_worker_are_failed_on_startup(tmp_path):
+    db = tmp_path / 'jobs.sqlite3'
+    q = jobs.JobQueue(db)
+    live = q.submit('run-pipeline', lambda job_id, update: {})
+    q._pool.shutdown(wait=True)
+    with q._connect() as conn:
+        conn.execute("INSERT INTO jobs (id, kind, status, created, owner) VALUES "
+                     "('dead', 'run-pipeline', 'running', 0, ?), ('legacy', 'run-pipeline', 'queued', 0, NULL)",
+                     (f'{jobs._HOST}:{jobs.os.getpid()}:oldtoken',))
+
+    restarted = jobs.JobQueue(db)
+    for job_id in ('dead', 'legacy'):
+        job = restarted.get(job_id)
+        assert job['status'] == 'failed' and job['error'] == jobs.INTERRUPTED
+    assert restarted.get(live['jobId'])['status'] == 'completed'
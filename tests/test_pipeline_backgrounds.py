@@ -0,0 +1,39 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import pipeline
+
+
+def test_backgrounds_batch_stories_that_finish_while_a1111_is_busy(tmp_path, monkeypatch):
+    started, gate = threading.Event(), threading.Event()
+    calls = []
+
+    def batch(prompts, outs, width, height):
+        calls.append(list(prompts))
+        started.set()
+        gate.wait(5)
+        return [{'path': p} for p in outs]
+
+    monkeypatch.setattr(pipeline, 'sd_a1111', SimpleNamespace(
+        is_server_alive=lambda: True, generate_images_a1111_batch=batch, MAX_BATCH=2))
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        batcher = pipeline.BackgroundBatcher(tmp_path, ex)
+        futures = {1: batcher.submit(1, 'story 1')}
+        # stories 2-4 finish while the first call is still running
+        assert started.wait(5)
+        futures.update({i: batcher.submit(i, f'story {i}') for i in (2, 3, 4)})
+        gate.set()
+        results = {i: f.result(5) for i, f in futures.items()}
+
+    assert calls == [['story 1'], ['story 2', 'story 3'], ['story 4']]
+    assert results[3] == {3: tmp_path / 'images' / 'bg_3.jpg'}
+
+
+def test_backgrounds_fall_back_when_a1111_is_down(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'sd_a1111', SimpleNamespace(is_server_alive=lambda: False, MAX_BATCH=2))
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        assert pipeline.BackgroundBatcher(tmp_path, ex).submit(1, 'story').result(5) == {}
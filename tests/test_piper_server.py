@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.bench_piper import make_fake_piper
+from yt_brainrot import piper_server, tts
+
+
+def test_process_is_reused_and_restarted(tmp_path, monkeypatch):
+    monkeypatch.setenv('PIPER_BIN', make_fake_piper(tmp_path, load_seconds=0.0, per_char=0.0))
+    proc = piper_server.PiperProcess('pl_PL-test')
+    try:
+        proc.synthesize('Pierwsze zdanie.', str(tmp_path / 'a.wav'))
+        pid = proc.status()['pid']
+        proc.synthesize('Drugie zdanie.', str(tmp_path / 'b.wav'))
+        assert proc.status()['pid'] == pid
+        proc.proc.kill()
+        proc.proc.wait()
+        proc.synthesize('Po awarii.', str(tmp_path / 'c.wav'))
+        st = proc.status()
+        assert st['alive'] and st['pid'] != pid and st['restarts'] == 1 and st['calls'] == 3
+        assert all((tmp_path / f).exists() for f in ('a.wav', 'b.wav', 'c.wav'))
+    finally:
+        proc.close()
+
+
+def test_tts_uses_persistent_piper(tmp_path, monkeypatch):
+    monkeypatch.setenv('PIPER_BIN', make_fake_piper(tmp_path, load_seconds=0.0, per_char=0.0))
+    monkeypatch.setattr(tts.tts_engines, 'LOADERS', {})
+    try:
+        meta = tts.tts_to_wav('Cześć', str(tmp_path / 'out.wav'), voice='pl_PL-test', use_cache=False)
+        assert meta['backend'] == 'piper' and Path(meta['path']).exists()
+        assert [p['voice'] for p in piper_server.status()] == ['pl_PL-test']
+    finally:
+        piper_server.shutdown()
@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import publish_queue
+
+
+class _HTTPError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f'HTTP {status}')
+        self.response = type('R', (), {'status_code': status, 'headers': headers or {}})()
+
+
+def _video(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_idempotent_enqueue_retry_backoff_and_permanent_failure(tmp_path):
+    calls = []
+    outcomes = {'flaky': [ConnectionError('reset'), _HTTPError(503), {'id': 1}], 'bad': [_HTTPError(422)]}
+
+    def publish(video, title, description, tags, idempotency_key=None):
+        calls.append((title, idempotency_key))
+        res = outcomes[title].pop(0)
+        if isinstance(res, Exception):
+            raise res
+        return res
+
+    q = publish_queue.PublishQueue(tmp_path / 'publish.sqlite3', publish, backoff=0.05, max_attempts=5)
+    flaky = _video(tmp_path, 'a.mp4', b'video-a')
+    first = q.enqueue(flaky, 'flaky', 'd', ['x'])
+    again = q.enqueue(_video(tmp_path, 'copy.mp4', b'video-a'), 'flaky', 'd', ['x'])
+    assert again['key'] == first['key'] and q.counts() == {'queued': 1}
+    bad = q.enqueue(_video(tmp_path, 'b.mp4', b'video-b'), 'bad', 'd', [])
+
+    q.drain()
+    assert q.get(bad['key'])['status'] == 'failed'  # 4xx is not retried
+    entry = q.get(first['key'])
+    assert entry['status'] == 'queued' and entry['attempts'] == 1 and entry['nextAt'] > time.time()
+
+    deadline = time.time() + 5
+    while q.get(first['key'])['status'] != 'published' and time.time() < deadline:
+        time.sleep(0.05)
+        q.drain()
+    entry = q.get(first['key'])
+    assert entry['status'] == 'published' and entry['attempts'] == 3 and entry['result'] == {'id': 1}
+    assert {key for _, key in calls} == {first['key'], bad['key']}
+
+    # published entries are never sent again, even when enqueued once more
+    q.enqueue(flaky, 'flaky', 'd', ['x'])
+    assert q.drain() == [] and len(calls) == 4
+
+    outcomes['bad'].append({'id': 2})
+    assert q.retry(bad['key'])['status'] == 'queued'
+    assert [e['status'] for e in q.drain()] == ['published']
+
+
+def test_workers_respect_rate_limit_and_reclaim_expired_leases(tmp_path):
+    starts = []
+    lock = threading.Lock()
+
+    def publish(video, title, description, tags, idempotency_key=None):
+        # the interval is enforced between claims; `updatedAt` is the claim time
+        with lock:
+            starts.append(q.get(idempotency_key)['updatedAt'])
+        return {'ok': title}
+
+    q = publish_queue.PublishQueue(tmp_path / 'publish.sqlite3', publish, workers=3, min_interval=0.2,
+                                   lease_seconds=0.1)
+    keys = [q.enqueue(_video(tmp_path, f'{i}.mp4', bytes([i])), str(i), '', [])['key'] for i in range(3)]
+
+    # a worker that died mid-upload leaves a leased entry behind
+    stale, _, _ = q._claim()
+    time.sleep(0.25)
+
+    q.start()
+    deadline = time.time() + 5
+    while q.counts().get('published', 0) < 3 and time.time() < deadline:
+        time.sleep(0.05)
+    q.stop()
+
+    assert all(q.get(k)['status'] == 'published' for k in keys)
+    assert q.get(stale['key'])['attempts'] == 2
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 3 and min(gaps) >= 0.19, gaps
+
+
+def test_lease_is_renewed_and_lost_claims_cannot_finish(tmp_path):
+    calls = []
+
+    def publish(video, title, description, tags, idempotency_key=None):
+        calls.append(title)
+        if title == 'slow':
+            time.sleep(0.5)  # several lease lengths
+        if title == 'unconfigured':
+            raise RuntimeError('POSTIZ_API_URL and POSTIZ_API_KEY must be set')
+        return {'ok': title}
+
+    q = publish_queue.PublishQueue(tmp_path / 'publish.sqlite3', publish, workers=2, lease_seconds=0.15)
+    slow = q.enqueue(_video(tmp_path, 'slow.mp4', b'slow'), 'slow', '', [])['key']
+    q.drain()
+    assert q.get(slow)['status'] == 'published' and calls == ['slow']  # the other worker never re-took it
+
+    # configuration errors are permanent, not retried with backoff
+    bad = q.enqueue(_video(tmp_path, 'bad.mp4', b'bad'), 'unconfigured', '', [])['key']
+    q.drain()
+    assert q.get(bad)['status'] == 'failed' and q.get(bad)['attempts'] == 1
+
+    # a worker whose lease was taken over cannot overwrite the new holder's outcome
+    key = q.enqueue(_video(tmp_path, 'c.mp4', b'c'), 'c', '', [])['key']
+    old, _, _ = q._claim()
+    time.sleep(0.2)
+    new, _, _ = q._claim()
+    assert old['key'] == new['key'] == key and old['claim'] != new['claim']
+    assert not q._finish(key, old['claim'], status='failed', error='late')
+    assert q._finish(key, new['claim'], status='published', result='{}', error=None)
+    assert q.get(key)['status'] == 'published'
@@ -1,5 +1,11 @@
+import email.policy
+import json
 import os
 import sys
+import threading
+import tracemalloc
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 import pytest
 # Ensure project package is importable during tests
@@ -17,3 +23,88 @@ def test_publish_raises_when_env_missing(tmp_path):
 
     with pytest.raises(RuntimeError):
         publisher.publish_to_postiz(str(video), "t", "d", ["a", "b"]) 
+
+
+def _stand_in_postiz(tmp_path):
+    """Local Postiz stand-in that spools each request body to disk in small reads."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _chunks(self):
+            if self.headers.get('Transfer-Encoding') == 'chunked':
+                while True:
+                    size = int(self.rfile.readline().split(b';')[0], 16)
+                    if not size:
+                        self.rfile.readline()
+                        return
+                    while size:
+                        data = self.rfile.read(min(size, 65536))
+                        size -= len(data)
+                        yield data
+                    self.rfile.readline()
+            left = int(self.headers.get('Content-Length', 0))
+            while left:
+                data = self.rfile.read(min(left, 65536))
+                left -= len(data)
+                yield data
+
+        def do_POST(self):
+            path = tmp_path / f'body_{len(seen)}'
+            with open(path, 'wb') as f:
+                for data in self._chunks():
+                    f.write(data)
+            seen.append({'headers': dict(self.headers), 'body': path})
+            payload = json.dumps({'id': len(seen)}).encode()
+            self.send_response(201)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/public/v1/upload', seen
+
+
+def _parts(record) -> dict:
+    raw = record['body'].read_bytes()
+    msg = BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {record["headers"]["Content-Type"]}\r\n\r\n'.encode() + raw)
+    return {p.get_param('name', header='content-disposition'): p.get_payload(decode=True) for p in msg.iter_parts()}
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_upload_streams_in_bounded_memory(tmp_path, monkeypatch, chunked):
+    server, url, seen = _stand_in_postiz(tmp_path)
+    monkeypatch.setenv('POSTIZ_API_URL', url)
+    monkeypatch.setenv('POSTIZ_API_KEY', 'k')
+    video = tmp_path / 'short.mp4'
+    content = os.urandom(1 << 20) * 16  # 16 MiB
+    video.write_bytes(content)
+    opened = []
+    real_open = open
+    monkeypatch.setattr('builtins.open', lambda *a, **kw: opened.append(real_open(*a, **kw)) or opened[-1])
+    try:
+        tracemalloc.start()
+        res = publisher.publish_to_postiz(str(video), 'Tytuł', 'opis', ['a', 'b'], chunked=chunked)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        monkeypatch.undo()
+        server.shutdown()
+
+    assert res == {'id': 1}
+    assert peak < 4 << 20, peak  # the 16 MiB file is never held in memory
+    assert all(f.closed for f in opened)
+    headers = seen[0]['headers']
+    assert ('Transfer-Encoding' in headers) == chunked
+    parts = _parts(seen[0])
+    assert parts['file'] == content
+    assert parts['title'].decode() == 'Tytuł' and parts['tags'] == b'a,b'
+    st = publisher.stats()
+    assert st['bytes'] >= len(content) and st['lastMBps'] > 0
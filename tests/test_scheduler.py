@@ -0,0 +1,33 @@
+import sys
+import threading
+import time
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot.scheduler import StageScheduler
+
+
+def test_stages_overlap_within_limits_and_keep_order():
+    active = {'a': 0, 'b': 0}
+    peak = {'a': 0, 'b': 0}
+    lock = threading.Lock()
+
+    def work(stage, i):
+        with lock:
+            active[stage] += 1
+            peak[stage] = max(peak[stage], active[stage])
+        time.sleep(0.02 * (4 - i))
+        with lock:
+            active[stage] -= 1
+        if i == 2 and stage == 'b':
+            raise ValueError('boom')
+        return i
+
+    with StageScheduler({'a': 1, 'b': 2}, max_in_flight=3) as sched:
+        results = sched.map(lambda i: sched.run('b', work, 'b', sched.run('a', work, 'a', i)), range(4))
+        stats = sched.stats()
+
+    assert results[:2] == [0, 1] and results[3] == 3
+    assert isinstance(results[2], ValueError)
+    assert peak['a'] == 1 and peak['b'] == 2
+    assert stats['a']['count'] == 4 and stats['b']['errors'] == 1
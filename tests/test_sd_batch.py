@@ -0,0 +1,50 @@
+import base64
+import json
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import sd_a1111
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, payload):
+        n = payload['batch_size'] * payload['n_iter']
+        seed = payload['seed'] if payload['seed'] != -1 else 500
+        self._seeds = [seed + k for k in range(n)]
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'images': [base64.b64encode(b'IMG%d' % s).decode() for s in self._seeds],
+                'info': json.dumps({'seed': self._seeds[0], 'all_seeds': self._seeds})}
+
+
+def test_batch_groups_prompts_and_seed_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(sd_a1111, 'is_server_alive', lambda host: True)
+    calls = []
+    monkeypatch.setattr(sd_a1111.http_client, 'post', lambda url, json, **kw: calls.append(json) or _Resp(json))
+
+    prompts = ['a', 'a', 'a', 'b', 'a']
+    seeds = [10, 11, 12, -1, 10]
+    outs = [str(tmp_path / f'{i}.jpg') for i in range(len(prompts))]
+    res = sd_a1111.generate_images_a1111_batch(prompts, outs, seeds=seeds, max_batch=2, use_cache=False)
+
+    # 'a' 10..12 -> one call of 2x1 batches plus one remainder call; 'b' -> one call
+    assert [(c['prompt'], c['seed'], c['batch_size'], c['n_iter']) for c in calls] == [
+        ('a', 10, 2, 1), ('a', 12, 1, 1), ('b', -1, 1, 1)]
+    assert [r['seed'] for r in res] == [10, 11, 12, 500, 10]
+    assert Path(outs[2]).read_bytes() == b'IMG12'
+    assert Path(outs[4]).read_bytes() == b'IMG10'
+
+
+def test_server_errors_count_against_a1111_health(monkeypatch):
+    reports = []
+    monkeypatch.setattr(sd_a1111.health, 'report', lambda *a, **kw: reports.append(kw))
+    resp = type('R', (), {'status_code': 500})()
+    monkeypatch.setattr(sd_a1111.http_client, 'post', lambda url, **kw: resp)
+    assert sd_a1111._txt2img('http://a1111', {}) is resp
+    assert reports == [{'ok': False, 'error': 'HTTP 500'}]
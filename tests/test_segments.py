@@ -0,0 +1,86 @@
+import shutil
+import subprocess
+import sys
+import threading
+import wave
+from pathlib import Path
+import pytest
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from PIL import Image
+from yt_brainrot import audio_info, editor, segments
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg not installed')
+def test_segments_are_encoded_once_and_stream_copied(tmp_path, monkeypatch):
+    monkeypatch.setattr(segments, '_cache', segments.DiskCache(tmp_path / 'cache', 1 << 30, '.mp4'))
+    segments.clear()
+    intro = tmp_path / 'intro.png'
+    Image.new('RGB', (300, 500), (200, 30, 30)).save(intro)
+    background = tmp_path / 'bg.png'
+    Image.new('RGB', (360, 640), (20, 80, 200)).save(background)
+    outro = tmp_path / 'outro.mp4'  # a clip without an audio track
+    subprocess.run(['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', 'testsrc=s=320x240:r=25:d=1.5',
+                    str(outro)], check=True)
+    speech = tmp_path / 'speech.wav'
+    with wave.open(str(speech), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(22050)
+        w.writeframes(b'\x00\x00' * 22050 * 3)
+
+    for i in range(2):
+        out = tmp_path / f'short_{i}.mp4'
+        editor.create_short_single_pass(str(background), str(speech), str(out), width=180, height=320,
+                                        profile='still', encoder='x264', intro=str(intro), outro=str(outro))
+        assert abs(audio_info.duration(str(out)) - (segments.IMAGE_SECONDS + 3 + 1.5)) < 0.5
+        assert not Path(segments.partial_path(str(out))).exists()
+
+    stats = segments.stats()
+    assert stats['encodes'] == 2 and stats['assembled'] == 2 and stats['cache']['hits'] == 2
+    info = subprocess.run(['ffmpeg', '-hide_banner', '-i', str(tmp_path / 'short_1.mp4')],
+                          capture_output=True, text=True).stderr
+    assert '180x320' in info and '48000 Hz, stereo' in info
+
+    # other encoding settings need their own copy of the segments
+    editor.create_short_single_pass(str(background), str(speech), str(tmp_path / 'crf.mp4'), width=180,
+                                    height=320, profile='still', encoder='x264', crf=30, intro=str(intro))
+    assert segments.stats()['encodes'] == 3
+
+
+def test_segments_lock_per_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(segments, '_cache', segments.DiskCache(tmp_path / 'cache', 1 << 30, '.mp4'))
+    segments.clear()
+    sources = []
+    for name in ('a.png', 'b.png'):
+        sources.append(tmp_path / name)
+        sources[-1].write_bytes(name.encode())
+    # both encodes have to be in flight at once for the barrier to let them through
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+
+    def fake_encode(source, out_path, opts, width, height, seconds):
+        calls.append(source)
+        if len(calls) <= 2:
+            barrier.wait()
+        Path(out_path).write_bytes(b'segment')
+        return str(out_path)
+
+    monkeypatch.setattr(segments, 'encode_segment', fake_encode)
+    opts = {'encoder': 'x264', 'fps': 30}
+    threads = [threading.Thread(target=segments.get_segment, args=(str(s), opts),
+                                kwargs={'out_path': str(tmp_path / f'out_{i}.mp4')}) for i, s in enumerate(sources)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(calls) == sorted(map(str, sources)) and not barrier.broken
+
+    # the same key still encodes once
+    threads = [threading.Thread(target=segments.get_segment, args=(str(sources[0]), {**opts, 'crf': 30}))
+               for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 3 and segments.stats()['encodes'] == 3
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import registry
+
+ROOT = Path(__file__).resolve().parents[1]
+# cumulative cold import budget in seconds; generous so slow CI machines pass
+BUDGET = {'scripts.pipeline': 1.0, 'yt_brainrot.registry': 0.3, 'yt_brainrot.visual': 2.0}
+
+
+def _import_times(module: str) -> dict:
+    """{module: cumulative seconds} from `python -X importtime` in a fresh interpreter."""
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_cold_imports_stay_light():
+    for module, budget in BUDGET.items():
+        times = _import_times(module)
+        assert times[module] < budget, (module, times[module])
+        if module != 'yt_brainrot.visual':
+            # backends are loaded on first use, not at startup
+            assert not {'numpy', 'PIL', 'requests'} & set(times), module
+        assert 'requests' not in times, module
+
+
+def test_registry_imports_once_and_proxies_lazily():
+    registry.get('editor')
+    first = registry.stats()['editor']
+    assert first['loaded'] and first['seconds'] is not None
+    assert registry.get('editor') is registry.get('editor')
+    assert registry.stats()['editor'] == first
+
+    proxy = registry.lazy('editor')
+    assert proxy.ENCODING_PROFILES is registry.get('editor').ENCODING_PROFILES
+
+    res = registry.warm_up(['editor', 'sentences'])
+    assert 'sentences' in res['errors'] and res['modules']['editor']['loaded']
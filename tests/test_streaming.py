@@ -0,0 +1,66 @@
+import json
+import sys
+import threading
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import health, llm, tts
+
+
+def test_stream_story_from_ollama_http_into_sentences(monkeypatch, tmp_path):
+    monkeypatch.setenv('DISCOVERY_FILE', str(tmp_path / 'endpoints.json'))
+    health.reset()
+    tokens = ['Kot ', 'znalazł ', 'pilota. ', 'Każde naciśnięcie ', 'zmieniało świat! ', 'Koniec']
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            assert body['stream'] is True
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            for t in tokens:
+                self.wfile.write(json.dumps({'response': t, 'done': False}).encode() + b'\n')
+            self.wfile.write(b'{"response": "", "done": true}\n')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        assert list(llm.stream_story('p', ollama_url=url)) == tokens
+        assert list(llm.stream_sentences('p', ollama_url=url, min_chars=10)) == [
+            'Kot znalazł pilota.', 'Każde naciśnięcie zmieniało świat!', 'Koniec']
+    finally:
+        server.shutdown()
+
+
+def test_sentences_are_synthesized_and_joined_in_order(monkeypatch, tmp_path):
+    def fake_synth(text, out_path, voice, speed, rate, http_url):
+        with wave.open(out_path, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(bytes([len(text) % 256, 0]) * (10 * len(text)))
+        return {'path': out_path, 'voice': voice, 'backend': 'fake', 'format': 'wav'}
+
+    monkeypatch.setattr(tts, '_synthesize', fake_synth)
+    sentences = ['Pierwsze zdanie.', 'Drugie, dłuższe zdanie!', 'Trzecie?']
+    meta = tts.tts_sentences_to_wav(iter(sentences), str(tmp_path / 'out.wav'), use_cache=False)
+    assert meta['sentences'] == 3 and meta['text'] == ' '.join(sentences)
+    assert meta['firstAudioSeconds'] is not None
+    with wave.open(meta['path'], 'rb') as w:
+        frames = w.readframes(w.getnframes())
+    expected = b''.join(bytes([len(s) % 256, 0]) * (10 * len(s)) for s in sentences)
+    assert frames == expected
+    assert not (tmp_path / 'out.parts').exists()
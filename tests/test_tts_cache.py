@@ -0,0 +1,82 @@
+import os
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import tts, tts_cache
+from yt_brainrot.disk_cache import DiskCache
+
+
+def _fake_synth(calls):
+    def synth(text, out_path, voice, speed, rate, http_url):
+        calls.append(text)
+        Path(out_path).write_bytes(b'RIFF' + text.encode())
+        return {'path': out_path, 'voice': voice, 'backend': 'fake', 'format': 'wav'}
+    return synth
+
+
+def test_tts_to_wav_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts_cache, '_cache', DiskCache(tmp_path / 'cache', 1 << 20, '.wav'))
+    calls = []
+    monkeypatch.setattr(tts, '_synthesize', _fake_synth(calls))
+    monkeypatch.setattr(tts, '_preferred_backend', lambda http_url: 'fake')
+
+    first = tts.tts_to_wav('Ala  ma kota', str(tmp_path / 'a.wav'), voice='v', speed='1.0')
+    second = tts.tts_to_wav(' Ala ma kota ', str(tmp_path / 'b.wav'), voice='v', speed=1)
+    bypass = tts.tts_to_wav('Ala ma kota', str(tmp_path / 'c.wav'), voice='v', speed=1, use_cache=False)
+
+    assert calls == ['Ala  ma kota', 'Ala ma kota']
+    assert first['cached'] is False and bypass['cached'] is False
+    assert second['cached'] is True
+    # hits are copied to out_path, so eviction cannot pull the file from under the caller
+    assert second['path'] == str(tmp_path / 'b.wav')
+    assert Path(second['path']).read_bytes() == b'RIFFAla  ma kota'
+    assert tts_cache.stats()['hits'] == 1
+    assert tts_cache.stats()['misses'] == 1
+
+
+def test_fallback_audio_is_not_served_for_the_http_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts_cache, '_cache', DiskCache(tmp_path / 'cache', 1 << 20, '.wav'))
+    monkeypatch.setattr(tts, '_engine_usable', lambda backend, module: False)
+    server_up = [False]
+    calls = []
+
+    def synth(text, out_path, voice, speed, rate, http_url):
+        backend = 'http' if server_up[0] else 'espeak'
+        calls.append(backend)
+        Path(out_path).write_bytes(b'RIFF' + backend.encode())
+        return {'path': out_path, 'voice': voice, 'backend': backend, 'format': 'wav'}
+
+    monkeypatch.setattr(tts, '_synthesize', synth)
+    url = 'http://tts.local:5002'
+    down = tts.tts_to_wav('Ala ma kota', str(tmp_path / 'a.wav'), http_url=url)
+    server_up[0] = True
+    up = tts.tts_to_wav('Ala ma kota', str(tmp_path / 'b.wav'), http_url=url)
+    again = tts.tts_to_wav('Ala ma kota', str(tmp_path / 'c.wav'), http_url=url)
+
+    assert down['backend'] == 'espeak' and up['backend'] == 'http'
+    assert up['cached'] is False and again['cached'] is True
+    assert calls == ['espeak', 'http']
+    assert Path(again['path']).read_bytes() == b'RIFFhttp'
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(tts_cache, '_cache', DiskCache(tmp_path, 250, '.wav'))
+    keys = [tts_cache.make_key(f'text {i}') for i in range(3)]
+    for i, key in enumerate(keys):
+        tts_cache.put_bytes(key, b'x' * 100, {'backend': 'fake'})
+        # deterministic LRU order regardless of filesystem timestamp resolution
+        os.utime(tmp_path / f'{key}.wav', (i, i))
+
+    assert tts_cache.get(keys[0]) is None
+    assert tts_cache.get(keys[2]) is not None
+
+
+def test_temp_files_are_not_cache_entries(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path, 150, '.wav')
+    monkeypatch.setattr(tts_cache, '_cache', cache)
+    # another writer's copy in progress must survive eviction and not count as an entry
+    (tmp_path / 'tmpabc.tmp').write_bytes(b'y' * 100)
+    tts_cache.put_bytes(tts_cache.make_key('a'), b'x' * 100, {'backend': 'fake'})
+    assert (tmp_path / 'tmpabc.tmp').exists()
+    assert tts_cache.stats()['entries'] == 1
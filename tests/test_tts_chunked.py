@@ -0,0 +1,71 @@
+import sys
+import wave
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import numpy as np
+from yt_brainrot import tts
+
+
+def _write(path, samples, rate=8000):
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+
+
+def _read(path):
+    with wave.open(str(path), 'rb') as w:
+        return np.frombuffer(w.readframes(w.getnframes()), dtype='<i2')
+
+
+def test_concat_trims_padding_and_inserts_exact_pause(tmp_path):
+    a = [0] * 300 + [1000, -1000] * 50 + [0] * 5000
+    b = [0] * 7000 + [500] * 30 + [0] * 10
+    _write(tmp_path / 'a.wav', a)
+    _write(tmp_path / 'b.wav', b)
+    tts.concat_wavs([tmp_path / 'a.wav', tmp_path / 'b.wav'], str(tmp_path / 'out.wav'),
+                    pause_ms=25, trim=True, block_frames=512)
+    out = _read(tmp_path / 'out.wav')
+    expected = [1000, -1000] * 50 + [0] * 200 + [500] * 30
+    assert out.tolist() == expected
+
+
+def test_chunked_synthesis_joins_chunks_in_order(tmp_path, monkeypatch):
+    def fake_synth(text, out_path, voice, speed, rate, http_url):
+        _write(out_path, [len(text)] * 100)
+        return {'path': out_path, 'voice': voice, 'backend': 'fake', 'format': 'wav'}
+
+    monkeypatch.setattr(tts, '_synthesize', fake_synth)
+    text = 'Pierwsze dość długie zdanie. Drugie, nieco dłuższe zdanie! Trzecie zdanie na koniec?'
+    meta = tts.tts_to_wav_chunked(text, str(tmp_path / 'out.wav'), workers=3, pause_ms=0, trim=False,
+                                  min_chars=10, executor='thread', use_cache=False)
+    assert meta['chunks'] == 3 and meta['backend'] == 'fake'
+    lengths = [len(s) for s in ('Pierwsze dość długie zdanie.', 'Drugie, nieco dłuższe zdanie!',
+                                'Trzecie zdanie na koniec?')]
+    assert _read(meta['path']).tolist() == [n for n in lengths for _ in range(100)]
+
+
+def test_process_pool_is_shared_across_chunk_counts(monkeypatch):
+    monkeypatch.setattr(tts, '_pool', None)
+    monkeypatch.setattr(tts, 'WORKERS', 2)
+    pool = tts._process_pool(2)
+    try:
+        assert tts._process_pool(3) is pool and tts._process_pool() is pool
+        assert pool._max_workers == 2
+    finally:
+        pool.shutdown(wait=True)
+
+
+def test_broken_process_pool_is_replaced_once(monkeypatch):
+    monkeypatch.setattr(tts, '_pool', None)
+    pool = tts._process_pool(1)
+    try:
+        assert tts._process_pool(broken=object()) is pool
+        fresh = tts._process_pool(broken=pool)
+        # a second caller holding the same broken pool reuses the replacement
+        assert fresh is not pool and tts._process_pool(broken=pool) is fresh
+        fresh.shutdown(wait=True)
+    finally:
+        pool.shutdown(wait=True)
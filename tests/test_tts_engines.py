@@ -0,0 +1,62 @@
+import sys
+import threading
+from pathlib import Path
+import pytest
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import tts_engines
+
+
+def test_engine_loaded_once_and_shared_between_threads(monkeypatch):
+    loads = []
+    monkeypatch.setitem(tts_engines.LOADERS, 'fake', lambda model: loads.append(model) or object())
+    monkeypatch.setattr(tts_engines, '_workers', {})
+
+    results = []
+
+    def worker(i):
+        engine = tts_engines.get_engine('fake')
+        results.append(engine.call(lambda e: (id(e), threading.current_thread().name)))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert loads == [None]
+    assert len(set(results)) == 1
+    assert results[0][1] == 'tts-fake'
+
+
+def test_load_error_is_reported(monkeypatch):
+    def broken(model):
+        raise ImportError('no backend')
+
+    monkeypatch.setitem(tts_engines.LOADERS, 'broken', broken)
+    monkeypatch.setattr(tts_engines, '_workers', {})
+    engine = tts_engines.get_engine('broken')
+    assert engine.ready.wait(5)
+    assert engine.status()['error'] == 'no backend'
+    with pytest.raises(RuntimeError):
+        engine.submit(lambda e: None)
+
+
+def test_call_times_out_and_stuck_engine_fails_fast(monkeypatch):
+    monkeypatch.setitem(tts_engines.LOADERS, 'slow', lambda model: object())
+    monkeypatch.setattr(tts_engines, '_workers', {})
+    engine = tts_engines.get_engine('slow')
+    release = threading.Event()
+
+    with pytest.raises(RuntimeError, match='did not finish'):
+        engine.call(lambda e: release.wait(5), timeout=0.1)
+    assert engine.status()['stuck'] is True
+    with pytest.raises(RuntimeError, match='stuck'):
+        engine.call(lambda e: 'next')
+
+    release.set()
+    for _ in range(500):
+        if not engine.stuck:
+            break
+        threading.Event().wait(0.01)
+    assert engine.call(lambda e: 'ok', timeout=5) == 'ok'
@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pytest
+
+from yt_brainrot import visual
+
+
+def test_render_background_is_seeded_per_style():
+    for style in visual.STYLES:
+        a = visual.render_background((72, 128), style=style, seed=7, grain=4)
+        b = visual.render_background((72, 128), style=style, seed=7, grain=4)
+        c = visual.render_background((72, 128), style=style, seed=8, grain=4)
+        assert a.size == (72, 128) and a.mode == 'RGB'
+        assert np.array_equal(np.asarray(a), np.asarray(b))
+        assert not np.array_equal(np.asarray(a), np.asarray(c))
+    with pytest.raises(ValueError):
+        visual.render_background((72, 128), style='nope')
+
+
+def test_layout_text_wraps_within_width_and_caches_font():
+    font = visual.load_font('DejaVuSans-Bold.ttf', 42)
+    assert visual.load_font('DejaVuSans-Bold.ttf', 42) is font
+    text = ' '.join(['brainrot', 'sigma', 'ohio', 'rizz'] * 30)
+    lines = visual.layout_text(text, font, 600)
+    assert ' '.join(line for line, _, _ in lines) == text
+    assert len(lines) > 1
+    assert all(w <= 600 for _, w, _ in lines)
@@ -0,0 +1,38 @@
+import sys
+import time
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from yt_brainrot import voices
+
+
+def test_inventory_is_built_once_in_parallel_and_rebuilt_on_change(monkeypatch):
+    calls = []
+
+    def slow(backend, vid):
+        def probe():
+            calls.append(backend)
+            time.sleep(0.3)
+            return [voices._voice(backend, vid, language='pl')]
+        return probe
+
+    def broken():
+        raise RuntimeError('no binary')
+
+    monkeypatch.setattr(voices, 'PROBES', {'piper': slow('piper', 'pl_PL-gosia-medium'),
+                                           'espeak': slow('espeak', 'pl'), 'coqui': broken})
+    monkeypatch.setattr(voices, '_state', {'inventory': None, 'fingerprint': None, 'built': 0.0, 'checkedAt': 0.0})
+    fp = {'value': ('a',)}
+    monkeypatch.setattr(voices, 'fingerprint', lambda: fp['value'])
+    monkeypatch.setattr(voices, 'CHECK_INTERVAL', 0.0)
+
+    t0 = time.perf_counter()
+    inv = voices.inventory()
+    assert time.perf_counter() - t0 < 0.55  # probes ran concurrently
+    assert [v['id'] for v in inv['voices']] == ['pl_PL-gosia-medium', 'pl']
+    assert inv['backends']['coqui']['error'] == 'no binary'
+    assert voices.inventory() is inv and len(calls) == 2
+
+    fp['value'] = ('b',)  # e.g. piper binary replaced
+    assert voices.inventory() is not inv and len(calls) == 4
+    assert voices.by_backend()['piper'] == ['pl_PL-gosia-medium']
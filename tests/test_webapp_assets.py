@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+# Ensure project package is importable during tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from webapp import app as webapp
+
+
+def test_asset_url_supports_range_and_etag(tmp_path, monkeypatch):
+    monkeypatch.setattr(webapp, 'OUTPUTS_DIR', tmp_path)
+    media = tmp_path / 'functions' / '123' / 'speech.wav'
+    media.parent.mkdir(parents=True)
+    media.write_bytes(bytes(range(256)) * 4)
+    (tmp_path.parent / 'secret.txt').write_text('nope')
+
+    url = webapp._asset_url(media)
+    assert url == '/functions/v1/assets/functions/123/speech.wav'
+
+    client = webapp.app.test_client()
+    full = client.get(url)
+    assert full.status_code == 200 and len(full.data) == 1024
+    assert client.get(url, headers={'If-None-Match': full.headers['ETag']}).status_code == 304
+    part = client.get(url, headers={'Range': 'bytes=10-19'})
+    assert part.status_code == 206 and part.data == bytes(range(10, 20))
+    assert client.get('/functions/v1/assets/../secret.txt').status_code == 404
@@ -1,23 +1,28 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
 import subprocess
 import time
 import os
+import json
+import queue
+import threading
 from pathlib import Path
 import base64
-import requests
 import sys
+from urllib.parse import quote
 
 # Ensure project root is importable when running webapp directly
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from yt_brainrot import health, http_client, registry
+
 
 def _get_modules():
     try:
-        from yt_brainrot import llm as llm_mod, tts as tts_mod, visual as visual_mod, sd_a1111 as sd_mod, editor as editor_mod
-        return llm_mod, tts_mod, visual_mod, sd_mod, editor_mod
+        # imported once per process (see registry.warm_up for gunicorn post_fork)
+        return registry.load('llm', 'tts', 'visual', 'sd', 'editor')
     except Exception as e:
         raise RuntimeError(f"Unable to import internal modules: {e}. Try running with PYTHONPATH=. or install package")
 
@@ -37,22 +42,77 @@ def build_metadata(story: str):
     return (title, description, tags)
 
 
-def _generate_tts_bytes(text: str, piper_url: str | None = None, coqui_url: str | None = None, voice: str | None = None, speed: float | None = None):
+OUTPUTS_DIR = Path('outputs')
+
+
+def _wants_base64(body: dict) -> bool:
+    """Media is returned as asset URLs unless the client explicitly asks for base64."""
+    return bool(body.get('includeBase64')) or body.get('responseMode') == 'base64'
+
+
+def _background_opts(body: dict) -> dict:
+    """Style/seed for the procedural fallback background (`backgroundStyle`, `seed`)."""
+    seed = body.get('seed')
+    try:
+        seed = int(seed) if seed is not None and int(seed) >= 0 else None
+    except (TypeError, ValueError):
+        seed = None
+    return {'style': body.get('backgroundStyle') or 'gradient', 'seed': seed}
+
+
+def _sd_seed(body: dict) -> int:
+    """`seed` for A1111 as an int (-1 = random); ValueError when it is not an integer."""
+    seed = body.get('seed')
+    if seed is None:
+        return -1
+    try:
+        return int(seed)
+    except (TypeError, ValueError):
+        raise ValueError(f'seed must be an integer, got {seed!r}') from None
+
+
+def _asset_url(path) -> str:
+    """Stable URL for a generated file (served with Range/ETag support)."""
+    p = Path(path).resolve()
+    try:
+        rel = p.relative_to(OUTPUTS_DIR.resolve())
+        return f'/functions/v1/assets/{rel.as_posix()}'
+    except ValueError:
+        return f'/functions/v1/get-file?path={quote(str(p))}'
+
+
+def _file_b64(path) -> str:
+    with open(path, 'rb') as f:
+        return base64.b64encode(f.read()).decode('utf-8')
+
+
+def _generate_tts_bytes(text: str, piper_url: str | None = None, coqui_url: str | None = None, voice: str | None = None, speed: float | None = None, use_cache: bool = True):
     """Return tuple (bytes, meta_dict). Try remote synth first, fall back to local backends."""
+    from yt_brainrot import tts_cache
     outdir = Path('outputs') / 'functions' / str(int(time.time()))
     outdir.mkdir(parents=True, exist_ok=True)
 
     remote_url = piper_url or coqui_url
-    if remote_url:
+    cache_key = None
+    if remote_url and use_cache and tts_cache.enabled():
+        cache_key = tts_cache.make_key(text, voice, speed, backend=remote_url)
+        hit = tts_cache.get(cache_key, str(outdir / 'out.wav'))
+        if hit:
+            with open(hit['path'], 'rb') as f:
+                return (f.read(), hit)
+    if remote_url and health.is_up('tts', remote_url):
         # try /synthesize then base URL
         candidates = [remote_url.rstrip('/') + '/synthesize', remote_url]
         for url in candidates:
             try:
-                r = requests.post(url, json={'text': text, 'voice': voice, 'speed': speed}, timeout=30)
+                r = http_client.post(url, backend='tts', json={'text': text, 'voice': voice, 'speed': speed})
                 if r.status_code == 200:
                     ct = r.headers.get('Content-Type', '')
                     if ct.startswith('audio/'):
-                        return (r.content, {'backend': url, 'voice': voice, 'format': 'wav'})
+                        meta = {'backend': url, 'voice': voice, 'format': 'wav'}
+                        if cache_key:
+                            tts_cache.put_bytes(cache_key, r.content, meta)
+                        return (r.content, meta)
                     try:
                         jd = r.json()
                         aud = jd.get('audio') or jd.get('wav') or jd.get('data')
@@ -61,7 +121,10 @@ def _generate_tts_bytes(text: str, piper_url: str | None = None, coqui_url: str
                                 b = base64.b64decode(aud)
                             else:
                                 b = aud
-                            return (b, {'backend': url, 'voice': voice, 'format': 'wav'})
+                            meta = {'backend': url, 'voice': voice, 'format': 'wav'}
+                            if cache_key:
+                                tts_cache.put_bytes(cache_key, b, meta)
+                            return (b, meta)
                     except Exception:
                         pass
             except Exception:
@@ -70,7 +133,7 @@ def _generate_tts_bytes(text: str, piper_url: str | None = None, coqui_url: str
     # local fallback
     wav_path = outdir / 'out.wav'
     _, tts_mod, _, _, _ = _get_modules()
-    meta = tts_mod.tts_to_wav(text, str(wav_path), voice=voice, speed=speed)
+    meta = tts_mod.tts_to_wav(text, str(wav_path), voice=voice, speed=speed, use_cache=use_cache)
     with open(meta['path'], 'rb') as f:
         data = f.read()
     return (data, meta)
@@ -133,81 +196,151 @@ def fn_generate_tts():
     text = body.get('text') or body.get('input') or ''
     voice = body.get('voice') or body.get('voiceName') or os.environ.get('TTS_VOICE', None)
     speed = body.get('speed') or body.get('piperSpeed') or None
+    use_cache = not body.get('noCache', False)
+    want_b64 = _wants_base64(body)
+
+    def respond(path, fmt, used_voice, backend, cached=False):
+        res = {'format': fmt, 'voice': used_voice, 'backend': backend, 'cached': cached, 'audioUrl': _asset_url(path)}
+        if want_b64:
+            res['audio'] = _file_b64(path)
+        return jsonify(res)
+
     try:
+        from yt_brainrot import tts_cache
         outdir = Path('outputs') / 'functions' / str(int(time.time()))
         outdir.mkdir(parents=True, exist_ok=True)
 
         # First try remote TTS if URL supplied
         remote_url = body.get('piperUrl') or body.get('coquiUrl')
-        if remote_url:
+        cache_key = None
+        if remote_url and use_cache and tts_cache.enabled():
+            cache_key = tts_cache.make_key(text, voice, speed, backend=remote_url)
+            hit = tts_cache.get(cache_key, str(outdir / 'out.wav'))
+            if hit:
+                return respond(hit['path'], hit.get('format', 'wav'), hit.get('voice'), hit.get('backend'), cached=True)
+        if remote_url and health.is_up('tts', remote_url):
             # Try POSTing to remote endpoint with common payload {text, voice, speed}
             try:
-                r = requests.post(remote_url.rstrip('/') + '/synthesize', json={'text': text, 'voice': voice, 'speed': speed}, timeout=30)
+                r = http_client.post(remote_url.rstrip('/') + '/synthesize', backend='tts',
+                                     json={'text': text, 'voice': voice, 'speed': speed})
                 if r.status_code == 200:
+                    audio_bytes = None
                     # If response content-type is audio, use raw bytes
                     ct = r.headers.get('Content-Type', '')
                     if ct.startswith('audio/'):
+                        audio_bytes = r.content
+                    else:
+                        # Otherwise expect JSON with base64 audio
+                        try:
+                            jd = r.json()
+                            aud = jd.get('audio') or jd.get('wav') or jd.get('data')
+                            if aud:
+                                audio_bytes = base64.b64decode(aud) if isinstance(aud, str) else aud
+                        except Exception:
+                            pass
+                    if audio_bytes:
                         wav_path = outdir / 'out.wav'
                         with open(wav_path, 'wb') as f:
-                            f.write(r.content)
-                        b = base64.b64encode(r.content).decode('utf-8')
-                        return jsonify({'format': 'wav', 'voice': voice, 'backend': remote_url, 'audio': b})
-                    # Otherwise expect JSON with base64 audio
-                    try:
-                        jd = r.json()
-                        aud = jd.get('audio') or jd.get('wav') or jd.get('data')
-                        if aud:
-                            if isinstance(aud, str):
-                                # assume base64
-                                b = aud
-                            else:
-                                b = base64.b64encode(aud).decode('utf-8')
-                            return jsonify({'format': 'wav', 'voice': voice, 'backend': remote_url, 'audio': b})
-                    except Exception:
-                        pass
+                            f.write(audio_bytes)
+                        if cache_key:
+                            tts_cache.put(cache_key, str(wav_path), {'format': 'wav', 'voice': voice, 'backend': remote_url})
+                        return respond(wav_path, 'wav', voice, remote_url)
                 # if remote call failed, fall through to local
             except Exception:
                 pass
 
         wav_path = outdir / 'out.wav'
         _, tts_mod, _, _, _ = _get_modules()
-        meta = tts_mod.tts_to_wav(text, str(wav_path), voice=voice, speed=speed)
-        with open(meta['path'], 'rb') as f:
-            b = base64.b64encode(f.read()).decode('utf-8')
-        return jsonify({'format': meta.get('format', 'wav'), 'voice': meta.get('voice'), 'backend': meta.get('backend'), 'audio': b})
+        meta = tts_mod.tts_to_wav(text, str(wav_path), voice=voice, speed=speed, use_cache=use_cache)
+        return respond(meta['path'], meta.get('format', 'wav'), meta.get('voice'), meta.get('backend'), meta.get('cached', False))
     except Exception as e:
         return jsonify({'error': str(e), 'hint': 'Install Coqui TTS or Piper for better voices'}), 500
 
 
 @app.route('/functions/v1/tts-voices', methods=['GET'])
 def fn_tts_voices():
+    """Cached voice inventory; `?refresh=1` rebuilds it."""
     try:
-        _, tts_mod, _, _, _ = _get_modules()
-        v = tts_mod.list_voices()
-        # Flatten into a simple list of voice identifiers for the frontend
-        flat = []
-        if isinstance(v, dict):
-            for backend, items in v.items():
-                if isinstance(items, (list, tuple)):
-                    for it in items:
-                        flat.append(f"{backend}:{it}")
-                else:
-                    flat.append(f"{backend}:{items}")
-        else:
-            try:
-                for it in v:
-                    flat.append(str(it))
-            except Exception:
-                flat = [str(v)]
-        return jsonify({'voices': flat})
+        from yt_brainrot import voices
+        inv = voices.inventory(refresh=request.args.get('refresh') in ('1', 'true'))
+        # Flat "backend:name" list for the frontend, structured entries in `details`
+        flat = [f"{v['backend']}:{v['name']}" for v in inv['voices']]
+        return jsonify({'voices': flat, 'details': inv['voices'], 'backends': inv['backends'],
+                        'builtAt': inv['builtAt']})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/functions/v1/tts-cache', methods=['GET'])
+def fn_tts_cache():
+    """Hit/miss counters and size of the synthesized speech cache."""
+    from yt_brainrot import tts_cache
+    return jsonify(tts_cache.stats())
+
+
+@app.route('/functions/v1/image-cache', methods=['GET'])
+def fn_image_cache():
+    """Hit/miss counters and size of the A1111 image cache."""
+    from yt_brainrot import image_cache
+    return jsonify(image_cache.stats())
+
+
+@app.route('/functions/v1/segments', methods=['GET'])
+def fn_segments():
+    """Intro/outro segment encodes, stream-copy assemblies and the segment cache size."""
+    from yt_brainrot import segments
+    return jsonify(segments.stats())
+
+
+@app.route('/functions/v1/health', methods=['GET'])
+def fn_health():
+    """Every service state known to the health registry (with circuit-breaker state)."""
+    return jsonify({'services': health.snapshot()})
+
+
+@app.route('/functions/v1/http-stats', methods=['GET'])
+def fn_http_stats():
+    """Per-host request/latency counters of the shared HTTP client."""
+    return jsonify(http_client.stats())
+
+
+@app.route('/functions/v1/publish-queue', methods=['GET'])
+def fn_publish_queue():
+    """Recent publish queue entries (`?status=` filter) with counters and upload throughput."""
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    pq = registry.get('publish_queue').get_queue()
+    return jsonify({'items': pq.list(request.args.get('status'), limit), 'stats': pq.stats(),
+                    'upload': registry.get('publisher').stats()})
+
+
+@app.route('/functions/v1/publish-queue/<key>', methods=['GET'])
+def fn_publish_entry(key):
+    """Status, attempts and Postiz response of one publish queue entry."""
+    entry = registry.get('publish_queue').get_queue().get(key)
+    if entry is None:
+        return jsonify({'error': 'publish entry not found'}), 404
+    return jsonify(entry)
+
+
+@app.route('/functions/v1/modules', methods=['GET'])
+def fn_modules():
+    """Which backend modules this worker has imported and how long each import took."""
+    return jsonify(registry.stats())
+
+
 @app.route('/functions/v1/generate-image', methods=['POST'])
 def fn_generate_image():
     body = request.get_json() or {}
     prompt = body.get('prompt') or ''
+    try:
+        seed = _sd_seed(body)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
         outdir = Path('outputs') / 'functions' / str(int(time.time()))
         outdir.mkdir(parents=True, exist_ok=True)
@@ -217,18 +350,21 @@ def fn_generate_image():
         meta = None
         _, _, visual_mod, sd_mod, _ = _get_modules()
         if sd_mod.is_server_alive(host):
-            meta = sd_mod.generate_image_a1111(prompt, str(img_path), host=host, width=720, height=1280)
+            meta = sd_mod.generate_image_a1111(prompt, str(img_path), host=host, width=720, height=1280,
+                                               seed=seed, use_cache=not body.get('noCache', False))
             # meta is a dict with 'path' and optional 'seed' and 'prompt'
             if isinstance(meta, dict):
                 img_path = Path(meta.get('path', str(img_path)))
         else:
-            visual_mod.create_background_from_prompt(prompt, str(img_path), size=(720, 1280))
-        with open(img_path, 'rb') as f:
-            b = base64.b64encode(f.read()).decode('utf-8')
-        response = {'image': b, 'prompt': prompt}
+            visual_mod.create_background_from_prompt(prompt, str(img_path), size=(720, 1280),
+                                                     **_background_opts(body))
+        response = {'imageUrl': _asset_url(img_path), 'prompt': prompt}
+        if _wants_base64(body):
+            response['image'] = _file_b64(img_path)
         if isinstance(meta, dict):
             response['seed'] = meta.get('seed')
             response['prompt'] = meta.get('prompt', prompt)
+            response['cached'] = meta.get('cached', False)
         return jsonify(response)
     except Exception as e:
         return jsonify({'error': str(e), 'hint': 'Run A1111 WebUI or fallback will generate simple image'}), 500
@@ -237,47 +373,35 @@ def fn_generate_image():
 @app.route('/functions/v1/pipeline-status', methods=['POST', 'GET'])
 def fn_pipeline_status():
     # Check basic services: Ollama (ollama CLI or provided URL), A1111, ffmpeg
-    body = request.get_json() or {}
+    body = request.get_json(silent=True) or {}
+    job_id = body.get('jobId') or request.args.get('jobId')
     ollama_url = body.get('ollamaUrl') or body.get('ollama_url')
     piper_url = body.get('piperUrl') or body.get('piper_url')
     sd_url = body.get('sdUrl') or body.get('sd_url')
 
+    # Cached states from the shared health registry (no probe per request)
+    checks = [
+        ('Ollama', 'ollama', ollama_url or None),
+        ('A1111', 'a1111', sd_url or os.environ.get('A1111_HOST', 'http://127.0.0.1:7860')),
+        ('FFmpeg', 'ffmpeg', None),
+    ]
+    if piper_url:
+        checks.append(('TTS', 'tts', piper_url))
     services = []
-
-    # Ollama: check HTTP URL if provided else CLI
-    try:
-        import shutil
-        if ollama_url:
-            try:
-                r = requests.get(ollama_url.rstrip('/') + '/api/version', timeout=2)
-                ok = r.status_code == 200
-            except Exception:
-                ok = False
-            services.append({'name': 'Ollama', 'url': ollama_url, 'status': 'online' if ok else 'offline'})
-        else:
-            ollama_ok = shutil.which('ollama') is not None
-            services.append({'name': 'Ollama', 'url': None, 'status': 'online' if ollama_ok else 'offline'})
-    except Exception:
-        services.append({'name': 'Ollama', 'url': None, 'status': 'unknown'})
-
-    # A1111
-    try:
-        _, _, _, sd_mod, _ = _get_modules()
-        host = sd_url or os.environ.get('A1111_HOST', 'http://127.0.0.1:7860')
-        a1111_ok = sd_mod.is_server_alive(host)
-        services.append({'name': 'A1111', 'url': host, 'status': 'online' if a1111_ok else 'offline'})
-    except Exception:
-        services.append({'name': 'A1111', 'url': None, 'status': 'unknown'})
-
-    # FFmpeg
-    try:
-        import shutil
-        ffmpeg_ok = shutil.which('ffmpeg') is not None
-        services.append({'name': 'FFmpeg', 'url': None, 'status': 'online' if ffmpeg_ok else 'offline'})
-    except Exception:
-        services.append({'name': 'FFmpeg', 'url': None, 'status': 'unknown'})
-
-    return jsonify({'services': services, 'allOnline': all(s['status'] == 'online' for s in services)})
+    for name, service, target in checks:
+        try:
+            st = health.status(service, target)
+            status = {'up': 'online', 'down': 'offline'}.get(st['state'], 'unknown')
+            services.append({'name': name, 'url': target, 'status': status, 'circuit': st['circuit'],
+                             'latencyMs': st['latencyMs'], 'error': st['error']})
+        except Exception:
+            services.append({'name': name, 'url': target, 'status': 'unknown'})
+
+    response = {'services': services, 'allOnline': all(s['status'] == 'online' for s in services)}
+    if job_id:
+        from yt_brainrot import jobs
+        response['job'] = jobs.get_queue().get(job_id)
+    return jsonify(response)
 
 
 @app.route('/functions/v1/list-outputs', methods=['GET'])
@@ -309,14 +433,22 @@ def fn_get_file():
     if not fp.exists() or not fp.is_file():
         return jsonify({'error': 'file not found'}), 404
     from flask import send_file
-    return send_file(str(fp), as_attachment=False)
+    return send_file(str(fp), as_attachment=False, conditional=True, etag=True)
 
 
-@app.route('/functions/v1/run-pipeline', methods=['POST'])
-def fn_run_pipeline():
-    body = request.get_json() or {}
-    # Run modular pipeline: story -> tts -> image -> video
-    pipeline_id = str(int(time.time()))
+@app.route('/functions/v1/assets/<path:relpath>', methods=['GET'])
+def fn_asset(relpath):
+    """Stream a generated file from `outputs/` with Range, ETag and conditional GET support."""
+    from flask import send_from_directory
+    return send_from_directory(OUTPUTS_DIR.resolve(), relpath, conditional=True, etag=True)
+
+
+def run_pipeline_steps(body: dict, pipeline_id: str, on_step=None) -> dict:
+    """Run story -> tts -> image -> video -> publish and return the result dict.
+
+    `on_step(name, result)` is called whenever a step starts or finishes, so
+    callers (job queue, progress streams) can expose per-step status.
+    """
     started = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
     result = {
         'pipelineId': pipeline_id,
@@ -324,6 +456,12 @@ def fn_run_pipeline():
         'overallStatus': 'pending',
         'steps': {}
     }
+
+    def step(name: str, state: dict):
+        result['steps'][name] = state
+        if on_step:
+            on_step(name, result)
+
     try:
         # Flags from frontend
         generate_image = body.get('generateImage', True)
@@ -339,87 +477,274 @@ def fn_run_pipeline():
         # Story
         ollama_url = body.get('ollamaUrl') or body.get('ollama_url') or None
         llm_mod, tts_mod, visual_mod, sd_mod, editor_mod = _get_modules()
+        result['overallStatus'] = 'running'
         if generate_story:
+            step('story', {'status': 'running'})
             story = llm_mod.generate_story(prompt, model=body.get('ollamaModel') or None or 'bielik-4b-v3.0', ollama_url=ollama_url)
-            result['steps']['story'] = {'status': 'completed', 'data': {'story': story}}
+            step('story', {'status': 'completed', 'data': {'story': story}})
         else:
             # Use provided story if present
             story = body.get('story') or ''
-            result['steps']['story'] = {'status': 'skipped', 'note': 'Skipped story generation'}
+            step('story', {'status': 'skipped', 'note': 'Skipped story generation'})
 
         # TTS
         wav_path = outdir / 'speech.wav'
+        has_audio = False
+        audio_duration = None
+        want_b64 = _wants_base64(body)
         if generate_tts and story:
+            step('tts', {'status': 'running'})
             try:
                 # Directly call TTS module (supports remote HTTP TTS via http_url)
                 http_url = body.get('piperUrl') or body.get('coquiUrl') or None
-                meta = tts_mod.tts_to_wav(story, str(wav_path), voice=body.get('voice'), speed=body.get('speed') or body.get('piperSpeed'), http_url=http_url)
-                with open(meta['path'], 'rb') as f:
-                    audio_b64 = base64.b64encode(f.read()).decode('utf-8')
-                result['steps']['tts'] = {'status': 'completed', 'data': {'format': meta.get('format', 'wav'), 'voice': meta.get('voice'), 'backend': meta.get('backend'), 'hasAudio': True}}
-                result['audioBase64'] = audio_b64
+                meta = tts_mod.tts_to_wav(story, str(wav_path), voice=body.get('voice'), speed=body.get('speed') or body.get('piperSpeed'), http_url=http_url, use_cache=not body.get('noCache', False))
+                wav_path = Path(meta['path'])
+                audio_duration = meta.get('duration')
+                has_audio = True
+                if want_b64:
+                    result['audioBase64'] = _file_b64(wav_path)
+                result['audioPath'] = str(wav_path)
+                result['audioUrl'] = _asset_url(wav_path)
+                step('tts', {'status': 'completed', 'data': {'format': meta.get('format', 'wav'), 'voice': meta.get('voice'), 'backend': meta.get('backend'), 'cached': meta.get('cached', False), 'hasAudio': True, 'path': str(wav_path), 'duration': audio_duration}})
             except Exception as e:
-                result['steps']['tts'] = {'status': 'failed', 'error': str(e)}
+                step('tts', {'status': 'failed', 'error': str(e)})
         else:
-            result['steps']['tts'] = {'status': 'skipped', 'note': 'Skipped TTS generation'}
+            step('tts', {'status': 'skipped', 'note': 'Skipped TTS generation'})
 
         # Image
         img_path = outdir / 'bg.jpg'
-        img_b64 = None
+        has_image = False
         if generate_image:
+            step('image', {'status': 'running'})
             try:
                 host = body.get('sdUrl') or os.environ.get('A1111_HOST', 'http://127.0.0.1:7860')
                 meta = None
                 if sd_mod.is_server_alive(host):
-                    meta = sd_mod.generate_image_a1111(story, str(img_path), host=host, width=720, height=1280)
+                    meta = sd_mod.generate_image_a1111(story, str(img_path), host=host, width=720, height=1280,
+                                                       seed=_sd_seed(body), use_cache=not body.get('noCache', False))
                     if isinstance(meta, dict):
                         img_path = Path(meta.get('path', str(img_path)))
                 else:
-                    visual_mod.create_background_from_prompt(story, str(img_path), size=(720, 1280))
-                with open(img_path, 'rb') as f:
-                    img_b64 = base64.b64encode(f.read()).decode('utf-8')
-                img_meta = {'hasImage': True}
+                    visual_mod.create_background_from_prompt(story, str(img_path), size=(720, 1280),
+                                                             **_background_opts(body))
+                has_image = True
+                img_meta = {'hasImage': True, 'path': str(img_path)}
                 if isinstance(meta, dict):
                     img_meta['seed'] = meta.get('seed')
                     img_meta['prompt'] = meta.get('prompt')
-                result['steps']['image'] = {'status': 'completed', 'data': img_meta}
-                result['imageBase64'] = img_b64
+                    img_meta['cached'] = meta.get('cached', False)
+                if want_b64:
+                    result['imageBase64'] = _file_b64(img_path)
+                result['imagePath'] = str(img_path)
+                result['imageUrl'] = _asset_url(img_path)
+                step('image', {'status': 'completed', 'data': img_meta})
             except Exception as e:
-                result['steps']['image'] = {'status': 'failed', 'error': str(e)}
+                step('image', {'status': 'failed', 'error': str(e)})
         else:
-            result['steps']['image'] = {'status': 'skipped', 'note': 'Skipped image generation'}
+            step('image', {'status': 'skipped', 'note': 'Skipped image generation'})
 
-        # Video: create small then upscale if we have audio and image
-        if img_b64 and 'audioBase64' in result:
+        # Video: render final 1080x1920 in a single pass if we have audio and image
+        if has_image and has_audio:
+            step('video', {'status': 'running'})
             try:
-                small_video = outdir / 'short_small.mp4'
-                editor_mod.create_short_from_image(str(img_path), str(wav_path), str(small_video), width=720, height=1280)
                 final_video = outdir / 'short.mp4'
-                editor_mod.upscale_video_to_1080x1920(str(small_video), str(final_video))
-                result['steps']['video'] = {'status': 'completed', 'note': str(final_video)}
+                # BRAND_INTRO/BRAND_OUTRO of this server; `"brand": false` renders without them
+                branding = editor_mod.segments.from_env() if body.get('brand', True) else {}
+                editor_mod.create_short_single_pass(
+                    str(img_path), str(wav_path), str(final_video),
+                    profile=body.get('encodingProfile'),
+                    preset=body.get('encodingPreset'),
+                    crf=body.get('encodingCrf'),
+                    encoder=body.get('videoEncoder'),
+                    progress=lambda pct: step('video', {'status': 'running', 'progress': round(pct, 1)}),
+                    duration=audio_duration,
+                    **branding,
+                )
+                result['videoPath'] = str(final_video)
+                result['videoUrl'] = _asset_url(final_video)
+                step('video', {'status': 'completed', 'note': str(final_video)})
             except Exception as e:
-                result['steps']['video'] = {'status': 'failed', 'error': str(e)}
+                step('video', {'status': 'failed', 'error': str(e)})
         else:
-            result['steps']['video'] = {'status': 'skipped', 'note': 'Not enough assets to build video'}
+            step('video', {'status': 'skipped', 'note': 'Not enough assets to build video'})
 
         # Publish (skeleton)
         if publish_flag and result['steps'].get('video', {}).get('status') == 'completed':
+            step('publish', {'status': 'running'})
             try:
-                from yt_brainrot import publisher as pub
+                # uploaded by the publish queue's workers; this request does not wait for Postiz
+                pq = registry.get('publish_queue').get_queue()
+                pq.start()
                 title, description, tags = build_metadata(story) if 'story' in locals() else ('', '', [])
-                res = pub.publish_to_postiz(str(final_video), title, description, tags)
-                result['steps']['publish'] = {'status': 'completed', 'note': 'Published via Postiz', 'response': res}
+                entry = pq.enqueue(str(final_video), title, description, tags)
+                step('publish', {'status': 'queued', 'note': 'Queued for Postiz upload', 'publishKey': entry['key'],
+                                 'statusUrl': f"/functions/v1/publish-queue/{entry['key']}"})
             except Exception as e:
-                result['steps']['publish'] = {'status': 'failed', 'error': str(e)}
+                step('publish', {'status': 'failed', 'error': str(e)})
         else:
-            result['steps']['publish'] = {'status': 'skipped', 'note': 'Publish not requested or no video'}
+            step('publish', {'status': 'skipped', 'note': 'Publish not requested or no video'})
         result['overallStatus'] = 'completed'
         result['completedAt'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        return jsonify(result)
     except Exception as e:
         result['overallStatus'] = 'failed'
         result['error'] = str(e)
+    return result
+
+
+def _without_blobs(result: dict) -> dict:
+    return {k: v for k, v in result.items() if k not in ('audioBase64', 'imageBase64')}
+
+
+def _submit_pipeline_job(body: dict):
+    """Queue a pipeline run; returns a (response, status) tuple with the job id."""
+    from yt_brainrot import jobs
+    try:
+        _sd_seed(body)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def work(job_id, update):
+        pipeline_id = f'{int(time.time())}_{job_id}'
+        res = run_pipeline_steps(body, pipeline_id, on_step=lambda name, r: update(_without_blobs(r)))
+        if res['overallStatus'] == 'failed':
+            raise RuntimeError(res.get('error') or 'pipeline failed')
+        return _without_blobs(res)
+
+    try:
+        job = jobs.get_queue().submit('run-pipeline', work, payload=body)
+    except jobs.QueueFull as e:
+        return jsonify({'error': str(e), 'hint': 'Retry later'}), 429
+    return jsonify({'jobId': job['jobId'], 'status': job['status'],
+                    'statusUrl': f"/functions/v1/pipeline-jobs/{job['jobId']}"}), 202
+
+
+@app.route('/functions/v1/run-pipeline', methods=['POST'])
+def fn_run_pipeline():
+    body = request.get_json() or {}
+    if body.get('async'):
+        return _submit_pipeline_job(body)
+    try:
+        _sd_seed(body)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    result = run_pipeline_steps(body, str(int(time.time())))
+    if result['overallStatus'] == 'failed':
         return jsonify(result), 500
+    return jsonify(result)
+
+
+def _sse(event: str, data) -> str:
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+def _sse_response(gen):
+    return Response(stream_with_context(gen), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def _query_body() -> dict:
+    """JSON body, or query args for EventSource GETs ('false'/'0' become False)."""
+    body = request.get_json(silent=True)
+    if body is not None:
+        return body
+    out = {}
+    for k, v in request.args.items():
+        out[k] = False if v.lower() in ('false', '0', 'no', '') else (True if v.lower() in ('true', '1', 'yes') else v)
+    return out
+
+
+@app.route('/functions/v1/run-pipeline-stream', methods=['POST', 'GET'])
+def fn_run_pipeline_stream():
+    """Run the pipeline and stream one SSE `step` event per step change.
+
+    Events: `step` ({'step': name, 'status', 'data'|'note'|'error'|'progress'}),
+    then `done` with the final result (paths instead of base64 blobs).
+    """
+    body = _query_body()
+    try:
+        _sd_seed(body)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    events: queue.Queue = queue.Queue()
+
+    def work():
+        try:
+            res = run_pipeline_steps(body, str(int(time.time())),
+                                     on_step=lambda name, r: events.put(('step', dict(r['steps'][name], step=name))))
+            events.put(('done', _without_blobs(res)))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=work, name='pipeline-stream', daemon=True).start()
+
+    def stream():
+        yield ': started\n\n'
+        while True:
+            try:
+                item = events.get(timeout=15)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            if item is None:
+                break
+            yield _sse(*item)
+
+    return _sse_response(stream())
+
+
+@app.route('/functions/v1/pipeline-jobs', methods=['POST', 'GET'])
+def fn_pipeline_jobs():
+    """POST: queue a pipeline run (same JSON as run-pipeline) and return its job id at once.
+    GET: list recent jobs."""
+    if request.method == 'POST':
+        return _submit_pipeline_job(request.get_json() or {})
+    from yt_brainrot import jobs
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    return jsonify({'jobs': jobs.get_queue().list(limit), 'pending': jobs.get_queue().pending()})
+
+
+@app.route('/functions/v1/pipeline-jobs/<job_id>', methods=['GET'])
+def fn_pipeline_job(job_id):
+    """Status, per-step progress and result of one queued pipeline run."""
+    from yt_brainrot import jobs
+    job = jobs.get_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'job not found'}), 404
+    return jsonify(job)
+
+
+@app.route('/functions/v1/pipeline-jobs/<job_id>/events', methods=['GET'])
+def fn_pipeline_job_events(job_id):
+    """SSE view of a queued job: a `step` event whenever a step changes, then `done`."""
+    from yt_brainrot import jobs
+    q = jobs.get_queue()
+    if q.get(job_id) is None:
+        return jsonify({'error': 'job not found'}), 404
+
+    def stream():
+        sent = {}
+        last_beat = time.time()
+        while True:
+            job = q.get(job_id)
+            steps = ((job or {}).get('result') or {}).get('steps') or {}
+            for name, state in steps.items():
+                if sent.get(name) != state:
+                    sent[name] = state
+                    yield _sse('step', dict(state, step=name))
+            if job is None or job['status'] in ('completed', 'failed'):
+                yield _sse('done', job)
+                break
+            if time.time() - last_beat > 15:
+                last_beat = time.time()
+                yield ': keep-alive\n\n'
+            time.sleep(0.5)
+
+    return _sse_response(stream())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,36 @@
+"""Konfiguracja gunicorna z rozgrzewaniem workera.
+
+Użycie:
+  gunicorn -c webapp/gunicorn.conf.py webapp.app:app
+
+`post_fork` importuje moduły backendów (`registry.warm_up`), zanim worker
+przyjmie pierwsze żądanie; `WARM_UP=0` wyłącza rozgrzewanie,
+`WARM_UP_VOICES=1` buduje też inwentarz głosów TTS. Czasy importów widać
+pod `/functions/v1/modules`.
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '300'))
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() not in ('0', 'false', 'no', '')
+
+
+def post_fork(server, worker):
+    if not _flag('WARM_UP', '1'):
+        return
+    from yt_brainrot import registry
+    res = registry.warm_up(voices=_flag('WARM_UP_VOICES', '0'))
+    total = sum(m['seconds'] or 0 for m in res['modules'].values())
+    server.log.info('worker %s warmed up in %.2fs%s', worker.pid, total,
+                    f' (errors: {res["errors"]})' if res['errors'] else '')
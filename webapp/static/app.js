@@ -2,6 +2,7 @@ const API = {
   status: '/functions/v1/pipeline-status',
   voices: '/functions/v1/tts-voices',
   run: '/functions/v1/run-pipeline',
+  runStream: '/functions/v1/run-pipeline-stream',
   list: '/functions/v1/list-outputs',
   getFile: '/functions/v1/get-file'
 };
@@ -80,7 +81,7 @@ async function runQueue(){
     const item = queue.shift();
     item.status = 'running'; renderQueue();
     try{
-      const res = await runPipelineOnce();
+      const res = await runPipelineOnce(item);
       item.status = 'done';
       updateLastResult();
     }catch(e){
@@ -91,7 +92,20 @@ async function runQueue(){
   running = false;
 }
 
-async function runPipelineOnce(){
+function fileUrl(path){ return `${API.getFile}?path=${encodeURIComponent(path)}`; }
+
+function showStep(item, ev){
+  // render partial results as soon as each step finishes
+  item.status = ev.status === 'running' && ev.progress != null ? `${ev.step} ${ev.progress}%` : `${ev.step}: ${ev.status}`;
+  renderQueue();
+  const data = ev.data || {};
+  if(ev.status !== 'completed') return;
+  if(ev.step === 'story' && data.story){ el('last-result').textContent = data.story; }
+  if(ev.step === 'image' && data.path){ el('last-result').innerHTML += `<div><img src="${fileUrl(data.path)}" style="max-width:240px"></div>`; }
+  if(ev.step === 'tts' && data.path){ el('last-result').innerHTML += `<div><audio controls src="${fileUrl(data.path)}"></audio></div>`; }
+}
+
+async function runPipelineOnce(item){
   const body = {
     generateStory: !!el('step-story').checked,
     generateTTS: !!el('step-tts').checked,
@@ -105,10 +119,28 @@ async function runPipelineOnce(){
     voice: el('voice-select').value || null,
     speed: parseFloat(el('voice-speed').value) || 1.0
   };
-  const r = await fetch(API.run, {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify(body)});
-  const j = await r.json();
-  if(r.status !== 200) throw new Error(JSON.stringify(j));
-  return j;
+  const r = await fetch(API.runStream, {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify(body)});
+  if(r.status !== 200 || !r.body) throw new Error(await r.text());
+  const reader = r.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = '', result = null;
+  for(;;){
+    const {value, done} = await reader.read();
+    if(done) break;
+    buf += decoder.decode(value, {stream: true});
+    let sep;
+    while((sep = buf.indexOf('\n\n')) >= 0){
+      const chunk = buf.slice(0, sep); buf = buf.slice(sep + 2);
+      const ev = (chunk.match(/^event: (.*)$/m) || [])[1];
+      const data = (chunk.match(/^data: (.*)$/m) || [])[1];
+      if(!ev || !data) continue;
+      const j = JSON.parse(data);
+      if(ev === 'step') showStep(item, j);
+      if(ev === 'done') result = j;
+    }
+  }
+  if(!result || result.overallStatus === 'failed') throw new Error(JSON.stringify(result));
+  return result;
 }
 
 async function updateLastResult(){
@@ -0,0 +1,154 @@
+"""Długość nagrania bez uruchamiania ffprobe.
+
+Wszystkie backendy TTS zapisują WAV, więc długość liczona jest z nagłówka
+RIFF (chunk `fmt ` + rozmiar `data`; także RF64 i nagłówki niedomknięte przy
+zapisie strumieniowym, gdzie rozmiar bierzemy z długości pliku). Inne formaty
+idą przez `ffprobe`, a bez niego przez `ffmpeg -i`. Wyniki są trzymane w
+pamięci pod kluczem (ścieżka, mtime, rozmiar); TTS po zapisie pliku zapisuje
+tu znaną długość (`remember`), więc montaż nie czyta jej drugi raz.
+
+Nieudany odczyt rzuca `ValueError` zamiast zgadywać długość.
+"""
+import json
+import os
+import re
+import shutil
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+MAX_ENTRIES = 1024
+_UNKNOWN_SIZE = (0, 0xFFFFFFFF)
+# formats whose duration is data bytes / block align: PCM, IEEE float, A-law, mu-law, extensible
+_FRAMED = (0x0001, 0x0003, 0x0006, 0x0007, 0xFFFE)
+
+
+def wav_duration(path: str) -> float:
+    """Seconds of audio in a RIFF/RIFX/RF64 WAVE file, read from its header."""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        head = f.read(12)
+        if len(head) < 12 or head[:4] not in (b'RIFF', b'RIFX', b'RF64') or head[8:] != b'WAVE':
+            raise ValueError(f'{path}: not a WAV file')
+        endian = '>' if head[:4] == b'RIFX' else '<'
+        fmt = fact = data_size = ds64_data = None
+        while True:
+            hdr = f.read(8)
+            if len(hdr) < 8:
+                break
+            cid, size = hdr[:4], struct.unpack(endian + 'I', hdr[4:])[0]
+            if cid == b'data':
+                if size == 0xFFFFFFFF and ds64_data is not None:
+                    size = ds64_data
+                remaining = file_size - f.tell()
+                # a streamed writer never came back to fill in the size
+                data_size = remaining if size in _UNKNOWN_SIZE or size > remaining else size
+                break
+            if cid in (b'fmt ', b'fact', b'ds64'):
+                body = f.read(size)
+                if cid == b'fmt ' and len(body) >= 14:
+                    fmt = struct.unpack(endian + 'HHIIH', body[:14])
+                elif cid == b'fact' and len(body) >= 4:
+                    fact = struct.unpack(endian + 'I', body[:4])[0]
+                elif cid == b'ds64' and len(body) >= 16:
+                    ds64_data = struct.unpack('<Q', body[8:16])[0]
+                f.seek(size & 1, 1)  # chunks are word aligned
+            else:
+                f.seek(size + (size & 1), 1)
+    if fmt is None or data_size is None:
+        raise ValueError(f'{path}: WAV header without fmt/data chunk')
+    tag, channels, rate, byte_rate, block_align = fmt
+    if not rate:
+        raise ValueError(f'{path}: WAV sample rate is 0')
+    if tag in _FRAMED and block_align:
+        return (data_size // block_align) / rate
+    if fact is not None:
+        return fact / rate
+    if byte_rate:
+        return data_size / byte_rate
+    raise ValueError(f'{path}: cannot compute duration of WAV format 0x{tag:04x}')
+
+
+def _probe_duration(path: str) -> float:
+    """Duration of any container via ffprobe, or `ffmpeg -i` when ffprobe is missing."""
+    if shutil.which('ffprobe'):
+        p = subprocess.run(['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', path],
+                           capture_output=True, text=True, check=False)
+        try:
+            return float(json.loads(p.stdout)['format']['duration'])
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f'{path}: ffprobe found no duration ({p.stderr.strip()[:200]})')
+    p = subprocess.run(['ffmpeg', '-hide_banner', '-i', path], capture_output=True, text=True, check=False)
+    m = re.search(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', p.stderr)
+    if not m:
+        raise ValueError(f'{path}: ffmpeg found no duration')
+    h, mnt, s = m.groups()
+    return int(h) * 3600 + int(mnt) * 60 + float(s)
+
+
+_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+_stats = {'hits': 0, 'wav': 0, 'probes': 0}
+_lock = threading.Lock()
+
+
+def _identity(path: str):
+    st = os.stat(path)
+    return os.path.realpath(path), (st.st_mtime_ns, st.st_size)
+
+
+def _store(key: str, ident: tuple, seconds: float):
+    with _lock:
+        _cache[key] = (ident, seconds)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def remember(path: str, seconds: float):
+    """Record a duration the caller already knows (e.g. frames just written by TTS)."""
+    key, ident = _identity(str(path))
+    _store(key, ident, float(seconds))
+
+
+def duration(path: str) -> float:
+    """Duration in seconds; WAV from the header, other formats via ffprobe. Cached by path + mtime."""
+    path = str(path)
+    key, ident = _identity(path)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == ident:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return hit[1]
+    with open(path, 'rb') as f:
+        magic = f.read(12)
+    if magic[:4] in (b'RIFF', b'RIFX', b'RF64') and magic[8:] == b'WAVE':
+        seconds = wav_duration(path)
+        counter = 'wav'
+    else:
+        seconds = _probe_duration(path)
+        counter = 'probes'
+    with _lock:
+        _stats[counter] += 1
+    _store(key, ident, seconds)
+    return seconds
+
+
+def try_duration(path: str) -> Optional[float]:
+    """`duration()` or None when the file cannot be read or measured."""
+    try:
+        return duration(path)
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats, entries=len(_cache))
+
+
+def clear():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,125 @@
+"""Zapamiętywanie działającego endpointu dla serwerów o nieznanym API (Ollama, TTS).
+
+Pierwsze wywołanie dla danego (rodzaj, bazowy URL) sprawdza kandydatów po
+kolei (ścieżka × kształt payloadu); pierwszy, który zwróci wynik, jest
+zapamiętywany razem z kształtem odpowiedzi i kolejne wywołania idą prosto do
+niego. Gdy zapamiętany kandydat przestaje działać, sondowanie rusza od nowa.
+
+Dostępność hosta ocenia rejestr `health`: niedostępny URL jest pomijany bez
+żadnych zapytań, a błąd połączenia w trakcie sondowania przerywa je i jest
+zgłaszany do rejestru, więc źle ustawiony adres nie dokłada minut opóźnienia
+do każdego shorta.
+
+Trwałość: wpisy trafiają też do `DISCOVERY_FILE` (domyślnie
+outputs/cache/endpoints.json); pusta wartość = tylko pamięć.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+import requests
+
+from . import health
+
+_lock = threading.Lock()
+_known: dict = {}    # key -> remembered candidate (+ 'response' shape)
+_loaded = False
+
+
+def _file() -> Optional[Path]:
+    path = os.environ.get('DISCOVERY_FILE', os.path.join('outputs', 'cache', 'endpoints.json'))
+    return Path(path) if path else None
+
+
+def _load():
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    path = _file()
+    try:
+        if path and path.exists():
+            _known.update(json.loads(path.read_text(encoding='utf-8')))
+    except Exception:
+        pass
+
+
+def _save():
+    path = _file()
+    if not path:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(_known, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def _key(kind: str, base_url: str) -> str:
+    return f'{kind}:{base_url.rstrip("/")}'
+
+
+def known(kind: str, base_url: str) -> Optional[dict]:
+    with _lock:
+        _load()
+        entry = _known.get(_key(kind, base_url))
+        return dict(entry) if entry else None
+
+
+def forget(kind: Optional[str] = None, base_url: Optional[str] = None):
+    """Drop remembered endpoints (all of them, or one (kind, base_url))."""
+    with _lock:
+        _load()
+        if kind is None:
+            _known.clear()
+        else:
+            _known.pop(_key(kind, base_url), None)
+        _save()
+
+
+def discover(kind: str, base_url: str, candidates: Iterable[dict],
+             attempt: Callable[[dict, bool], Optional[Tuple[object, object]]]):
+    """Return the first non-None value of `attempt(candidate, probing)`.
+
+    `attempt` returns `(value, response_shape)` or None; the remembered candidate
+    (with 'response' set to the shape) is passed back first on later calls, with
+    `probing=False`. URLs that `health` reports as down are skipped; connection
+    errors abort the probe and are reported there; a read timeout aborts it
+    without remembering anything. Returns None when nothing answered.
+    """
+    key = _key(kind, base_url)
+    if kind in health.CHECKS and not health.is_up(kind, base_url):
+        return None
+    with _lock:
+        _load()
+        remembered = _known.get(key)
+    strip = lambda c: {k: v for k, v in c.items() if k != 'response'}
+    order = [dict(remembered)] if remembered else []
+    order += [c for c in candidates if not remembered or c != strip(remembered)]
+
+    for i, cand in enumerate(order):
+        probing = not (remembered and i == 0)
+        try:
+            res = attempt(cand, probing)
+        except requests.exceptions.ConnectionError as e:
+            # covers connect timeouts; no other path on this host will answer either
+            health.report(kind, base_url, ok=False, error=str(e))
+            return None
+        except requests.exceptions.Timeout:
+            # the server accepted the request but is slow: don't pile more work on it
+            return None
+        except Exception:
+            res = None
+        if res is not None:
+            value, shape = res
+            entry = dict(strip(cand), response=shape)
+            if entry != remembered:
+                with _lock:
+                    _known[key] = entry
+                    _save()
+            return value
+    return None
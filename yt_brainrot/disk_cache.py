@@ -0,0 +1,129 @@
+"""Wspólny dyskowy cache adresowany treścią z eksmisją LRU po rozmiarze.
+
+Wpis to `<klucz><suffix>` (dane) + `<klucz>.json` (metadane). Trafienie
+odświeża mtime pliku, a przy zapisie usuwane są najdawniej używane wpisy aż
+łączny rozmiar zmieści się w `max_bytes`. Używane przez `tts_cache` i
+`image_cache`.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+def hash_key(obj) -> str:
+    """SHA-256 of a JSON-serializable object with sorted keys."""
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, directory, max_bytes: int, suffix: str):
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f'{key}{self.suffix}'
+
+    def get(self, key: str, out_path=None) -> Optional[dict]:
+        """Return stored metadata, or None.
+
+        With `out_path` the data is copied there and 'path' points at the copy;
+        without it 'path' points into the cache, where the entry may be evicted
+        at any time, so keep such a path only for an immediate read.
+        """
+        data = self.path_for(key)
+        try:
+            meta = json.loads((self.directory / f'{key}.json').read_text(encoding='utf-8'))
+            os.utime(data)  # mark as recently used; raises if the data file is gone
+            if out_path is not None:
+                Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(data, out_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            self._stats['hits'] += 1
+        meta['path'] = str(out_path if out_path is not None else data)
+        meta['cached'] = True
+        return meta
+
+    def put(self, key: str, src_path: str, meta: dict) -> dict:
+        """Copy `src_path` into the cache and evict old entries if needed."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # '.tmp' keeps half-written files out of the `*{suffix}` globs of _evict/stats
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(fd)
+        try:
+            shutil.copyfile(src_path, tmp)
+            os.replace(tmp, self.path_for(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        stored = {k: v for k, v in meta.items() if k not in ('path', 'cached')}
+        (self.directory / f'{key}.json').write_text(json.dumps(stored, ensure_ascii=False), encoding='utf-8')
+        with self._lock:
+            self._stats['stores'] += 1
+            self._evict()
+        return meta
+
+    def put_bytes(self, key: str, data: bytes, meta: dict) -> dict:
+        fd, tmp = tempfile.mkstemp(suffix=self.suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return self.put(key, tmp, meta)
+        finally:
+            os.unlink(tmp)
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for p in self.directory.glob(f'*{self.suffix}'):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        entries.sort()
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            for f in (p, p.with_suffix('.json')):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+            total -= size
+            self._stats['evictions'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            res = dict(self._stats)
+        sizes = []
+        if self.directory.exists():
+            for p in self.directory.glob(f'*{self.suffix}'):
+                try:
+                    sizes.append(p.stat().st_size)
+                except OSError:
+                    pass
+        res['entries'] = len(sizes)
+        res['bytes'] = sum(sizes)
+        res['maxBytes'] = self.max_bytes
+        return res
+
+    def clear(self):
+        with self._lock:
+            if self.directory.exists():
+                shutil.rmtree(self.directory)
+            for k in self._stats:
+                self._stats[k] = 0
@@ -2,46 +2,186 @@
 """
 import subprocess
 from pathlib import Path
-import json
+from typing import Callable, Optional
+
+from . import audio_info, encoders, segments
+
+
+# Encoding profiles in libx264 terms (other encoders translate preset/crf, see
+# `encoders`). `fps` is used both as the image loop rate and the output rate,
+# `gop` is the keyframe interval in frames.
+ENCODING_PROFILES = {
+    # Same settings the old upscale step used; safe for any content.
+    'default': {'fps': 30, 'preset': 'slow', 'crf': 18, 'tune': None, 'gop': None},
+    # Static background: few frames, long GOP, x264 tuned for still pictures.
+    'still': {'fps': 5, 'preset': 'veryfast', 'crf': 20, 'tune': 'stillimage', 'gop': 300},
+}
+
+
+def resolve_profile(profile: Optional[str] = None, preset: Optional[str] = None,
+                    crf: Optional[int] = None, encoder: Optional[str] = None) -> dict:
+    """Return encoding options for `profile` with optional preset/crf/encoder overrides.
+
+    Without `encoder` the host default is used (`encoders.host_default`); its
+    benchmarked preset applies unless `preset` is given.
+    """
+    name = profile or 'default'
+    if name not in ENCODING_PROFILES:
+        raise ValueError(f'Unknown encoding profile: {name} (available: {", ".join(ENCODING_PROFILES)})')
+    opts = dict(ENCODING_PROFILES[name])
+    if encoder is None:
+        host = encoders.host_default(name)
+        opts['encoder'] = host['encoder']
+        if host.get('preset'):
+            opts['preset'] = host['preset']
+    else:
+        opts['encoder'] = encoder
+    if opts['encoder'] not in encoders.ENCODERS:
+        raise ValueError(f'Unknown video encoder: {opts["encoder"]} (available: {", ".join(encoders.ENCODERS)})')
+    if preset:
+        opts['preset'] = preset
+    if crf is not None:
+        opts['crf'] = int(crf)
+    return opts
 
 
 def get_audio_duration(audio_path: str) -> float:
+    """Duration in seconds (WAV header, ffprobe for other formats); raises ValueError if unknown."""
+    return audio_info.duration(audio_path)
+
+
+def _duration_args(audio_path: str, duration: Optional[float]) -> tuple:
+    """(`-t` args, seconds for progress); without a known duration `-shortest` ends the video."""
+    if duration is None:
+        duration = audio_info.try_duration(audio_path)
+    if duration is None:
+        return [], 0.0
+    return ['-t', str(duration)], float(duration)
+
+
+def _audio_args(branded: bool) -> list:
+    """AAC for the short; branded shorts use the stream parameters of the cached segments."""
+    return segments.STREAM_ARGS if branded else ['-c:a', 'aac', '-b:a', '192k']
+
+
+def _attach_segments(render_path: str, out_path: str, opts: dict, width: int, height: int,
+                     intro: Optional[str], outro: Optional[str]):
     try:
-        cmd = [
-            'ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', audio_path
-        ]
-        p = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        out = p.stdout
-        j = json.loads(out)
-        return float(j['format']['duration'])
-    except Exception:
-        return 30.0
+        segments.attach(render_path, out_path, opts, width, height, intro=intro, outro=outro)
+    finally:
+        Path(render_path).unlink(missing_ok=True)
+
+
+def _run_ffmpeg(cmd: list, duration: float, progress: Optional[Callable[[float], None]] = None):
+    """Run ffmpeg; with `progress`, report encode percentage parsed from `-progress`."""
+    if progress is None:
+        subprocess.run(cmd, check=True)
+        return
+    cmd = [cmd[0], '-progress', 'pipe:1', '-nostats', *cmd[1:]]
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    for line in p.stdout:
+        key, _, value = line.strip().partition('=')
+        try:
+            if key in ('out_time_us', 'out_time_ms') and duration > 0:
+                # both keys are microseconds in ffmpeg's -progress output
+                progress(min(100.0, int(value) / 1e6 / duration * 100))
+            elif key == 'progress' and value == 'end':
+                progress(100.0)
+        except ValueError:
+            pass
+    if p.wait() != 0:
+        raise subprocess.CalledProcessError(p.returncode, cmd)
 
 
 def create_short_from_image(image_path: str, audio_path: str, out_path: str,
-                            width: int = 1080, height: int = 1920) -> str:
+                            width: int = 1080, height: int = 1920,
+                            profile: Optional[str] = None, preset: Optional[str] = None,
+                            crf: Optional[int] = None, duration: Optional[float] = None,
+                            encoder: Optional[str] = None, intro: Optional[str] = None,
+                            outro: Optional[str] = None) -> str:
     """Create a short by combining image and audio.
 
     `width`/`height` specify target video resolution. For downsizing workflow,
     pass 720x1280 here and then upscale the resulting video.
+    `profile` selects one of `ENCODING_PROFILES` (e.g. 'still'); without it the
+    libx264 defaults at 30 fps are used. `encoder` picks one of
+    `encoders.ENCODERS`. `duration` (seconds of audio, e.g. from TTS metadata)
+    skips probing the audio file. `intro`/`outro` (image or clip) are encoded
+    once per settings and attached by stream copy (see `segments`).
     """
     image_path = str(image_path)
     audio_path = str(audio_path)
     out_path = str(out_path)
-    duration = get_audio_duration(audio_path)
+    t_args, duration = _duration_args(audio_path, duration)
+    branded = bool(intro or outro)
+    render_path = segments.partial_path(out_path) if branded else out_path
 
     vf = (
         f'scale={width}:{height}:force_original_aspect_ratio=decrease,'
         f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,format=yuv420p'
     )
 
+    if profile or preset or crf is not None or encoder or branded:
+        opts = resolve_profile(profile, preset, crf, encoder)
+        in_args, codec_args, vf_tail = encoders.ffmpeg_args(opts)
+        cmd = [
+            'ffmpeg', '-y', *in_args, '-loop', '1', '-framerate', str(opts['fps']), '-i', image_path,
+            '-i', audio_path, *codec_args, *t_args,
+            '-vf', vf + vf_tail,
+            *_audio_args(branded), '-shortest', render_path
+        ]
+    else:
+        cmd = [
+            'ffmpeg', '-y', '-loop', '1', '-i', image_path, '-i', audio_path,
+            '-c:v', 'libx264', *t_args, '-r', '30',
+            '-vf', vf,
+            '-c:a', 'aac', '-b:a', '192k', '-shortest', out_path
+        ]
+    subprocess.run(cmd, check=True)
+    if branded:
+        _attach_segments(render_path, out_path, opts, width, height, intro, outro)
+    return out_path
+
+
+def create_short_single_pass(image_path: str, audio_path: str, out_path: str,
+                             width: int = 1080, height: int = 1920,
+                             profile: Optional[str] = None, preset: Optional[str] = None,
+                             crf: Optional[int] = None,
+                             progress: Optional[Callable[[float], None]] = None,
+                             duration: Optional[float] = None, encoder: Optional[str] = None,
+                             intro: Optional[str] = None, outro: Optional[str] = None) -> str:
+    """Render the final short straight from a still image and audio in one ffmpeg run.
+
+    Replaces the `create_short_from_image` (720x1280) + `upscale_video_to_1080x1920`
+    workflow: the image is scaled once with lanczos and encoded once with the
+    same settings the upscaler used, so there is no second encode and no
+    generation loss. `profile`/`preset`/`crf` select the encoding settings
+    (see `ENCODING_PROFILES`), `encoder` the video encoder (default: the host's
+    benchmarked choice, see `encoders`). `progress(percent)` is called as ffmpeg encodes.
+    `duration` (seconds of audio, e.g. from TTS metadata) skips probing the audio file.
+    `intro`/`outro` (image or clip, e.g. `segments.from_env()`) are encoded once
+    with the same settings, cached and joined to the short by stream copy.
+    """
+    image_path = str(image_path)
+    audio_path = str(audio_path)
+    out_path = str(out_path)
+    t_args, duration = _duration_args(audio_path, duration)
+    branded = bool(intro or outro)
+    render_path = segments.partial_path(out_path) if branded else out_path
+
+    vf = segments.fit_filter(width, height)
+
+    opts = resolve_profile(profile, preset, crf, encoder)
+    in_args, codec_args, vf_tail = encoders.ffmpeg_args(opts)
     cmd = [
-        'ffmpeg', '-y', '-loop', '1', '-i', image_path, '-i', audio_path,
-        '-c:v', 'libx264', '-t', str(duration), '-r', '30',
-        '-vf', vf,
-        '-c:a', 'aac', '-b:a', '192k', '-shortest', out_path
+        'ffmpeg', '-y', *in_args, '-loop', '1', '-framerate', str(opts['fps']), '-i', image_path,
+        '-i', audio_path, *codec_args, *t_args,
+        '-vf', vf + vf_tail,
+        *_audio_args(branded), '-shortest', render_path
     ]
-    subprocess.run(cmd, check=True)
+    _run_ffmpeg(cmd, duration, progress)
+    if branded:
+        _attach_segments(render_path, out_path, opts, width, height, intro, outro)
     return out_path
 
 
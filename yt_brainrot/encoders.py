@@ -0,0 +1,243 @@
+"""Wybór kodera wideo: libx264/libx265/libsvtav1 na CPU, VAAPI/QSV gdy ffmpeg je ma.
+
+Profile z `editor.ENCODING_PROFILES` opisują preset i CRF w skali libx264;
+każdy koder tłumaczy je na własne parametry (nazwy presetów, przesunięcie
+skali jakości), więc ten sam profil daje zbliżoną jakość na każdym koderze.
+
+Domyślny koder hosta: `VIDEO_ENCODER` (wymusza), potem wynik `benchmark()`
+zapisany w `ENCODER_FILE` (domyślnie outputs/cache/encoder.json; osobno dla
+każdego profilu), a bez niego libx264. Benchmark koduje referencyjny short
+każdym dostępnym koderem/presetem, mierzy czas i jakość względem
+bezstratnej referencji (SSIM albo VMAF liczone przez ffmpeg) i zapisuje
+najszybszy wariant spełniający próg. CLI: `python scripts/encoders.py`.
+"""
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+import wave
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+VAAPI_DEVICE = os.environ.get('VAAPI_DEVICE', '/dev/dri/renderD128')
+
+_SVT_PRESETS = {'ultrafast': 12, 'superfast': 11, 'veryfast': 10, 'faster': 9, 'fast': 8,
+                'medium': 7, 'slow': 5, 'slower': 4, 'veryslow': 3}
+_QSV_PRESETS = {'ultrafast': 'veryfast', 'superfast': 'veryfast'}
+
+
+def _x26x(spec: dict, opts: dict) -> tuple:
+    args = ['-c:v', spec['codec'], '-preset', opts['preset'], '-crf', str(opts['crf'] + spec['crf_offset'])]
+    if opts.get('tune') and spec['codec'] == 'libx264':
+        args += ['-tune', opts['tune']]
+    if spec['codec'] == 'libx265':
+        args += ['-x265-params', 'log-level=error', '-tag:v', 'hvc1']
+    return [], args, ''
+
+
+def _svtav1(spec: dict, opts: dict) -> tuple:
+    preset = _SVT_PRESETS.get(opts['preset'], opts['preset'])
+    return [], ['-c:v', 'libsvtav1', '-preset', str(preset), '-crf', str(opts['crf'] + spec['crf_offset'])], ''
+
+
+def _vaapi(spec: dict, opts: dict) -> tuple:
+    return (['-vaapi_device', VAAPI_DEVICE], ['-c:v', 'h264_vaapi', '-qp', str(opts['crf'] + spec['crf_offset'])],
+            ',format=nv12,hwupload')
+
+
+def _qsv(spec: dict, opts: dict) -> tuple:
+    preset = _QSV_PRESETS.get(opts['preset'], opts['preset'])
+    return [], ['-c:v', 'h264_qsv', '-preset', preset, '-global_quality', str(opts['crf'] + spec['crf_offset'])], \
+        ',format=nv12'
+
+
+# name -> ffmpeg encoder, hardware flag, offset from the x264 CRF scale,
+# presets tried by the benchmark, builder(spec, opts) -> (input args, codec args, -vf suffix)
+ENCODERS: Dict[str, dict] = {
+    'x264': {'codec': 'libx264', 'hw': False, 'crf_offset': 0, 'args': _x26x,
+             'presets': ['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium']},
+    'x265': {'codec': 'libx265', 'hw': False, 'crf_offset': 4, 'args': _x26x,
+             'presets': ['ultrafast', 'superfast', 'veryfast', 'fast']},
+    'svtav1': {'codec': 'libsvtav1', 'hw': False, 'crf_offset': 12, 'args': _svtav1,
+               'presets': ['ultrafast', 'veryfast', 'fast']},
+    'vaapi': {'codec': 'h264_vaapi', 'hw': True, 'crf_offset': 2, 'args': _vaapi, 'presets': ['medium']},
+    'qsv': {'codec': 'h264_qsv', 'hw': True, 'crf_offset': 2, 'args': _qsv, 'presets': ['veryfast', 'medium']},
+}
+DEFAULT = 'x264'
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_encoders() -> frozenset:
+    try:
+        out = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, text=True,
+                             timeout=20).stdout
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    return frozenset(m.group(1) for m in re.finditer(r'^\s*V\S*\s+(\S+)', out, re.M))
+
+
+@lru_cache(maxsize=None)
+def _hw_works(name: str) -> bool:
+    """Hardware encoders are listed by static builds even without a GPU: try one tiny encode."""
+    if name == 'vaapi' and not os.path.exists(VAAPI_DEVICE):
+        return False
+    in_args, args, vf_tail = ENCODERS[name]['args'](ENCODERS[name], {'preset': 'medium', 'crf': 23})
+    cmd = ['ffmpeg', '-v', 'error', *in_args, '-f', 'lavfi', '-i', 'color=c=gray:s=256x256:d=0.2',
+           '-vf', 'format=yuv420p' + vf_tail, *args, '-f', 'null', '-']
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=30).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+def available() -> list:
+    """Names of encoders this host's ffmpeg can actually use, CPU ones first."""
+    listed = _ffmpeg_encoders()
+    return [name for name, spec in ENCODERS.items()
+            if spec['codec'] in listed and (not spec['hw'] or _hw_works(name))]
+
+
+def _file() -> Optional[Path]:
+    path = os.environ.get('ENCODER_FILE', os.path.join('outputs', 'cache', 'encoder.json'))
+    return Path(path) if path else None
+
+
+def load_choice() -> dict:
+    """Saved benchmark result ({} when there is none)."""
+    path = _file()
+    try:
+        if path and path.exists():
+            return json.loads(path.read_text(encoding='utf-8'))
+    except Exception:
+        pass
+    return {}
+
+
+def save_choice(data: dict):
+    path = _file()
+    if not path:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def reset_choice():
+    path = _file()
+    if path and path.exists():
+        path.unlink()
+
+
+def host_default(profile: str) -> dict:
+    """{'encoder', 'preset'?} for `profile`: VIDEO_ENCODER, else the benchmark choice, else libx264."""
+    forced = os.environ.get('VIDEO_ENCODER')
+    if forced:
+        return {'encoder': forced}
+    choice = load_choice().get('profiles', {}).get(profile)
+    if choice and choice.get('encoder') in ENCODERS:
+        return {k: v for k, v in choice.items() if k in ('encoder', 'preset')}
+    return {'encoder': DEFAULT}
+
+
+def ffmpeg_args(opts: dict) -> tuple:
+    """(args before the inputs, video codec args, suffix for -vf) for resolved profile options."""
+    name = opts.get('encoder') or DEFAULT
+    if name not in ENCODERS:
+        raise ValueError(f'Unknown video encoder: {name} (available: {", ".join(ENCODERS)})')
+    spec = ENCODERS[name]
+    in_args, args, vf_tail = spec['args'](spec, opts)
+    if opts.get('gop'):
+        args += ['-g', str(opts['gop'])]
+    args += ['-r', str(opts['fps'])]
+    return in_args, args, vf_tail
+
+
+def measure_quality(distorted: str, reference: str, metric: str = 'ssim') -> float:
+    """SSIM (0..1) or VMAF (0..100) of `distorted` against `reference`, computed by ffmpeg."""
+    lavfi = '[0:v][1:v]ssim' if metric == 'ssim' else '[0:v][1:v]libvmaf'
+    p = subprocess.run(['ffmpeg', '-hide_banner', '-nostats', '-i', distorted, '-i', reference,
+                        '-lavfi', lavfi, '-f', 'null', '-'], capture_output=True, text=True)
+    pattern = r'SSIM .*All:([\d.]+)' if metric == 'ssim' else r'VMAF score[:=]\s*([\d.]+)'
+    m = re.search(pattern, p.stderr)
+    if p.returncode != 0 or not m:
+        raise RuntimeError(f'{metric} failed: {p.stderr.strip()[-300:]}')
+    return float(m.group(1))
+
+
+def _reference_assets(workdir: Path, seconds: float, size=(720, 1280)) -> tuple:
+    from . import visual
+    image = workdir / 'reference.png'
+    img = visual.render_background(size, style='plasma', seed=7)
+    draw = visual.ImageDraw.Draw(img)
+    font = visual.load_font('DejaVuSans-Bold.ttf', 42)
+    y = 120
+    for line, _, h in visual.layout_text('Kot znalazł pilota do wszechświata i wcisnął pauzę.', font, size[0] - 80):
+        draw.text((40, y), line, font=font, fill=(255, 255, 255))
+        y += h + 8
+    img.save(image)
+    audio = workdir / 'reference.wav'
+    with wave.open(str(audio), 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(22050)
+        w.writeframes(b'\x00\x00' * int(22050 * seconds))
+    return image, audio
+
+
+def benchmark(profile: str = 'default', metric: str = 'ssim', threshold: Optional[float] = None,
+              seconds: float = 5.0, encoders: Optional[list] = None, size=(1080, 1920), save: bool = True,
+              log: Callable[[str], None] = print) -> dict:
+    """Encode a reference short with every available encoder/preset and pick the fastest good one.
+
+    Quality is measured against a lossless x264 render of the same input. The
+    choice (encoder + preset, per profile) is written to `ENCODER_FILE` when
+    `save`. Returns {'choice', 'results', ...}.
+    """
+    from . import editor
+    threshold = threshold if threshold is not None else (0.98 if metric == 'ssim' else 93.0)
+    names = [n for n in (encoders or available()) if n in ENCODERS]
+    results = []
+    with tempfile.TemporaryDirectory() as d:
+        workdir = Path(d)
+        image, audio = _reference_assets(workdir, seconds)
+        reference = workdir / 'reference.mkv'
+        editor.create_short_single_pass(str(image), str(audio), str(reference), width=size[0], height=size[1],
+                                        profile=profile, encoder='x264', preset='ultrafast', crf=0,
+                                        duration=seconds)
+        base_crf = editor.resolve_profile(profile, encoder='x264')['crf']
+        for name in names:
+            for preset in ENCODERS[name]['presets']:
+                out = workdir / f'{name}_{preset}.mp4'
+                row = {'encoder': name, 'preset': preset, 'crf': base_crf}
+                t0 = time.perf_counter()
+                try:
+                    editor.create_short_single_pass(str(image), str(audio), str(out), width=size[0],
+                                                    height=size[1], profile=profile, encoder=name,
+                                                    preset=preset, crf=base_crf, duration=seconds)
+                    row['seconds'] = round(time.perf_counter() - t0, 2)
+                    row['bytes'] = out.stat().st_size
+                    row['score'] = round(measure_quality(str(out), str(reference), metric), 4)
+                    row['ok'] = row['score'] >= threshold
+                except Exception as e:
+                    row.update(ok=False, error=str(e)[-200:])
+                results.append(row)
+                log(f"{name:<7} {preset:<10} {row.get('seconds', '-'):>7} s  {metric} {row.get('score', '-')}"
+                    f"{'' if row['ok'] else '  (rejected)'}")
+    good = sorted((r for r in results if r['ok']), key=lambda r: (r['seconds'], r['bytes']))
+    choice = {'encoder': good[0]['encoder'], 'preset': good[0]['preset']} if good else None
+    report = {'profile': profile, 'metric': metric, 'threshold': threshold, 'seconds': seconds,
+              'choice': choice, 'results': results}
+    if save and choice:
+        data = load_choice()
+        data.setdefault('profiles', {})[profile] = dict(choice, metric=metric, threshold=threshold,
+                                                        score=good[0]['score'], encodeSeconds=good[0]['seconds'])
+        data.update(host=socket.gethostname(), updatedAt=time.time(),
+                    ffmpeg=shutil.which('ffmpeg'))
+        save_choice(data)
+    return report
@@ -0,0 +1,185 @@
+"""Wspólny rejestr stanu usług (A1111, Ollama, serwery TTS, ffmpeg).
+
+Zamiast sprawdzać usługę przed każdym żądaniem, wołający pytają
+`health.is_up(usługa, adres)`. Wynik sprawdzenia jest ważny `HEALTH_TTL`
+sekund (domyślnie 15); po tym czasie zwracany jest ostatni znany stan, a nowe
+sprawdzenie rusza w tle (blokuje tylko pierwsze pytanie o dany adres).
+
+Wyłącznik (circuit breaker): po `HEALTH_FAILURES` (domyślnie 2) kolejnych
+porażkach — z health-checku albo zgłoszonych przez `report()` po nieudanym
+prawdziwym żądaniu — obwód się otwiera i przez `HEALTH_OPEN_SECONDS`
+(domyślnie 30) usługa jest uznawana za niedostępną bez żadnych zapytań.
+Potem jedno sprawdzenie (half-open) decyduje, czy obwód się zamyka.
+
+Użycie:
+    from yt_brainrot import health
+    if health.is_up('a1111', host): ...
+    health.report('a1111', host, ok=False, error='connection refused')
+"""
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from . import http_client
+
+TTL = float(os.environ.get('HEALTH_TTL', '15'))
+FAILURES = int(os.environ.get('HEALTH_FAILURES', '2'))
+OPEN_SECONDS = float(os.environ.get('HEALTH_OPEN_SECONDS', '30'))
+
+
+def _http_check(path: str, require_200: bool):
+    def check(target: str):
+        r = http_client.get(target.rstrip('/') + path, backend='health', retries=0)
+        if r.status_code >= 500 or (require_200 and r.status_code != 200):
+            raise RuntimeError(f'HTTP {r.status_code}')
+    return check
+
+
+def _binary_check(name: str):
+    def check(target: Optional[str]):
+        if shutil.which(target or name) is None:
+            raise RuntimeError(f'{target or name} not found on PATH')
+    return check
+
+
+def _ollama_check(target: Optional[str]):
+    # HTTP server when a URL is given, otherwise the ollama CLI
+    if target and target.startswith('http'):
+        return _http_check('/api/version', require_200=False)(target)
+    return _binary_check('ollama')(None)
+
+
+# service -> (check(target) raising on failure, ttl)
+CHECKS: Dict[str, Tuple[Callable[[Optional[str]], None], float]] = {
+    'a1111': (_http_check('/sdapi/v1/version', require_200=True), TTL),
+    'ollama': (_ollama_check, TTL),
+    'tts': (_http_check('', require_200=False), TTL),
+    'ffmpeg': (_binary_check('ffmpeg'), 300.0),
+}
+
+_entries: Dict[Tuple[str, Optional[str]], dict] = {}
+_first: Dict[Tuple[str, Optional[str]], threading.Event] = {}  # first probe in flight
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def register(service: str, check: Callable[[Optional[str]], None], ttl: float = TTL):
+    CHECKS[service] = (check, ttl)
+
+
+def _key(service: str, target: Optional[str]):
+    return (service, target.rstrip('/') if target else None)
+
+
+def _entry(key) -> dict:
+    global _pid
+    if _pid != os.getpid():
+        _entries.clear()
+        _first.clear()
+        _pid = os.getpid()
+    e = _entries.get(key)
+    if e is None:
+        e = _entries[key] = {'service': key[0], 'target': key[1], 'state': 'unknown', 'circuit': 'closed',
+                             'failures': 0, 'checkedAt': None, 'latencyMs': None, 'error': None,
+                             'openUntil': 0.0, 'refreshing': False}
+    return e
+
+
+def _apply(e: dict, ok: bool, error: Optional[str] = None):
+    """Record one outcome; caller holds `_lock`."""
+    e['checkedAt'] = time.time()
+    if ok:
+        e.update(state='up', circuit='closed', failures=0, error=None, openUntil=0.0)
+        return
+    e['failures'] += 1
+    e.update(state='down', error=error)
+    if e['failures'] >= FAILURES or e['circuit'] == 'half-open':
+        e.update(circuit='open', openUntil=time.monotonic() + OPEN_SECONDS)
+
+
+def _probe(key):
+    service, target = key
+    check = CHECKS[service][0]
+    t0 = time.perf_counter()
+    try:
+        check(target)
+        ok, error = True, None
+    except Exception as ex:
+        ok, error = False, str(ex) or type(ex).__name__
+    with _lock:
+        e = _entry(key)
+        e['latencyMs'] = round(1000 * (time.perf_counter() - t0), 1)
+        e['refreshing'] = False
+        _apply(e, ok, error)
+        done = _first.pop(key, None)
+    if done:
+        done.set()
+
+
+def _public(e: dict) -> dict:
+    return {k: v for k, v in e.items() if k not in ('openUntil', 'refreshing')}
+
+
+def status(service: str, target: Optional[str] = None) -> dict:
+    """Current entry for (service, target), probing or refreshing it as needed."""
+    if service not in CHECKS:
+        raise ValueError(f'Unknown service: {service}')
+    key = _key(service, target)
+    ttl = CHECKS[service][1]
+    with _lock:
+        e = _entry(key)
+        now = time.monotonic()
+        if e['circuit'] == 'open':
+            if now < e['openUntil']:
+                return _public(e)
+            e['circuit'] = 'half-open'
+        fresh = e['checkedAt'] is not None and time.time() - e['checkedAt'] < ttl
+        if fresh and e['circuit'] == 'closed':
+            return _public(e)
+        if e['refreshing']:
+            waiter = _first.get(key)
+            if waiter is None:
+                return _public(e)
+        else:
+            waiter = None
+            e['refreshing'] = True
+            first = e['state'] == 'unknown'
+            if first:
+                _first[key] = threading.Event()
+    if waiter is not None:
+        # another thread runs the first check; share its answer
+        waiter.wait(http_client.timeout_for('health') + 1)
+    elif first:
+        _probe(key)
+    else:
+        # stale-while-revalidate: answer with the last state, refresh in the background
+        threading.Thread(target=_probe, args=(key,), name=f'health-{service}', daemon=True).start()
+    with _lock:
+        return _public(_entry(key))
+
+
+def is_up(service: str, target: Optional[str] = None) -> bool:
+    return status(service, target)['state'] == 'up'
+
+
+def report(service: str, target: Optional[str] = None, ok: bool = True, error: Optional[str] = None):
+    """Feed the outcome of a real request into the registry (counts towards the breaker)."""
+    with _lock:
+        e = _entry(_key(service, target))
+        if ok and e['state'] == 'up' and e['circuit'] == 'closed':
+            e['checkedAt'] = time.time()
+            return
+        _apply(e, ok, error)
+
+
+def snapshot() -> list:
+    with _lock:
+        return [_public(e) for e in _entries.values()]
+
+
+def reset():
+    with _lock:
+        _entries.clear()
+        _first.clear()
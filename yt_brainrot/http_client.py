@@ -0,0 +1,158 @@
+"""Wspólny klient HTTP dla wszystkich backendów (Ollama, TTS, A1111, Postiz).
+
+Każdy host (scheme://host:port) ma własną `requests.Session` z pulą połączeń
+keep-alive, więc kolejne health-checki i wywołania TTS nie otwierają nowego
+połączenia TCP. Timeouty zależą od backendu, ponowienia są ograniczone i z
+wykładniczym odstępem, a każdy host ma liczniki opóźnień (`stats()`).
+
+Ponowienia: dla każdej metody tylko gdy żądanie na pewno nie wyszło (timeout
+nawiązania połączenia, odmowa połączenia); pozostałe błędy połączenia (reset,
+zerwany keep-alive), timeout odczytu i odpowiedzi 502/503/504 tylko dla
+GET/HEAD/OPTIONS, więc POST (txt2img, generate, TTS) nie wykona się dwa razy.
+Health-checki wołają z `retries=0`, żeby szybko zgłaszać niedostępność.
+
+Konfiguracja: `HTTP_TIMEOUT_<BACKEND>` (np. `HTTP_TIMEOUT_OLLAMA=15`),
+`HTTP_RETRIES` (domyślnie 2), `HTTP_BACKOFF` (domyślnie 0.3 s),
+`HTTP_POOL_SIZE` (domyślnie 8 połączeń na host).
+
+Użycie:
+    from yt_brainrot import http_client
+    r = http_client.post(url, backend='tts', json={'text': '...'})
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+_DEFAULT_TIMEOUTS = {
+    'health': 2,
+    'ollama': 8,
+    'tts': 20,
+    'a1111': 120,
+    'postiz': 300,
+    'default': 30,
+}
+
+RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+BACKOFF = float(os.environ.get('HTTP_BACKOFF', '0.3'))
+POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '8'))
+
+_RETRY_STATUS = (502, 503, 504)
+_IDEMPOTENT = ('GET', 'HEAD', 'OPTIONS')
+
+
+def timeout_for(backend: str) -> float:
+    env = os.environ.get(f'HTTP_TIMEOUT_{backend.upper()}')
+    if env:
+        return float(env)
+    return _DEFAULT_TIMEOUTS.get(backend, _DEFAULT_TIMEOUTS['default'])
+
+
+_sessions: Dict[str, requests.Session] = {}
+_stats: Dict[str, dict] = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def session_for(url: str) -> requests.Session:
+    """Pooled keep-alive session for the host of `url` (recreated after fork)."""
+    global _pid
+    host = _host(url)
+    with _lock:
+        if _pid != os.getpid():
+            # sockets inherited from the parent must not be shared
+            _sessions.clear()
+            _stats.clear()
+            _pid = os.getpid()
+        s = _sessions.get(host)
+        if s is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            s.mount('http://', adapter)
+            s.mount('https://', adapter)
+            _sessions[host] = s
+        return s
+
+
+def _record(host: str, seconds: float, ok: bool, retried: bool):
+    with _lock:
+        st = _stats.setdefault(host, {'requests': 0, 'errors': 0, 'retries': 0,
+                                      'seconds': 0.0, 'maxSeconds': 0.0})
+        st['requests'] += 1
+        st['errors'] += 0 if ok else 1
+        st['retries'] += 1 if retried else 0
+        st['seconds'] += seconds
+        st['maxSeconds'] = max(st['maxSeconds'], seconds)
+
+
+def _not_sent(error: requests.exceptions.ConnectionError) -> bool:
+    """True when the connection was never established, so the server cannot have seen the request."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def request(method: str, url: str, backend: str = 'default', retries: Optional[int] = None,
+            **kwargs) -> requests.Response:
+    """Send through the host's pooled session with the backend's timeout and bounded retries."""
+    method = method.upper()
+    kwargs.setdefault('timeout', timeout_for(backend))
+    attempts = 1 + max(0, RETRIES if retries is None else int(retries))
+    host = _host(url)
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        t0 = time.perf_counter()
+        try:
+            r = session_for(url).request(method, url, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            retry = not last and (method in _IDEMPOTENT or _not_sent(e))
+            _record(host, time.perf_counter() - t0, False, retry)
+            if not retry:
+                raise
+        except requests.exceptions.ReadTimeout:
+            retry = not last and method in _IDEMPOTENT
+            _record(host, time.perf_counter() - t0, False, retry)
+            if not retry:
+                raise
+        else:
+            retry = not last and method in _IDEMPOTENT and r.status_code in _RETRY_STATUS
+            _record(host, time.perf_counter() - t0, r.status_code < 500, retry)
+            if not retry:
+                return r
+            r.close()
+        time.sleep(BACKOFF * (2 ** attempt))
+
+
+def get(url: str, backend: str = 'default', **kwargs) -> requests.Response:
+    return request('GET', url, backend=backend, **kwargs)
+
+
+def post(url: str, backend: str = 'default', **kwargs) -> requests.Response:
+    return request('POST', url, backend=backend, **kwargs)
+
+
+def stats() -> dict:
+    """Per-host counters: requests, errors, retries, total and max seconds, mean ms."""
+    with _lock:
+        out = {}
+        for host, st in _stats.items():
+            out[host] = dict(st, meanMs=round(1000 * st['seconds'] / st['requests'], 1) if st['requests'] else 0.0)
+        return out
+
+
+def close():
+    with _lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
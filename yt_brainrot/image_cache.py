@@ -0,0 +1,45 @@
+"""Dyskowy cache obrazów z A1111 kluczowany pełnym payloadem txt2img.
+
+Te same (host, prompt, seed, rozmiar, steps, sampler, cfg, ...) dają ten sam
+klucz, więc powtórzone żądanie ze stałym seedem nie zajmuje GPU. Żądanie z
+`seed=-1` nigdy nie jest obsługiwane z cache (każde ma dać nowy obraz);
+wynik zapisywany jest tylko pod kluczem z faktycznie użytym seedem.
+
+Konfiguracja: `SD_CACHE_DIR` (domyślnie outputs/cache/sd),
+`SD_CACHE_MAX_BYTES` (domyślnie 1 GiB), `SD_CACHE_DISABLE=1` wyłącza cache.
+"""
+import os
+from typing import Optional
+
+from .disk_cache import DiskCache, hash_key
+
+_cache = DiskCache(
+    os.environ.get('SD_CACHE_DIR', os.path.join('outputs', 'cache', 'sd')),
+    int(os.environ.get('SD_CACHE_MAX_BYTES', str(1024 * 1024 * 1024))),
+    '.img',
+)
+
+
+def enabled() -> bool:
+    return os.environ.get('SD_CACHE_DISABLE', '').lower() not in ('1', 'true', 'yes')
+
+
+def make_key(host: str, payload: dict) -> str:
+    return hash_key({'host': (host or '').rstrip('/'), 'payload': payload})
+
+
+def get(key: str, out_path: Optional[str] = None) -> Optional[dict]:
+    """Return cached metadata or None; with `out_path` the data is copied there ('path')."""
+    return _cache.get(key, out_path)
+
+
+def put(key: str, src_path: str, meta: dict) -> dict:
+    return _cache.put(key, src_path, meta)
+
+
+def stats() -> dict:
+    return _cache.stats()
+
+
+def clear():
+    _cache.clear()
@@ -0,0 +1,205 @@
+"""Kolejka zadań w tle ze stanem w SQLite.
+
+Zadanie wykonuje się w puli wątków procesu, który je przyjął, a jego stan
+(status, kroki, wynik) trafia do SQLite, więc odpytywanie działa z każdego
+workera gunicorna. Kolejka jest ograniczona: gdy czeka już `max_queued`
+zadań, `submit` rzuca `QueueFull`.
+
+Każdy wiersz zapisuje właściciela (host, pid, token procesu). Zadanie
+`queued`/`running`, którego proces już nie żyje (restart workera), jest przy
+starcie kolejki i przy odczycie oznaczane jako `failed` z błędem
+„interrupted by restart”, więc klienci nie czekają na martwe zadanie.
+
+Konfiguracja: `JOBS_DB` (domyślnie outputs/jobs.sqlite3), `JOBS_WORKERS`
+(domyślnie 1), `JOBS_MAX_QUEUED` (domyślnie 8).
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    payload TEXT,
+    result TEXT,
+    error TEXT,
+    owner TEXT
+)
+'''
+
+INTERRUPTED = 'interrupted by restart'
+_HOST = socket.gethostname()
+_TOKEN = uuid.uuid4().hex[:8]
+
+
+def _owner() -> str:
+    return f'{_HOST}:{os.getpid()}:{_TOKEN}'
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def _orphaned(owner: Optional[str]) -> bool:
+    """Whether the process that accepted a job is gone (unknown owners count as gone)."""
+    try:
+        host, pid, token = owner.split(':')
+        pid = int(pid)
+    except (AttributeError, ValueError):
+        return True
+    if host != _HOST:
+        return False  # cannot check another machine
+    if pid == os.getpid():
+        return token != _TOKEN  # this pid belonged to a previous process
+    return not _pid_alive(pid)
+
+
+class JobQueue:
+    def __init__(self, db_path, workers: int = 1, max_queued: int = 8):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_queued = int(max_queued)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._pending = 0
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute(_SCHEMA)
+            if 'owner' not in {r[1] for r in db.execute('PRAGMA table_info(jobs)')}:
+                db.execute('ALTER TABLE jobs ADD COLUMN owner TEXT')
+        self.recover()
+
+    def recover(self) -> int:
+        """Fail queued/running jobs whose worker process died; returns how many."""
+        with self._connect() as db:
+            rows = db.execute("SELECT id, owner FROM jobs WHERE status IN ('queued', 'running')").fetchall()
+            dead = [job_id for job_id, owner in rows if _orphaned(owner)]
+            db.executemany("UPDATE jobs SET status = 'failed', error = ?, finished = ? "
+                           "WHERE id = ? AND status IN ('queued', 'running')",
+                           [(INTERRUPTED, time.time(), job_id) for job_id in dead])
+        return len(dead)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def submit(self, kind: str, fn: Callable[[str, Callable[[dict], None]], dict], payload: Optional[dict] = None) -> dict:
+        """Queue `fn(job_id, update)`; `update(result)` stores partial results.
+
+        The value returned by `fn` becomes the final result.
+        """
+        with self._lock:
+            if self._pending >= self.max_queued:
+                raise QueueFull(f'{self._pending} jobs already queued')
+            self._pending += 1
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as db:
+            db.execute('INSERT INTO jobs (id, kind, status, created, payload, owner) VALUES (?, ?, ?, ?, ?, ?)',
+                       (job_id, kind, 'queued', time.time(), json.dumps(payload or {}), _owner()))
+        try:
+            self._pool.submit(self._run, job_id, fn)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            self._set(job_id, status='failed', error='executor unavailable', finished=time.time())
+            raise
+        return self.get(job_id)
+
+    def _run(self, job_id: str, fn):
+        self._set(job_id, status='running', started=time.time())
+        try:
+            result = fn(job_id, lambda partial: self._set(job_id, result=json.dumps(partial)))
+            self._set(job_id, status='completed', result=json.dumps(result), finished=time.time())
+        except Exception as e:
+            self._set(job_id, status='failed', error=str(e), finished=time.time())
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _set(self, job_id: str, **fields):
+        cols = ', '.join(f'{k} = ?' for k in fields)
+        with self._connect() as db:
+            db.execute(f'UPDATE jobs SET {cols} WHERE id = ?', (*fields.values(), job_id))
+
+    @staticmethod
+    def _row(row) -> dict:
+        job_id, kind, status, created, started, finished, payload, result, error = row
+        return {
+            'jobId': job_id,
+            'kind': kind,
+            'status': status,
+            'createdAt': created,
+            'startedAt': started,
+            'finishedAt': finished,
+            'payload': json.loads(payload) if payload else None,
+            'result': json.loads(result) if result else None,
+            'error': error,
+        }
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Job state; a queued/running job whose worker died is reported (and stored) as failed."""
+        with self._connect() as db:
+            row = db.execute('SELECT id, kind, status, created, started, finished, payload, result, error, owner '
+                             'FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        if row[2] in ('queued', 'running') and _orphaned(row[-1]):
+            self.recover()
+            return self.get(job_id)
+        return self._row(row[:-1])
+
+    def list(self, limit: int = 20) -> list:
+        with self._connect() as db:
+            rows = db.execute('SELECT id, kind, status, created, started, finished, payload, NULL, error '
+                              'FROM jobs ORDER BY created DESC LIMIT ?', (int(limit),)).fetchall()
+        return [self._row(r) for r in rows]
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Process-wide queue configured from the environment."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(
+                os.environ.get('JOBS_DB', os.path.join('outputs', 'jobs.sqlite3')),
+                workers=int(os.environ.get('JOBS_WORKERS', '1')),
+                max_queued=int(os.environ.get('JOBS_MAX_QUEUED', '8')),
+            )
+        return _queue
@@ -1,51 +1,35 @@
 """LLM backend (Ollama) with a simple fallback.
 
 Requires: `ollama` CLI + model `bielik-4b-v3.0` for best results.
+
+`stream_story` yields text as Ollama produces it (HTTP `/api/generate` with
+`stream: true` or the `ollama run` stdout), `stream_sentences` groups that
+stream into finished sentences so TTS can start before the story is complete.
 """
+import codecs
+import json
+import os
 import subprocess
 import shlex
+from typing import Iterator
+
+from .sentences import split_sentences
+
+DEFAULT_PROMPT = 'Napisz brainrotową, absurdalną historyjkę na YouTube Shorts (max 80 słów), z twistem na końcu. Po polsku.'
+FALLBACK_STORY = (
+    "Kot znalazł pilota do wszechświata. Każde naciśnięcie zmieniało jedną regułę rzeczywistości. "
+    "Na końcu pilot sam wcisnął przycisk — i obudziłeś się czytając tę historyjkę?"
+)
 
 
 def generate_story(prompt: str = None, model: str = "bielik-4b-v3.0", ollama_url: str | None = None) -> str:
     if prompt is None:
-        prompt = 'Napisz brainrotową, absurdalną historyjkę na YouTube Shorts (max 80 słów), z twistem na końcu. Po polsku.'
+        prompt = DEFAULT_PROMPT
     # If ollama_url provided, try HTTP endpoint (best-effort)
     if ollama_url and ollama_url.startswith('http'):
-        import requests
-        endpoints = [
-            ollama_url.rstrip('/') + '/api/generate',
-            ollama_url.rstrip('/') + '/api/predict',
-            ollama_url.rstrip('/') + '/generate',
-            ollama_url.rstrip('/') + '/predict',
-        ]
-        payloads = [
-            {'model': model, 'prompt': prompt},
-            {'prompt': prompt, 'model': model},
-            {'input': prompt, 'model': model},
-        ]
-        for ep in endpoints:
-            for payload in payloads:
-                try:
-                    r = requests.post(ep, json=payload, timeout=8)
-                    if r.status_code != 200:
-                        continue
-                    try:
-                        j = r.json()
-                        # Try common fields
-                        for key in ['text', 'output', 'result', 'generation', 'content']:
-                            if key in j and isinstance(j[key], str):
-                                return j[key].strip()
-                        # OpenAI-like choices
-                        if 'choices' in j and isinstance(j['choices'], list) and len(j['choices']) > 0:
-                            c = j['choices'][0]
-                            if isinstance(c, dict) and ('text' in c or 'message' in c):
-                                return (c.get('text') or c.get('message') or '').strip()
-                    except Exception:
-                        # if response is plain text
-                        if r.text and len(r.text.strip()) > 0:
-                            return r.text.strip()
-                except Exception:
-                    continue
+        story = _generate_http(ollama_url, prompt, model)
+        if story:
+            return story
 
     # Try Ollama CLI
     try:
@@ -58,11 +42,160 @@ def generate_story(prompt: str = None, model: str = "bielik-4b-v3.0", ollama_url
         pass
 
     # Fallback sample (very simple)
-    sample = (
-        "Kot znalazł pilota do wszechświata. Każde naciśnięcie zmieniało jedną regułę rzeczywistości. "
-        "Na końcu pilot sam wcisnął przycisk — i obudziłeś się czytając tę historyjkę?"
-    )
-    return sample
+    return FALLBACK_STORY
+
+
+_HTTP_PATHS = ['/api/generate', '/api/predict', '/generate', '/predict']
+_HTTP_PAYLOADS = ['prompt', 'input']
+
+
+def _parse_story(r, hint: str | None = None):
+    """Return (text, response_shape) from a generation response, or None."""
+    try:
+        j = r.json()
+    except Exception:
+        # Ollama streams NDJSON unless asked not to: join the 'response' pieces
+        text = (r.text or '').strip()
+        joined = _join_ndjson(text)
+        if joined:
+            return joined, 'ndjson'
+        # if response is plain text
+        return (text, 'text') if text else None
+    if not isinstance(j, dict):
+        return None
+    # Try common fields (the remembered one first)
+    keys = ['text', 'output', 'result', 'generation', 'content']
+    if hint and hint.startswith('json:'):
+        keys.insert(0, hint[5:])
+    for key in keys:
+        if isinstance(j.get(key), str):
+            return j[key].strip(), f'json:{key}'
+    # OpenAI-like choices
+    if 'choices' in j and isinstance(j['choices'], list) and len(j['choices']) > 0:
+        c = j['choices'][0]
+        if isinstance(c, dict) and ('text' in c or 'message' in c):
+            return (c.get('text') or c.get('message') or '').strip(), 'choices'
+    return None
+
+
+def _generate_http(ollama_url: str, prompt: str, model: str) -> str | None:
+    """POST to the endpoint/payload shape remembered by `discovery` (probing once per URL)."""
+    from . import discovery, http_client
+    base = ollama_url.rstrip('/')
+
+    def attempt(cand, probing):
+        if cand['payload'] == 'input':
+            payload = {'input': prompt, 'model': model}
+        else:
+            payload = {'model': model, 'prompt': prompt}
+        r = http_client.post(base + cand['path'], backend='ollama', json=payload,
+                             retries=0 if probing else None)
+        if r.status_code != 200:
+            return None
+        return _parse_story(r, cand.get('response'))
+
+    candidates = [{'path': p, 'payload': s} for p in _HTTP_PATHS for s in _HTTP_PAYLOADS]
+    return discovery.discover('ollama', base, candidates, attempt)
+
+
+def _join_ndjson(text: str) -> str | None:
+    parts = []
+    for line in text.splitlines():
+        try:
+            j = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(j, dict) or not isinstance(j.get('response'), str):
+            return None
+        parts.append(j['response'])
+    return ''.join(parts).strip() or None
+
+
+def _stream_http(ollama_url: str, prompt: str, model: str) -> Iterator[str]:
+    from . import http_client
+    r = http_client.post(ollama_url.rstrip('/') + '/api/generate', backend='ollama', stream=True,
+                         json={'model': model, 'prompt': prompt, 'stream': True})
+    with r:
+        if r.status_code != 200:
+            raise RuntimeError(f'HTTP {r.status_code}')
+        for line in r.iter_lines():
+            if not line:
+                continue
+            j = json.loads(line)
+            if j.get('error'):
+                raise RuntimeError(j['error'])
+            if j.get('response'):
+                yield j['response']
+            if j.get('done'):
+                return
+
+
+def _stream_cli(prompt: str, model: str) -> Iterator[str]:
+    p = subprocess.Popen(["ollama", "run", model, prompt], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    try:
+        while True:
+            chunk = os.read(p.stdout.fileno(), 4096)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+    finally:
+        p.stdout.close()
+        if p.poll() is None:
+            p.kill()
+        p.wait()
+
+
+def stream_story(prompt: str = None, model: str = "bielik-4b-v3.0", ollama_url: str | None = None) -> Iterator[str]:
+    """Yield the story in pieces as they are generated (same sources as `generate_story`).
+
+    Servers without Ollama streaming, and the built-in sample, yield the whole
+    text at once.
+    """
+    if prompt is None:
+        prompt = DEFAULT_PROMPT
+    if ollama_url and ollama_url.startswith('http'):
+        from . import discovery, health
+        base = ollama_url.rstrip('/')
+        known = discovery.known('ollama', base)
+        if health.is_up('ollama', base) and (known is None or known.get('path') == '/api/generate'):
+            produced = False
+            try:
+                for piece in _stream_http(base, prompt, model):
+                    produced = True
+                    yield piece
+                if produced:
+                    return
+            except Exception:
+                if produced:
+                    raise
+        story = _generate_http(ollama_url, prompt, model)
+        if story:
+            yield story
+            return
+
+    produced = False
+    try:
+        for piece in _stream_cli(prompt, model):
+            if piece.strip() or produced:
+                produced = True
+                yield piece
+        if produced:
+            return
+    except FileNotFoundError:
+        pass
+    yield FALLBACK_STORY
+
+
+def stream_sentences(prompt: str = None, model: str = "bielik-4b-v3.0", ollama_url: str | None = None,
+                     min_chars: int = 20) -> Iterator[str]:
+    """`stream_story` grouped into sentences (see `split_sentences`)."""
+    return split_sentences(stream_story(prompt, model=model, ollama_url=ollama_url), min_chars=min_chars)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,156 @@
+"""Długo żyjący proces Piper na głos zamiast `piper --text ...` przy każdym zdaniu.
+
+Piper czyta wtedy zlecenia JSON-lines ze stdin (`--json-input`,
+`{"text": ..., "output_file": ...}`) i po każdej syntezie wypisuje ścieżkę
+pliku na stdout, więc model ONNX ładuje się raz na (głos, tempo). Proces,
+który padł albo przekroczył czas, jest zabijany i startuje od nowa przy
+następnym zleceniu (jedno ponowienie na zlecenie).
+
+Konfiguracja: `PIPER_BIN` (domyślnie `piper`), `PIPER_SERVER=0` wyłącza tryb
+procesu, `PIPER_TIMEOUT` (domyślnie 60 s na zdanie).
+"""
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+TIMEOUT = float(os.environ.get('PIPER_TIMEOUT', '60'))
+
+
+def binary() -> str:
+    return os.environ.get('PIPER_BIN', 'piper')
+
+
+def enabled() -> bool:
+    return os.environ.get('PIPER_SERVER', '1').lower() not in ('0', 'false', 'no') and shutil.which(binary()) is not None
+
+
+class PiperProcess:
+    def __init__(self, voice: Optional[str] = None, speed: Optional[float] = None):
+        self.voice = voice
+        self.speed = speed
+        self.proc: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.calls = 0
+        self._lines: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _cmd(self) -> list:
+        cmd = [binary(), '--json-input']
+        if self.voice:
+            cmd += ['--voice', self.voice]
+        if self.speed is not None:
+            cmd += ['--speed', str(self.speed)]
+        return cmd
+
+    def _start(self):
+        self.proc = subprocess.Popen(self._cmd(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read, args=(self.proc, self._lines), daemon=True,
+                         name=f'piper-{self.voice or "default"}').start()
+
+    @staticmethod
+    def _read(proc, lines: queue.Queue):
+        for line in proc.stdout:
+            lines.put(line.strip())
+        lines.put(None)  # EOF: the process exited
+
+    def _kill(self):
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.kill()
+            try:
+                self.proc.wait(timeout=5)
+            except Exception:
+                pass
+            self.proc = None
+
+    def _once(self, text: str, out_path: str, timeout: float):
+        if self.proc is None or self.proc.poll() is not None:
+            if self.proc is not None:
+                self.restarts += 1
+            self._start()
+        self.proc.stdin.write(json.dumps({'text': text, 'output_file': out_path}, ensure_ascii=False) + '\n')
+        self.proc.stdin.flush()
+        while True:
+            line = self._lines.get(timeout=timeout)
+            if line is None:
+                raise RuntimeError('piper exited')
+            # progress/log lines may precede the path of the finished file
+            if line and Path(line).resolve() == Path(out_path).resolve():
+                return
+
+    def synthesize(self, text: str, out_path: str, timeout: float = TIMEOUT) -> str:
+        out_path = str(Path(out_path).resolve())
+        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.calls += 1
+            for attempt in range(2):
+                try:
+                    self._once(' '.join(text.split()), out_path, timeout)
+                    if Path(out_path).exists():
+                        return out_path
+                    raise RuntimeError('piper did not write the output file')
+                except Exception:
+                    self._kill()
+                    if attempt:
+                        raise
+
+    def status(self) -> dict:
+        return {'voice': self.voice, 'speed': self.speed, 'pid': self.proc.pid if self.proc else None,
+                'alive': self.proc is not None and self.proc.poll() is None,
+                'calls': self.calls, 'restarts': self.restarts}
+
+    def close(self):
+        with self._lock:
+            if self.proc is not None and self.proc.poll() is None:
+                try:
+                    self.proc.stdin.close()
+                    self.proc.wait(timeout=5)
+                except Exception:
+                    pass
+            self._kill()
+
+
+_procs: Dict[Tuple[Optional[str], Optional[float]], PiperProcess] = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def get_process(voice: Optional[str] = None, speed: Optional[float] = None) -> PiperProcess:
+    """Shared Piper process for (voice, speed); recreated after fork."""
+    global _pid
+    key = (voice or None, float(speed) if speed is not None else None)
+    with _lock:
+        if _pid != os.getpid():
+            # the parent's pipes belong to the parent
+            _procs.clear()
+            _pid = os.getpid()
+        p = _procs.get(key)
+        if p is None:
+            p = _procs[key] = PiperProcess(*key)
+        return p
+
+
+def synthesize(text: str, out_path: str, voice: Optional[str] = None, speed: Optional[float] = None) -> str:
+    return get_process(voice, speed).synthesize(text, out_path)
+
+
+def status() -> list:
+    with _lock:
+        return [p.status() for p in _procs.values()]
+
+
+@atexit.register
+def shutdown():
+    with _lock:
+        procs = list(_procs.values()) if _pid == os.getpid() else []
+        _procs.clear()
+    for p in procs:
+        p.close()
@@ -0,0 +1,351 @@
+"""Trwała kolejka publikacji (SQLite) opróżniana przez ograniczoną pulę wątków.
+
+Generowanie shorta kończy się na `enqueue()`, a wysyłka do Postiz idzie w
+tle własnym tempem. Każdy wpis ma klucz idempotencji (domyślnie SHA-256
+treści wideo): ponowne dodanie tego samego filmu nie tworzy drugiego wpisu,
+opublikowany wpis nigdy nie jest wysyłany ponownie, a klucz idzie do Postiz
+w nagłówku `Idempotency-Key`.
+
+Nieudana wysyłka wraca do kolejki z wykładniczym odstępem
+(`PUBLISH_BACKOFF` · 2^(próba-1), maks. `PUBLISH_BACKOFF_MAX`, `Retry-After`
+przy 429) aż do `PUBLISH_MAX_ATTEMPTS` prób; ponawiane są tylko błędy sieci
+i odpowiedzi 5xx/408/429, a pozostałe (4xx, brak konfiguracji Postiz, błędy
+lokalne) są ostateczne. Limit tempa `PUBLISH_MIN_INTERVAL` (s między startami wysyłek)
+jest trzymany w bazie, więc obowiązuje wszystkie procesy. Worker pobiera wpis
+z tokenem i dzierżawą odnawianą w trakcie wysyłki; wpis workera, który padł,
+wraca do kolejki po `PUBLISH_LEASE_SECONDS`, a spóźniony wynik starego
+workera (inny token) jest ignorowany.
+
+Konfiguracja: `PUBLISH_DB` (domyślnie outputs/publish.sqlite3),
+`PUBLISH_WORKERS` (domyślnie 1). CLI: `python scripts/publish_queue.py`.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+POLL_SECONDS = 1.0
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS publish (
+    key TEXT PRIMARY KEY,
+    video TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    tags TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_at REAL NOT NULL,
+    lease_until REAL,
+    claim TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS publish_due ON publish (status, next_at);
+CREATE TABLE IF NOT EXISTS publish_meta (name TEXT PRIMARY KEY, value REAL)
+'''
+
+_COLUMNS = 'key, video, title, description, tags, status, attempts, next_at, created, updated, result, error'
+
+
+def content_key(path: str) -> str:
+    """SHA-256 of the file contents, read in 1 MiB blocks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _retry_delay(error: Exception) -> Optional[float]:
+    """None for a permanent failure, else the server's Retry-After (0 when absent).
+
+    Only network errors and 5xx/408/429 responses are retried; configuration
+    and local errors (missing POSTIZ_API_URL, unreadable video) fail at once.
+    """
+    import requests
+    response = getattr(error, 'response', None)
+    code = getattr(response, 'status_code', None)
+    if code is None:
+        return 0.0 if isinstance(error, (requests.RequestException, ConnectionError, TimeoutError)) else None
+    if code < 500 and code not in (408, 429):
+        return None
+    try:
+        return float(response.headers.get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _default_publish(video, title, description, tags, idempotency_key=None):
+    from . import publisher
+    return publisher.publish_to_postiz(video, title, description, tags, idempotency_key=idempotency_key)
+
+
+class PublishQueue:
+    def __init__(self, db_path, publish_fn: Optional[Callable[..., dict]] = None, workers: int = 1,
+                 max_attempts: int = 5, backoff: float = 30.0, backoff_max: float = 3600.0,
+                 min_interval: float = 0.0, lease_seconds: float = 600.0):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.publish_fn = publish_fn or _default_publish
+        self.workers = max(1, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff = float(backoff)
+        self.backoff_max = float(backoff_max)
+        self.min_interval = float(min_interval)
+        self.lease_seconds = float(lease_seconds)
+        self._threads: list = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(_SCHEMA)
+            if 'claim' not in {r[1] for r in db.execute('PRAGMA table_info(publish)')}:
+                db.execute('ALTER TABLE publish ADD COLUMN claim TEXT')
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _row(row) -> dict:
+        key, video, title, description, tags, status, attempts, next_at, created, updated, result, error = row
+        return {
+            'key': key,
+            'video': video,
+            'title': title,
+            'description': description,
+            'tags': json.loads(tags) if tags else [],
+            'status': status,
+            'attempts': attempts,
+            'nextAt': next_at,
+            'createdAt': created,
+            'updatedAt': updated,
+            'result': json.loads(result) if result else None,
+            'error': error,
+        }
+
+    def enqueue(self, video_path: str, title: str, description: str, tags: list,
+                key: Optional[str] = None) -> dict:
+        """Add a video once per idempotency key; returns the (possibly existing) entry."""
+        key = key or content_key(video_path)
+        now = time.time()
+        with self._connect() as db:
+            db.execute('INSERT OR IGNORE INTO publish (key, video, title, description, tags, status, next_at, '
+                       'created, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                       (key, str(video_path), title, description, json.dumps(list(tags)), 'queued', now, now, now))
+        self._wake.set()
+        return self.get(key)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._connect() as db:
+            row = db.execute(f'SELECT {_COLUMNS} FROM publish WHERE key = ?', (key,)).fetchone()
+        return self._row(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 20) -> list:
+        where, args = ('WHERE status = ?', (status,)) if status else ('', ())
+        with self._connect() as db:
+            rows = db.execute(f'SELECT {_COLUMNS} FROM publish {where} ORDER BY created DESC LIMIT ?',
+                              (*args, int(limit))).fetchall()
+        return [self._row(r) for r in rows]
+
+    def counts(self) -> dict:
+        with self._connect() as db:
+            rows = db.execute('SELECT status, COUNT(*) FROM publish GROUP BY status').fetchall()
+        return dict(rows)
+
+    def retry(self, key: str) -> Optional[dict]:
+        """Put a failed entry back in the queue with a fresh attempt budget."""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("UPDATE publish SET status = 'queued', attempts = 0, next_at = ?, updated = ?, error = NULL "
+                       "WHERE key = ? AND status = 'failed'", (now, now, key))
+        self._wake.set()
+        return self.get(key)
+
+    def _claim(self):
+        """Lease the next due entry; returns (entry, seconds to wait, whether anything is due).
+
+        The entry carries a fresh 'claim' token; only its holder may renew or finish it.
+        """
+        db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            # taken under the write lock, so the rate limit is measured between real starts
+            now = time.time()
+            claim = uuid.uuid4().hex
+            try:
+                due = ("(status = 'queued' AND next_at <= ?) OR (status = 'uploading' AND lease_until < ?)")
+                row = db.execute(f'SELECT {_COLUMNS} FROM publish WHERE {due} ORDER BY next_at LIMIT 1',
+                                 (now, now)).fetchone()
+                if row is None:
+                    nxt = db.execute("SELECT MIN(next_at) FROM publish WHERE status = 'queued'").fetchone()[0]
+                    db.execute('COMMIT')
+                    return None, (max(0.0, nxt - now) if nxt is not None else None), False
+                last = db.execute("SELECT value FROM publish_meta WHERE name = 'last_start'").fetchone()
+                if last and now < last[0] + self.min_interval:
+                    db.execute('COMMIT')
+                    return None, last[0] + self.min_interval - now, True
+                db.execute("UPDATE publish SET status = 'uploading', attempts = attempts + 1, lease_until = ?, "
+                           "claim = ?, updated = ? WHERE key = ?", (now + self.lease_seconds, claim, now, row[0]))
+                db.execute("INSERT OR REPLACE INTO publish_meta (name, value) VALUES ('last_start', ?)", (now,))
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+        finally:
+            db.close()
+        entry = self._row(row)
+        entry.update(status='uploading', attempts=entry['attempts'] + 1, claim=claim)
+        return entry, 0.0, True
+
+    def _renew(self, key: str, claim: str) -> bool:
+        """Extend the lease of an entry this worker still holds."""
+        now = time.time()
+        with self._connect() as db:
+            cur = db.execute("UPDATE publish SET lease_until = ? WHERE key = ? AND status = 'uploading' "
+                             "AND claim = ?", (now + self.lease_seconds, key, claim))
+        return cur.rowcount > 0
+
+    @contextmanager
+    def _keep_lease(self, key: str, claim: str):
+        """Renew the lease every third of `lease_seconds` while the upload runs."""
+        done = threading.Event()
+
+        def beat():
+            while not done.wait(self.lease_seconds / 3):
+                try:
+                    if not self._renew(key, claim):
+                        return
+                except sqlite3.Error:
+                    pass
+
+        t = threading.Thread(target=beat, name=f'publish-lease-{key[:8]}', daemon=True)
+        t.start()
+        try:
+            yield
+        finally:
+            done.set()
+            t.join()
+
+    def _finish(self, key: str, claim: str, **fields) -> bool:
+        """Record the outcome unless the claim was lost (lease expired and taken by another worker)."""
+        fields['updated'] = time.time()
+        cols = ', '.join(f'{k} = ?' for k in fields)
+        with self._connect() as db:
+            cur = db.execute(f"UPDATE publish SET {cols}, lease_until = NULL, claim = NULL "
+                             "WHERE key = ? AND status = 'uploading' AND claim = ?", (*fields.values(), key, claim))
+        return cur.rowcount > 0
+
+    def process_one(self):
+        """Upload one due entry; returns (entry or None, seconds to wait, whether anything is due)."""
+        entry, wait, due = self._claim()
+        if entry is None:
+            return None, wait, due
+        key, claim = entry['key'], entry['claim']
+        try:
+            with self._keep_lease(key, claim):
+                res = self.publish_fn(entry['video'], entry['title'], entry['description'], entry['tags'],
+                                      idempotency_key=key)
+        except Exception as e:
+            delay = _retry_delay(e)
+            if delay is None or entry['attempts'] >= self.max_attempts:
+                self._finish(key, claim, status='failed', error=str(e))
+            else:
+                backoff = min(self.backoff * 2 ** (entry['attempts'] - 1), self.backoff_max)
+                self._finish(key, claim, status='queued', error=str(e), next_at=time.time() + max(backoff, delay))
+        else:
+            self._finish(key, claim, status='published', result=json.dumps(res), error=None)
+        return self.get(key), 0.0, True
+
+    def drain(self, workers: Optional[int] = None) -> list:
+        """Upload everything that is due now (honouring the rate limit); returns processed entries.
+
+        Entries waiting for a retry later are left in the queue.
+        """
+        done = []
+
+        def loop():
+            while True:
+                entry, wait, due = self.process_one()
+                if entry is not None:
+                    done.append(entry)
+                elif not due:
+                    return
+                else:
+                    time.sleep(wait)
+
+        n = workers or self.workers
+        with ThreadPoolExecutor(max_workers=n, thread_name_prefix='publish-drain') as ex:
+            for f in [ex.submit(loop) for _ in range(n)]:
+                f.result()
+        return done
+
+    def start(self):
+        """Start the background workers (again after fork)."""
+        with self._lock:
+            if any(t.is_alive() for t in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [threading.Thread(target=self._loop, name=f'publish-{i}', daemon=True)
+                             for i in range(self.workers)]
+            for t in self._threads:
+                t.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                entry, wait, _ = self.process_one()
+            except Exception:
+                entry, wait = None, POLL_SECONDS
+            if entry is None:
+                self._wake.wait(min(wait if wait is not None else POLL_SECONDS, POLL_SECONDS))
+                self._wake.clear()
+
+    def stop(self, wait: bool = True):
+        """Stop the workers; an upload in progress is finished first when `wait`."""
+        self._stop.set()
+        self._wake.set()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def stats(self) -> dict:
+        return {'counts': self.counts(), 'workers': sum(t.is_alive() for t in self._threads),
+                'minInterval': self.min_interval, 'maxAttempts': self.max_attempts}
+
+
+_queue: Optional[PublishQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> PublishQueue:
+    """Process-wide queue configured from the environment."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = PublishQueue(
+                os.environ.get('PUBLISH_DB', os.path.join('outputs', 'publish.sqlite3')),
+                workers=int(os.environ.get('PUBLISH_WORKERS', '1')),
+                max_attempts=int(os.environ.get('PUBLISH_MAX_ATTEMPTS', '5')),
+                backoff=float(os.environ.get('PUBLISH_BACKOFF', '30')),
+                backoff_max=float(os.environ.get('PUBLISH_BACKOFF_MAX', '3600')),
+                min_interval=float(os.environ.get('PUBLISH_MIN_INTERVAL', '0')),
+                lease_seconds=float(os.environ.get('PUBLISH_LEASE_SECONDS', '600')),
+            )
+        return _queue
@@ -1,26 +1,151 @@
 """Szkic publikatora przez Postiz.
 
-U7Cytkownik musi ustawić POSTIZ_API_URL i POSTIZ_API_KEY w zmiennych srodowiskowych.
+U7Cytkownik musi ustawić POSTIZ_API_URL i POSTIZ_API_KEY w zmiennych srodowiskowych.
+
+Wideo wysyłane jest strumieniowo: ciało multipart/form-data składane jest w
+locie z pól i kawałków pliku (`POSTIZ_CHUNK_BYTES`, domyślnie 256 KiB), więc
+pamięć nie rośnie z rozmiarem filmu, a plik jest zamykany po wysyłce.
+Długość ciała jest znana z góry (Content-Length); `POSTIZ_CHUNKED=1` wysyła
+je jako Transfer-Encoding: chunked dla serwerów/proxy, które tego wymagają.
+Timeouty: `POSTIZ_CONNECT_TIMEOUT` (domyślnie 10 s) i odczytu
+`HTTP_TIMEOUT_POSTIZ` (domyślnie 300 s). Przepustowość wysyłek: `stats()`.
 """
+import mimetypes
 import os
-import requests
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from . import http_client
+
+CHUNK_BYTES = int(os.environ.get('POSTIZ_CHUNK_BYTES', str(256 * 1024)))
+CONNECT_TIMEOUT = float(os.environ.get('POSTIZ_CONNECT_TIMEOUT', '10'))
+
+
+def _quote(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\r', ' ').replace('\n', ' ')
+
+
+class MultipartBody:
+    """Re-iterable multipart/form-data body streamed from disk in fixed-size chunks.
+
+    Fields come first, then the file part. `len()` is the exact body size, so
+    requests sends a Content-Length; `sent` counts bytes handed to the socket.
+    """
+
+    def __init__(self, fields: dict, file_field: str, file_path: str, chunk_bytes: int = CHUNK_BYTES):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self.file_path = str(file_path)
+        self.chunk_bytes = max(1, int(chunk_bytes))
+        self.sent = 0
+        self._fh = None
+        head = b''.join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(k)}"\r\n\r\n'.encode()
+            + str(v).encode('utf-8') + b'\r\n'
+            for k, v in fields.items())
+        name = Path(self.file_path).name
+        mime = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self._head = head + (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(file_field)}"; '
+                             f'filename="{_quote(name)}"\r\nContent-Type: {mime}\r\n\r\n').encode('utf-8')
+        self._tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self.file_size = os.path.getsize(self.file_path)
+
+    def __len__(self):
+        return len(self._head) + self.file_size + len(self._tail)
+
+    def __iter__(self):
+        self.sent = 0
+        yield self._count(self._head)
+        self.close()
+        self._fh = open(self.file_path, 'rb')
+        try:
+            while True:
+                chunk = self._fh.read(self.chunk_bytes)
+                if not chunk:
+                    break
+                yield self._count(chunk)
+        finally:
+            self.close()
+        yield self._count(self._tail)
+
+    def _count(self, data: bytes) -> bytes:
+        self.sent += len(data)
+        return data
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class _Unsized:
+    """Hides the length so requests falls back to Transfer-Encoding: chunked."""
+
+    def __init__(self, body: MultipartBody):
+        self.body = body
+
+    def __iter__(self):
+        return iter(self.body)
+
+
+_stats = {'uploads': 0, 'errors': 0, 'bytes': 0, 'seconds': 0.0, 'lastMBps': None}
+_lock = threading.Lock()
+
+
+def _record(sent: int, seconds: float, ok: bool) -> Optional[float]:
+    mbps = round(sent / seconds / 1e6, 2) if ok and seconds > 0 else None
+    with _lock:
+        _stats['uploads'] += 1
+        _stats['errors'] += 0 if ok else 1
+        _stats['bytes'] += sent
+        _stats['seconds'] += seconds
+        if mbps is not None:
+            _stats['lastMBps'] = mbps
+    return mbps
+
+
+def stats() -> dict:
+    """Upload counters: uploads, errors, bytes, seconds, lastMBps and overall MBps."""
+    with _lock:
+        st = dict(_stats)
+    st['MBps'] = round(st['bytes'] / st['seconds'] / 1e6, 2) if st['seconds'] else None
+    return st
 
 
-def publish_to_postiz(video_path: str, title: str, description: str, tags: list[str]) -> dict:
+def publish_to_postiz(video_path: str, title: str, description: str, tags: list[str],
+                      chunked: Optional[bool] = None, idempotency_key: Optional[str] = None) -> dict:
     url = os.environ.get('POSTIZ_API_URL')
     api_key = os.environ.get('POSTIZ_API_KEY')
     if not url or not api_key:
         raise RuntimeError('POSTIZ_API_URL and POSTIZ_API_KEY must be set to publish')
+    if chunked is None:
+        chunked = os.environ.get('POSTIZ_CHUNKED', '0').lower() in ('1', 'true', 'yes')
 
-    files = {'file': open(video_path, 'rb')}
     data = {
         'title': title,
         'description': description,
         'tags': ','.join(tags)
     }
-    headers = {'Authorization': f'Bearer {api_key}'}
-    r = requests.post(url, headers=headers, data=data, files=files)
-    r.raise_for_status()
+    body = MultipartBody(data, 'file', video_path)
+    headers = {'Authorization': f'Bearer {api_key}', 'Content-Type': body.content_type}
+    if idempotency_key:
+        # lets the server drop a repeated upload of the same video (see publish_queue)
+        headers['Idempotency-Key'] = idempotency_key
+    timeout = (CONNECT_TIMEOUT, http_client.timeout_for('postiz'))
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        # no automatic retry: a half-sent upload may already have created the post
+        r = http_client.post(url, backend='postiz', retries=0, headers=headers, timeout=timeout,
+                             data=_Unsized(body) if chunked else body)
+        r.raise_for_status()
+        ok = True
+    finally:
+        body.close()
+        _record(body.sent, time.perf_counter() - t0, ok)
     return r.json()
 
 
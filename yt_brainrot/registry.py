@@ -0,0 +1,99 @@
+"""Leniwy rejestr modułów backendów (LLM, TTS, obraz, A1111, montaż, publikacja).
+
+Moduł jest importowany przy pierwszym użyciu i trzymany do końca procesu;
+czas każdego importu trafia do `stats()`. `lazy(nazwa)` zwraca pełnomocnika,
+który importuje moduł dopiero przy pierwszym dostępie do atrybutu, więc
+skrypty mogą trzymać zwykłe `llm.generate_story(...)` bez płacenia za import
+przy starcie (np. `--help`).
+
+`warm_up()` ładuje wszystko z góry — do wywołania z hooka gunicorna
+`post_fork` (patrz webapp/gunicorn.conf.py), żeby pierwsze żądanie nowego
+workera nie czekało na importy.
+"""
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+BACKENDS: Dict[str, str] = {
+    'llm': 'yt_brainrot.llm',
+    'tts': 'yt_brainrot.tts',
+    'visual': 'yt_brainrot.visual',
+    'sd': 'yt_brainrot.sd_a1111',
+    'editor': 'yt_brainrot.editor',
+    'publisher': 'yt_brainrot.publisher',
+    'publish_queue': 'yt_brainrot.publish_queue',
+    'voices': 'yt_brainrot.voices',
+    'jobs': 'yt_brainrot.jobs',
+}
+
+_modules: Dict[str, ModuleType] = {}
+_seconds: Dict[str, float] = {}
+_lock = threading.RLock()
+
+
+def get(name: str) -> ModuleType:
+    """Module registered as `name`, imported on first use."""
+    mod = _modules.get(name)
+    if mod is not None:
+        return mod
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown backend module: {name}')
+    with _lock:
+        mod = _modules.get(name)
+        if mod is None:
+            t0 = time.perf_counter()
+            mod = importlib.import_module(BACKENDS[name])
+            _seconds[name] = round(time.perf_counter() - t0, 4)
+            _modules[name] = mod
+        return mod
+
+
+def load(*names: str) -> tuple:
+    return tuple(get(n) for n in names)
+
+
+class _LazyModule:
+    def __init__(self, name: str):
+        if name not in BACKENDS:
+            raise ValueError(f'Unknown backend module: {name}')
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(get(self._name), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._name in _modules else 'not loaded'
+        return f'<lazy module {BACKENDS[self._name]!r} ({state})>'
+
+
+def lazy(name: str) -> _LazyModule:
+    """Proxy that imports the module on first attribute access."""
+    return _LazyModule(name)
+
+
+def warm_up(names: Optional[Iterable[str]] = None, voices: bool = False) -> dict:
+    """Import the given modules (all by default); `voices=True` also builds the voice inventory.
+
+    Errors are collected instead of raised so a missing optional backend
+    cannot stop a worker from booting.
+    """
+    errors = {}
+    for name in names or BACKENDS:
+        try:
+            get(name)
+        except Exception as e:
+            errors[name] = str(e) or type(e).__name__
+    if voices and 'voices' in _modules:
+        try:
+            _modules['voices'].inventory()
+        except Exception as e:
+            errors['voices.inventory'] = str(e) or type(e).__name__
+    return {'modules': stats(), 'errors': errors}
+
+
+def stats() -> dict:
+    """{name: {'loaded', 'seconds'}} — `seconds` is the time of the first import."""
+    with _lock:
+        return {name: {'loaded': name in _modules, 'seconds': _seconds.get(name)} for name in BACKENDS}
@@ -0,0 +1,76 @@
+"""Harmonogram etapowy: każdy etap (LLM, TTS, obraz, ffmpeg, publikacja) ma
+własną pulę wątków z limitem współbieżności, więc etapy kolejnych shortów
+nakładają się (story/TTS shorta i+1 biegnie, gdy short i się koduje).
+
+Użycie:
+    sched = StageScheduler({'story': 1, 'tts': 2, 'video': 1})
+    results = sched.map(lambda i: sched.run('video', render, i), range(1, 4))
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+
+class StageScheduler:
+    def __init__(self, limits: Dict[str, int], max_in_flight: int = 3):
+        self.limits = dict(limits)
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._pools = {name: ThreadPoolExecutor(max_workers=max(1, int(n)), thread_name_prefix=f'stage-{name}')
+                       for name, n in self.limits.items()}
+        self._lock = threading.Lock()
+        self._stats = {name: {'count': 0, 'seconds': 0.0, 'errors': 0} for name in self.limits}
+
+    def submit(self, stage: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queue `fn` on the pool of `stage`."""
+        if stage not in self._pools:
+            raise ValueError(f'Unknown stage: {stage}')
+
+        def timed():
+            t0 = time.perf_counter()
+            ok = False
+            try:
+                res = fn(*args, **kwargs)
+                ok = True
+                return res
+            finally:
+                with self._lock:
+                    st = self._stats[stage]
+                    st['count'] += 1
+                    st['seconds'] += time.perf_counter() - t0
+                    st['errors'] += 0 if ok else 1
+
+        return self._pools[stage].submit(timed)
+
+    def run(self, stage: str, fn: Callable, *args, **kwargs):
+        return self.submit(stage, fn, *args, **kwargs).result()
+
+    def map(self, job: Callable, items: Iterable) -> List:
+        """Run `job(item)` for every item, at most `max_in_flight` at once.
+
+        Items are started in order and results (or the raised exception) are
+        returned in input order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='short') as ex:
+            futures = [ex.submit(job, item) for item in items]
+            out = []
+            for f in futures:
+                try:
+                    out.append(f.result())
+                except Exception as e:
+                    out.append(e)
+            return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: dict(st) for name, st in self._stats.items()}
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
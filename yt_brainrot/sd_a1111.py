@@ -2,37 +2,46 @@
 
 Funkcje:
 - `generate_image_a1111(prompt, out_path, host)` — wysyła żądanie do /sdapi/v1/txt2img i zapisuje obraz.
+- `generate_images_a1111_batch(prompts, out_paths, host)` — wiele obrazów w jak najmniejszej liczbie
+  wywołań txt2img (`batch_size`/`n_iter`).
 
 Uwaga: wymagane uruchomione A1111 na hoście (domyślnie http://127.0.0.1:7860).
 Dla niskiego VRAM (RTX4050 6GB) rekomendacje w README.
 """
 import base64
 import io
-import requests
+import json
+import os
+import shutil
 from pathlib import Path
 from typing import Optional
 
+from . import health, http_client, image_cache
+
+# Images per txt2img batch; keep low for 6 GB cards at 720x1280.
+MAX_BATCH = int(os.environ.get('SD_MAX_BATCH', '2'))
+
 
 def is_server_alive(host: str = 'http://127.0.0.1:7860') -> bool:
-    try:
-        r = requests.get(f'{host}/sdapi/v1/version', timeout=2)
-        return r.status_code == 200
-    except Exception:
-        return False
+    """Cached A1111 state from the shared `health` registry (no request per call)."""
+    return health.is_up('a1111', host)
 
 
-def generate_image_a1111(prompt: str, out_path: str, host: str = 'http://127.0.0.1:7860',
-                         width: int = 1080, height: int = 1920, steps: int = 20,
-                         sampler: str = 'Euler a', cfg_scale: float = 7.0, seed: Optional[int] = -1) -> str:
-    """Wywołaj A1111 txt2img i zapisz wynik jako plik JPG/PNG.
+def _txt2img(host: str, payload: dict, **kwargs):
+    try:
+        r = http_client.post(f'{host}/sdapi/v1/txt2img', backend='a1111', json=payload, **kwargs)
+    except Exception as e:
+        health.report('a1111', host, ok=False, error=str(e))
+        raise
+    # a crashing or out-of-memory WebUI answers 5xx: that counts towards the breaker
+    ok = r.status_code < 500
+    health.report('a1111', host, ok=ok, error=None if ok else f'HTTP {r.status_code}')
+    return r
 
-    Jeśli A1111 nie jest dostępny, wyjątek zostanie rzucony.
-    Dla RTX4050 warto używać mniejszych rozdzielczości lub opcji --medvram na WebUI.
-    """
-    if not is_server_alive(host):
-        raise RuntimeError(f'Automatic1111 server not reachable at {host}')
 
-    payload = {
+def _build_payload(prompt: str, width: int, height: int, steps: int, sampler: str,
+                   cfg_scale: float, seed: Optional[int]) -> dict:
+    return {
         'prompt': prompt,
         'negative_prompt': 'lowres, bad anatomy, text, watermark',
         'width': width,
@@ -45,7 +54,32 @@ def generate_image_a1111(prompt: str, out_path: str, host: str = 'http://127.0.0
         'override_settings': {},
     }
 
-    r = requests.post(f'{host}/sdapi/v1/txt2img', json=payload, timeout=120)
+
+def generate_image_a1111(prompt: str, out_path: str, host: str = 'http://127.0.0.1:7860',
+                         width: int = 1080, height: int = 1920, steps: int = 20,
+                         sampler: str = 'Euler a', cfg_scale: float = 7.0, seed: Optional[int] = -1,
+                         use_cache: bool = True) -> str:
+    """Wywołaj A1111 txt2img i zapisz wynik jako plik JPG/PNG.
+
+    Jeśli A1111 nie jest dostępny, wyjątek zostanie rzucony.
+    Dla RTX4050 warto używać mniejszych rozdzielczości lub opcji --medvram na WebUI.
+    Identyczny payload ze stałym seedem jest obsługiwany z `image_cache` (obraz
+    kopiowany do `out_path`, bez wywołania A1111); losowy seed (-1/None) zawsze
+    generuje nowy obraz, zapisywany w cache pod faktycznie użytym seedem.
+    `use_cache=False` wymusza generowanie.
+    """
+    payload = _build_payload(prompt, width, height, steps, sampler, cfg_scale, seed)
+
+    cache_on = use_cache and image_cache.enabled()
+    if cache_on and payload['seed'] not in (-1, None):
+        hit = image_cache.get(image_cache.make_key(host, payload), str(out_path))
+        if hit:
+            return {'path': str(out_path), 'seed': hit.get('seed'), 'prompt': hit.get('prompt', prompt), 'cached': True}
+
+    if not is_server_alive(host):
+        raise RuntimeError(f'Automatic1111 server not reachable at {host}')
+
+    r = _txt2img(host, payload)
     r.raise_for_status()
     j = r.json()
     images = j.get('images', [])
@@ -86,7 +120,132 @@ def generate_image_a1111(prompt: str, out_path: str, host: str = 'http://127.0.0
     except Exception:
         pass
 
-    return {'path': str(out_p), 'seed': seed, 'prompt': resp_prompt}
+    result = {'path': str(out_p), 'seed': seed, 'prompt': resp_prompt, 'cached': False}
+    if cache_on:
+        # only under the seed actually used: a random-seed request must not be replayed
+        resolved = seed[0] if isinstance(seed, list) and seed else seed
+        if isinstance(resolved, int):
+            try:
+                image_cache.put(image_cache.make_key(host, dict(payload, seed=resolved)), str(out_p), result)
+            except Exception:
+                pass
+    return result
+
+
+def _all_seeds(j: dict) -> list:
+    try:
+        info = json.loads(j.get('info') or '{}')
+    except Exception:
+        return []
+    seeds = info.get('all_seeds')
+    if isinstance(seeds, list):
+        return seeds
+    return [info['seed']] if isinstance(info.get('seed'), int) else []
+
+
+def _batch_chunks(idxs: list, max_batch: int):
+    """Split `idxs` into (chunk, batch_size, n_iter) covering it without surplus images."""
+    b = max(1, min(max_batch, len(idxs)))
+    full = (len(idxs) // b) * b
+    if full:
+        yield idxs[:full], b, full // b
+    if full < len(idxs):
+        yield idxs[full:], len(idxs) - full, 1
+
+
+def generate_images_a1111_batch(prompts: list, out_paths: list, host: str = 'http://127.0.0.1:7860',
+                                width: int = 720, height: int = 1280, steps: int = 20,
+                                sampler: str = 'Euler a', cfg_scale: float = 7.0,
+                                seeds: Optional[list] = None, max_batch: Optional[int] = None,
+                                use_cache: bool = True) -> list:
+    """Generate one image per (prompt, out_path) in as few txt2img calls as possible.
+
+    Requests sharing a prompt go into one call using `batch_size`/`n_iter`;
+    explicit seeds are grouped into consecutive runs since A1111 uses
+    seed, seed+1, ... within a call. Every returned image is decoded and
+    stored in `image_cache` under its single-image key. Returns result dicts
+    in the order of `prompts`.
+    """
+    if len(prompts) != len(out_paths):
+        raise ValueError('prompts and out_paths must have the same length')
+    max_batch = max_batch or MAX_BATCH
+    seeds = list(seeds) if seeds is not None else [-1] * len(prompts)
+    cache_on = use_cache and image_cache.enabled()
+    results = [None] * len(prompts)
+
+    def _payload(prompt, seed):
+        return _build_payload(prompt, width, height, steps, sampler, cfg_scale, seed)
+
+    def _save(i, img_b64, seed):
+        out_p = Path(out_paths[i])
+        out_p.parent.mkdir(parents=True, exist_ok=True)
+        out_p.write_bytes(base64.b64decode(img_b64))
+        results[i] = {'path': str(out_p), 'seed': seed, 'prompt': prompts[i], 'cached': False}
+
+    # Serve explicit seeds from cache, collapse duplicate (prompt, seed) pairs
+    pending = {}
+    dupes = {}
+    seen = {}
+    for i, (prompt, seed) in enumerate(zip(prompts, seeds)):
+        fixed = seed not in (-1, None)
+        if fixed and (prompt, seed) in seen:
+            dupes[i] = seen[(prompt, seed)]
+            continue
+        if fixed and cache_on:
+            hit = image_cache.get(image_cache.make_key(host, _payload(prompt, seed)), str(out_paths[i]))
+            if hit:
+                results[i] = {'path': str(out_paths[i]), 'seed': hit.get('seed'), 'prompt': prompt, 'cached': True}
+                continue
+        if fixed:
+            seen[(prompt, seed)] = i
+        pending.setdefault(prompt, []).append(i)
+
+    groups = []  # (prompt, start seed, indices)
+    for prompt, idxs in pending.items():
+        rand = [i for i in idxs if seeds[i] in (-1, None)]
+        if rand:
+            groups.append((prompt, -1, rand))
+        run = []
+        for i in sorted((i for i in idxs if seeds[i] not in (-1, None)), key=lambda i: seeds[i]):
+            if run and seeds[i] != seeds[run[-1]] + 1:
+                groups.append((prompt, seeds[run[0]], run))
+                run = []
+            run.append(i)
+        if run:
+            groups.append((prompt, seeds[run[0]], run))
+
+    if groups and not is_server_alive(host):
+        raise RuntimeError(f'Automatic1111 server not reachable at {host}')
+
+    for prompt, start_seed, idxs in groups:
+        offset = 0
+        for chunk, batch_size, n_iter in _batch_chunks(idxs, max_batch):
+            seed = start_seed if start_seed == -1 else start_seed + offset
+            payload = dict(_payload(prompt, seed), batch_size=batch_size, n_iter=n_iter)
+            r = _txt2img(host, payload, timeout=http_client.timeout_for('a1111') * n_iter)
+            r.raise_for_status()
+            j = r.json()
+            images = j.get('images', [])
+            if len(images) < len(chunk):
+                raise RuntimeError(f'A1111 returned {len(images)} images, expected {len(chunk)}')
+            images = images[-len(chunk):]  # a preview grid, if any, comes first
+            all_seeds = _all_seeds(j)
+            for k, i in enumerate(chunk):
+                img_seed = all_seeds[k] if k < len(all_seeds) else None
+                _save(i, images[k], img_seed)
+                if cache_on and isinstance(img_seed, int):
+                    try:
+                        image_cache.put(image_cache.make_key(host, _payload(prompt, img_seed)),
+                                        results[i]['path'], results[i])
+                    except Exception:
+                        pass
+            offset += len(chunk)
+
+    for i, src in dupes.items():
+        Path(out_paths[i]).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(results[src]['path'], out_paths[i])
+        results[i] = dict(results[src], path=str(out_paths[i]))
+    return results
 
 
 if __name__ == '__main__':
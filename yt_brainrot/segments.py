@@ -0,0 +1,189 @@
+"""Stałe intro/outro doklejane do shortów bez ponownego kodowania.
+
+Segment (obraz wyświetlany przez `BRAND_IMAGE_SECONDS` albo klip wideo) jest
+kodowany raz tymi samymi parametrami co short: koder, preset/CRF, fps, GOP,
+rozdzielczość, yuv420p z SAR 1:1, AAC 48 kHz stereo i ta sama skala czasu
+ścieżki wideo. Wynik trafia do cache (`SEGMENTS_DIR`, domyślnie
+outputs/cache/segments) pod kluczem z pliku źródłowego (ścieżka, mtime,
+rozmiar) i tych parametrów, więc zmiana profilu czy kodera koduje segment
+na nowo, a każdy kolejny short tylko go odczytuje. Intro + short + outro są
+łączone demuxerem concat z `-c copy` — branding kosztuje przepisanie
+kontenera, nie kodowanie.
+
+Konfiguracja: `BRAND_INTRO` / `BRAND_OUTRO` (obraz lub klip; puste = brak),
+`BRAND_IMAGE_SECONDS` (domyślnie 2), `SEGMENTS_MAX_BYTES` (domyślnie 256 MiB).
+"""
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from . import encoders
+from .disk_cache import DiskCache, hash_key
+
+IMAGE_SECONDS = float(os.environ.get('BRAND_IMAGE_SECONDS', '2'))
+AUDIO_RATE = 48000
+AUDIO_CHANNELS = 2
+TIMESCALE = 90000
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+# Stream parameters every part of a branded short is written with; the concat
+# demuxer can only stream-copy parts whose audio and track timescale agree.
+STREAM_ARGS = ['-c:a', 'aac', '-b:a', '192k', '-ar', str(AUDIO_RATE), '-ac', str(AUDIO_CHANNELS),
+               '-video_track_timescale', str(TIMESCALE)]
+
+_cache = DiskCache(
+    os.environ.get('SEGMENTS_DIR', os.path.join('outputs', 'cache', 'segments')),
+    int(os.environ.get('SEGMENTS_MAX_BYTES', str(256 * 1024 * 1024))),
+    '.mp4',
+)
+_lock = threading.Lock()
+_key_locks = {}
+_stats = {'encodes': 0, 'encodeSeconds': 0.0, 'assembled': 0, 'assembleSeconds': 0.0}
+
+
+def from_env() -> dict:
+    """{'intro', 'outro'} paths from BRAND_INTRO / BRAND_OUTRO (None when unset)."""
+    return {'intro': os.environ.get('BRAND_INTRO') or None, 'outro': os.environ.get('BRAND_OUTRO') or None}
+
+
+def fit_filter(width: int, height: int) -> str:
+    """Scale into width x height with lanczos, pad the rest, square pixels, yuv420p."""
+    return (
+        f'scale={width}:{height}:force_original_aspect_ratio=decrease:flags=lanczos,'
+        f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p'
+    )
+
+
+def _has_audio(path: str) -> bool:
+    p = subprocess.run(['ffmpeg', '-hide_banner', '-i', path], capture_output=True, text=True, check=False)
+    return re.search(r'Stream #\d+:\d+.*: Audio:', p.stderr) is not None
+
+
+def make_key(source: str, opts: dict, width: int, height: int, seconds: Optional[float]) -> str:
+    st = os.stat(source)
+    return hash_key({
+        'source': os.path.realpath(source), 'mtime': st.st_mtime_ns, 'bytes': st.st_size,
+        'seconds': seconds, 'size': [width, height], 'stream': STREAM_ARGS,
+        'opts': {k: opts.get(k) for k in ('encoder', 'preset', 'crf', 'tune', 'gop', 'fps')},
+    })
+
+
+def encode_segment(source: str, out_path: str, opts: dict, width: int = 1080, height: int = 1920,
+                   seconds: Optional[float] = None) -> str:
+    """Encode `source` (image or video clip) with the short's parameters; silent audio if it has none."""
+    source = str(source)
+    in_args, codec_args, vf_tail = encoders.ffmpeg_args(opts)
+    silence = ['-f', 'lavfi', '-i', f'anullsrc=r={AUDIO_RATE}:cl=stereo']
+    if Path(source).suffix.lower() in IMAGE_SUFFIXES:
+        seconds = seconds or IMAGE_SECONDS
+        inputs = ['-loop', '1', '-framerate', str(opts['fps']), '-i', source, *silence]
+        maps = ['-map', '0:v:0', '-map', '1:a:0']
+    elif _has_audio(source):
+        inputs = ['-i', source]
+        maps = ['-map', '0:v:0', '-map', '0:a:0']
+    else:
+        inputs = ['-i', source, *silence]
+        maps = ['-map', '0:v:0', '-map', '1:a:0']
+    t_args = ['-t', str(seconds)] if seconds else []
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error', *in_args, *inputs, *maps, *codec_args, *t_args,
+        '-vf', fit_filter(width, height) + vf_tail, *STREAM_ARGS, '-shortest', str(out_path)
+    ]
+    subprocess.run(cmd, check=True)
+    return str(out_path)
+
+
+def get_segment(source: str, opts: dict, width: int = 1080, height: int = 1920,
+                seconds: Optional[float] = None, out_path: Optional[str] = None) -> str:
+    """Encoded segment, from the cache or encoded on the first use.
+
+    With `out_path` the segment is copied there, so cache eviction cannot
+    remove it while the caller still reads it.
+    """
+    key = make_key(str(source), opts, width, height, seconds)
+    # one encode per segment even when several shorts finish at the same time;
+    # other segments (and stats) are not held up behind it
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        hit = _cache.get(key, out_path)
+        if hit:
+            return hit['path']
+        with tempfile.TemporaryDirectory() as d:
+            tmp = os.path.join(d, 'segment.mp4')
+            t0 = time.perf_counter()
+            encode_segment(source, tmp, opts, width, height, seconds)
+            with _lock:
+                _stats['encodes'] += 1
+                _stats['encodeSeconds'] += time.perf_counter() - t0
+            _cache.put(key, tmp, {'source': str(source), 'seconds': seconds, 'size': [width, height],
+                                  'encoder': opts.get('encoder'), 'createdAt': time.time()})
+            if out_path is not None:
+                shutil.copyfile(tmp, out_path)
+                return str(out_path)
+    return str(_cache.path_for(key))
+
+
+def _quote(path: str) -> str:
+    return "'" + os.path.abspath(path).replace("'", "'\\''") + "'"
+
+
+def concat(parts: list, out_path: str) -> str:
+    """Join encoded parts with the concat demuxer and stream copy (no re-encode)."""
+    out_path = str(out_path)
+    fd, listing = tempfile.mkstemp(suffix='.txt', dir=os.path.dirname(os.path.abspath(out_path)))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(f'file {_quote(str(p))}\n' for p in parts)
+        subprocess.run(['ffmpeg', '-y', '-v', 'error', '-f', 'concat', '-safe', '0', '-i', listing,
+                        '-map', '0', '-c', 'copy', '-movflags', '+faststart', out_path], check=True)
+    finally:
+        os.unlink(listing)
+    return out_path
+
+
+def attach(video_path: str, out_path: str, opts: dict, width: int = 1080, height: int = 1920,
+           intro: Optional[str] = None, outro: Optional[str] = None) -> str:
+    """Write intro + `video_path` + outro to `out_path`.
+
+    `video_path` must have been encoded with `opts` and `STREAM_ARGS`.
+    """
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(out_path))) as d:
+        parts = [get_segment(intro, opts, width, height, out_path=os.path.join(d, 'intro.mp4'))] if intro else []
+        parts.append(str(video_path))
+        if outro:
+            parts.append(get_segment(outro, opts, width, height, out_path=os.path.join(d, 'outro.mp4')))
+        t0 = time.perf_counter()
+        concat(parts, out_path)
+    with _lock:
+        _stats['assembled'] += 1
+        _stats['assembleSeconds'] += time.perf_counter() - t0
+    return str(out_path)
+
+
+def partial_path(out_path: str) -> str:
+    """Where the short itself is rendered before the segments are attached."""
+    p = Path(out_path)
+    return str(p.with_name(f'{p.stem}.main{p.suffix}'))
+
+
+def stats() -> dict:
+    with _lock:
+        res = dict(_stats)
+    res['encodeSeconds'] = round(res['encodeSeconds'], 3)
+    res['assembleSeconds'] = round(res['assembleSeconds'], 3)
+    res['cache'] = _cache.stats()
+    return res
+
+
+def clear():
+    _cache.clear()
+    with _lock:
+        for k in _stats:
+            _stats[k] = 0
@@ -0,0 +1,30 @@
+"""Podział tekstu na zdania — dla strumienia z LLM i dla równoległego TTS."""
+import re
+from typing import Iterable, Iterator
+
+_SENTENCE_END = re.compile(r'[.!?…]+["\'”»)\]]*\s+')
+
+
+def split_sentences(pieces: Iterable[str], min_chars: int = 20) -> Iterator[str]:
+    """Group a stream of text pieces into sentences, yielding each once it is complete.
+
+    Sentences shorter than `min_chars` are joined with the next one, so TTS does
+    not get fragments like "Hej!" on their own.
+    """
+    buf = ''
+    pending = ''
+    for piece in pieces:
+        buf += piece
+        pos = 0
+        for m in _SENTENCE_END.finditer(buf):
+            sentence = (pending + ' ' + buf[pos:m.end()].strip()).strip()
+            pos = m.end()
+            if len(sentence) < min_chars:
+                pending = sentence
+                continue
+            pending = ''
+            yield sentence
+        buf = buf[pos:]
+    rest = (pending + ' ' + buf.strip()).strip()
+    if rest:
+        yield rest
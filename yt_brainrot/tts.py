@@ -3,16 +3,26 @@
 Provides `tts_to_wav` which returns metadata dict: {'path', 'voice', 'backend', 'format'}.
 Also: `list_voices()` returns detected voices per backend (best-effort).
 """
+import importlib.util
 import os
 import subprocess
 import tempfile
+import multiprocessing
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 import shutil
 
+from . import audio_info, piper_server, tts_cache, tts_engines
+from .sentences import split_sentences
+
 
 def _choose_piper_cmd(out_path: str, text: str, voice: Optional[str], speed: Optional[float]) -> list:
-    cmd = ["piper", "--output", out_path, "--text", text]
+    cmd = [piper_server.binary(), "--output", out_path, "--text", text]
     if voice:
         cmd += ["--voice", voice]
     if speed is not None:
@@ -20,24 +30,46 @@ def _choose_piper_cmd(out_path: str, text: str, voice: Optional[str], speed: Opt
     return cmd
 
 
+_HTTP_PATHS = ['', '/synthesize', '/api/synthesize', '/api/tts', '/generate', '/api/generate', '/tts']
+
+
+def _save_http_audio(r, out_path: str, hint: Optional[str] = None) -> Optional[str]:
+    """Write audio from a TTS response; returns the response shape or None."""
+    ctype = r.headers.get('Content-Type', '')
+    if ctype.startswith('audio/'):
+        with open(out_path, 'wb') as f:
+            f.write(r.content)
+        return 'audio'
+    # try json
+    try:
+        j = r.json()
+    except Exception:
+        return None
+    if not isinstance(j, dict):
+        return None
+    keys = ['audio', 'wav', 'file']
+    if hint and hint.startswith('json:'):
+        keys.insert(0, hint[5:])
+    for key in keys:
+        if isinstance(j.get(key), str):
+            import base64
+            with open(out_path, 'wb') as f:
+                f.write(base64.b64decode(j[key]))
+            return f'json:{key}'
+    return None
+
+
 def _try_http_tts(url: str, text: str, out_path: str, voice: Optional[str], speed: Optional[float]) -> bool:
     """Attempt to call a remote TTS HTTP endpoint using a few common paths and payloads.
 
     Accepts:
       - application/json responses with {'audio': '<base64>'} or {'wav': '<base64>'}
       - direct audio response with content-type audio/*
+    The working path/encoding is probed once per URL and remembered (`discovery`).
     Returns True on success and writes to out_path.
     """
-    import requests
-    endpoints = [
-        url,
-        url.rstrip('/') + '/synthesize',
-        url.rstrip('/') + '/api/synthesize',
-        url.rstrip('/') + '/api/tts',
-        url.rstrip('/') + '/generate',
-        url.rstrip('/') + '/api/generate',
-        url.rstrip('/') + '/tts'
-    ]
+    from . import discovery, http_client
+    base = url.rstrip('/')
     headers = {'Accept': '*/*'}
     payload = {'text': text}
     if voice:
@@ -45,57 +77,351 @@ def _try_http_tts(url: str, text: str, out_path: str, voice: Optional[str], spee
     if speed is not None:
         payload['speed'] = speed
 
-    for ep in endpoints:
+    def attempt(cand, probing):
+        body = {'json': payload} if cand['encoding'] == 'json' else {'data': payload}
+        r = http_client.post(base + cand['path'] if cand['path'] else url, backend='tts', headers=headers,
+                             retries=0 if probing else None, **body)
+        if r.status_code != 200:
+            return None
+        shape = _save_http_audio(r, out_path, cand.get('response'))
+        return (True, shape) if shape else None
+
+    # JSON first, then form-encoded, for each path
+    candidates = [{'path': p, 'encoding': e} for p in _HTTP_PATHS for e in ('json', 'form')]
+    return bool(discovery.discover('tts', base, candidates, attempt))
+
+
+def tts_to_wav(text: str, out_path: str, voice: Optional[str] = None, speed: Optional[float] = None, rate: Optional[int] = None, http_url: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+    """Generate WAV from text and return metadata dict.
+
+    Identical inputs are served from `tts_cache`: on a hit no backend runs and
+    the cached WAV is copied to `out_path`. Entries are keyed by the backend
+    that synthesized them, so audio from a fallback backend is not served once
+    the preferred one works again. Pass `use_cache=False` to force synthesis.
+
+    Returns: {'path': str, 'voice': str|null, 'backend': str, 'format': 'wav', 'cached': bool,
+    'duration': float|null (seconds)}
+    """
+    out_path = str(out_path)
+    cache = use_cache and tts_cache.enabled()
+    if cache:
+        key = tts_cache.make_key(text, voice, speed, backend=_preferred_backend(http_url), rate=rate)
+        hit = tts_cache.get(key, out_path)
+        if hit:
+            return _with_duration(hit)
+
+    meta = _synthesize(text, out_path, voice, speed, rate, http_url)
+    meta['cached'] = False
+    _with_duration(meta)
+    if cache:
         try:
-            r = requests.post(ep, json=payload, headers=headers, timeout=20)
-            if r.status_code != 200:
-                # try form-encoded
-                r = requests.post(ep, data=payload, headers=headers, timeout=20)
-            if r.status_code != 200:
-                continue
-
-            ctype = r.headers.get('Content-Type', '')
-            if ctype.startswith('audio/'):
-                with open(out_path, 'wb') as f:
-                    f.write(r.content)
-                return True
-
-            # try json
-            try:
-                j = r.json()
-                for key in ['audio', 'wav', 'file']:
-                    if key in j and isinstance(j[key], str):
-                        import base64
-                        with open(out_path, 'wb') as f:
-                            f.write(base64.b64decode(j[key]))
-                        return True
-            except Exception:
-                pass
+            key = tts_cache.make_key(text, voice, speed, backend=_backend_name(meta, http_url), rate=rate)
+            tts_cache.put(key, meta['path'], meta)
         except Exception:
+            pass
+    return meta
+
+
+def _engine_usable(backend: str, module: str) -> bool:
+    if importlib.util.find_spec(module) is None:
+        return False
+    return not any(s['backend'] == backend and s['error'] for s in tts_engines.status())
+
+
+def _preferred_backend(http_url: Optional[str]) -> str:
+    """Backend `_synthesize` tries first, as named in cache keys (the server URL for HTTP)."""
+    if _engine_usable('coqui', 'TTS'):
+        return 'coqui'
+    if http_url:
+        return http_url
+    if piper_server.enabled() or shutil.which(piper_server.binary()):
+        return 'piper'
+    if _engine_usable('pyttsx3', 'pyttsx3'):
+        return 'pyttsx3'
+    return 'espeak-ng' if shutil.which('espeak') is None and shutil.which('espeak-ng') else 'espeak'
+
+
+def _backend_name(meta: Dict[str, Any], http_url: Optional[str]) -> str:
+    """Cache-key name of the backend that produced `meta`."""
+    return http_url if meta.get('backend') == 'http' else meta.get('backend')
+
+
+def _with_duration(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill meta['duration'] and share it with `audio_info`, so the editor does not probe the file."""
+    try:
+        if meta.get('duration') is not None:
+            audio_info.remember(meta['path'], meta['duration'])
+        else:
+            meta['duration'] = audio_info.try_duration(meta['path'])
+    except OSError:
+        meta.setdefault('duration', None)
+    return meta
+
+
+PAUSE_MS = int(os.environ.get('TTS_PAUSE_MS', '0'))
+TRIM_SILENCE = os.environ.get('TTS_TRIM_SILENCE', '').lower() in ('1', 'true', 'yes')
+WORKERS = int(os.environ.get('TTS_WORKERS', '1'))
+
+
+def _wav_format(path: str):
+    with wave.open(path, 'rb') as w:
+        return w.getnchannels(), w.getsampwidth(), w.getframerate()
+
+
+def _convert_wav(src: str, dst: str, fmt) -> str:
+    """Resample/remix `src` to (channels, sample width, rate) with ffmpeg."""
+    channels, width, rate = fmt
+    codec = {1: 'pcm_u8', 2: 'pcm_s16le', 3: 'pcm_s24le', 4: 'pcm_s32le'}[width]
+    subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-i', src, '-ac', str(channels), '-ar', str(rate),
+                    '-c:a', codec, dst], check=True)
+    return dst
+
+
+def _loud_span(block: bytes, channels: int, threshold: int):
+    """(first, last+1) frame indices above `threshold` in a 16-bit block, or None."""
+    import numpy as np
+    samples = np.abs(np.frombuffer(block, dtype='<i2').reshape(-1, channels).astype(np.int32)).max(axis=1)
+    loud = np.flatnonzero(samples > threshold)
+    return (int(loud[0]), int(loud[-1]) + 1) if loud.size else None
+
+
+def _copy_frames(w, out, block_frames: int, trim: bool, threshold: int):
+    """Copy frames from reader `w` to writer `out`; with `trim` cut leading/trailing silence.
+
+    Cuts are at the first/last sample above `threshold`. Silence after the last
+    loud sample is held back and only written if sound follows, so one part is
+    never fully in memory.
+    """
+    channels, width = w.getnchannels(), w.getsampwidth()
+    trim = trim and width == 2
+    frame = channels * width
+    started = False
+    held = []
+    while True:
+        block = w.readframes(block_frames)
+        if not block:
+            break
+        if not trim:
+            out.writeframes(block)
+            continue
+        span = _loud_span(block, channels, threshold)
+        if span is None:
+            if started:
+                held.append(block)
             continue
-    return False
+        first, last = span
+        if started:
+            first = 0
+            for h in held:
+                out.writeframes(h)
+        started = True
+        out.writeframes(block[first * frame:last * frame])
+        held = [block[last * frame:]]
 
 
-def tts_to_wav(text: str, out_path: str, voice: Optional[str] = None, speed: Optional[float] = None, rate: Optional[int] = None, http_url: Optional[str] = None) -> Dict[str, Any]:
-    """Generate WAV from text and return metadata dict.
+def concat_wavs(paths: Iterable[str], out_path: str, pause_ms: Optional[int] = None,
+                trim: Optional[bool] = None, block_frames: int = 4096, threshold: int = 200) -> str:
+    """Join WAV files into `out_path` sample-accurately, one block at a time.
 
-    Returns: {'path': str, 'voice': str|null, 'backend': str, 'format': 'wav'}
+    Parts whose format differs from the first one are converted with ffmpeg.
+    `pause_ms` of digital silence goes between parts (default `TTS_PAUSE_MS`);
+    `trim` cuts the silence backends pad each part with (default
+    `TTS_TRIM_SILENCE`, 16-bit audio only), so the pause is exactly what is set.
+    """
+    paths = [str(p) for p in paths]
+    if not paths:
+        raise ValueError('no WAV files to join')
+    pause_ms = PAUSE_MS if pause_ms is None else int(pause_ms)
+    trim = TRIM_SILENCE if trim is None else bool(trim)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f'{out_path}.{os.getpid()}.tmp'
+    converted = []
+    try:
+        fmt = _wav_format(paths[0])
+        channels, width, rate = fmt
+        silence = (b'\x80' if width == 1 else b'\x00' * width) * channels * (rate * max(0, pause_ms) // 1000)
+        with wave.open(tmp, 'wb') as out:
+            out.setnchannels(channels)
+            out.setsampwidth(width)
+            out.setframerate(rate)
+            for i, p in enumerate(paths):
+                if _wav_format(p) != fmt:
+                    p = _convert_wav(p, f'{tmp}.{i}.wav', fmt)
+                    converted.append(p)
+                if i and silence:
+                    out.writeframes(silence)
+                with wave.open(p, 'rb') as w:
+                    _copy_frames(w, out, block_frames, trim, threshold)
+            frames = out.getnframes()
+        os.replace(tmp, out_path)
+        audio_info.remember(out_path, frames / rate)
+    finally:
+        for f in [tmp, *converted]:
+            if os.path.exists(f):
+                os.remove(f)
+    return str(out_path)
+
+
+def tts_sentences_to_wav(sentences: Iterable[str], out_path: str, voice: Optional[str] = None,
+                         speed: Optional[float] = None, http_url: Optional[str] = None,
+                         workers: int = 2, use_cache: bool = True, pause_ms: Optional[int] = None,
+                         trim: Optional[bool] = None) -> Dict[str, Any]:
+    """Synthesize sentences as they arrive (e.g. from `llm.stream_sentences`) and join them.
+
+    Each sentence goes through `tts_to_wav` (so it is cached on its own) on a
+    small thread pool while the iterator keeps producing; the parts are joined
+    in order with `concat_wavs`. If the parts cannot be joined (e.g. a format
+    conversion fails) the whole text is synthesized in one call.
+
+    Returns `tts_to_wav` metadata plus 'text', 'sentences' and
+    'firstAudioSeconds' (time from the call to the first finished sentence).
     """
     out_path = str(out_path)
+    parts_dir = Path(out_path).with_suffix('.parts')
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    first = []
+
+    def synth(i, sentence):
+        meta = tts_to_wav(sentence, str(parts_dir / f'{i:04d}.wav'), voice=voice, speed=speed,
+                          http_url=http_url, use_cache=use_cache)
+        if not first:
+            first.append(time.perf_counter() - t0)
+        return meta
+
+    texts, futures = [], []
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='tts-sentence') as ex:
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if sentence:
+                futures.append(ex.submit(synth, len(texts), sentence))
+                texts.append(sentence)
+        parts = [f.result() for f in futures]
+    if not parts:
+        raise ValueError('no text to synthesize')
 
-    # Try Coqui TTS first (if installed)
+    text = ' '.join(texts)
     try:
-        from TTS.api import TTS
-        tts = TTS()
-        # Best-effort: if voice is provided, pass as 'speaker' kwarg
-        kwargs = {}
-        if voice:
-            kwargs['speaker'] = voice
+        meta = _join_parts(parts, out_path, pause_ms, trim)
+    except Exception:
+        meta = tts_to_wav(text, out_path, voice=voice, speed=speed, http_url=http_url, use_cache=use_cache)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    meta.update(text=text, sentences=len(texts), firstAudioSeconds=round(first[0], 3) if first else None)
+    return meta
+
+
+def _join_parts(parts: list, out_path: str, pause_ms: Optional[int], trim: Optional[bool]) -> Dict[str, Any]:
+    concat_wavs([m['path'] for m in parts], out_path, pause_ms=pause_ms, trim=trim)
+    backends = sorted({m.get('backend') for m in parts if m.get('backend')})
+    return _with_duration(dict(parts[0], path=out_path, backend='+'.join(backends) or parts[0].get('backend'),
+                               cached=all(m.get('cached') for m in parts), duration=None))
+
+
+def _synth_part(args) -> Dict[str, Any]:
+    text, out_path, voice, speed, rate, http_url, use_cache = args
+    return tts_to_wav(text, out_path, voice=voice, speed=speed, rate=rate, http_url=http_url, use_cache=use_cache)
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool(workers: Optional[int] = None, broken: Optional[ProcessPoolExecutor] = None) -> ProcessPoolExecutor:
+    """Long-lived spawn pool, so each worker process loads its TTS engines once.
+
+    The size is `TTS_WORKERS`; `workers` only raises it when the pool is first
+    created. The pool is shared by every call in this process whatever its
+    chunk count and never shut down under another caller's running `map`. It
+    is replaced after a fork, or when a caller passes the pool that raised
+    `BrokenProcessPool` as `broken` (unless another caller already did).
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid() or (broken is not None and _pool is broken):
+            # a broken pool has no live futures left; an inherited one belongs to the parent
+            _pool = ProcessPoolExecutor(max_workers=max(WORKERS, workers or 0, 1),
+                                        mp_context=multiprocessing.get_context('spawn'))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def tts_to_wav_chunked(text: str, out_path: str, voice: Optional[str] = None, speed: Optional[float] = None,
+                       rate: Optional[int] = None, http_url: Optional[str] = None, use_cache: bool = True,
+                       workers: Optional[int] = None, pause_ms: Optional[int] = None,
+                       trim: Optional[bool] = None, min_chars: int = 40,
+                       executor: str = 'process') -> Dict[str, Any]:
+    """Split `text` at sentence boundaries, synthesize the chunks concurrently and join them.
+
+    Chunks run on a process pool (`executor='thread'` for backends that are
+    subprocesses anyway, e.g. Piper/espeak CLI) with `workers` processes
+    (default `TTS_WORKERS`); each chunk goes through `tts_to_wav` with the usual
+    backend order and cache. Parts are joined by `concat_wavs` with `pause_ms`
+    between sentences. Short texts or `workers < 2` use a single `tts_to_wav`.
+
+    Returns `tts_to_wav` metadata plus 'chunks'.
+    """
+    out_path = str(out_path)
+    workers = WORKERS if workers is None else int(workers)
+    chunks = list(split_sentences([text], min_chars=min_chars))
+    if workers < 2 or len(chunks) < 2:
+        return dict(tts_to_wav(text, out_path, voice=voice, speed=speed, rate=rate, http_url=http_url,
+                               use_cache=use_cache), chunks=1)
+
+    pause_ms = PAUSE_MS if pause_ms is None else int(pause_ms)
+    trim = TRIM_SILENCE if trim is None else bool(trim)
+    key = None
+    if use_cache and tts_cache.enabled():
+        backend = _preferred_backend(http_url)
+        key = tts_cache.make_key(text, voice, speed, backend=f'{backend}|chunks:{pause_ms}:{int(trim)}', rate=rate)
+        hit = tts_cache.get(key, out_path)
+        if hit:
+            return _with_duration(hit)
+
+    parts_dir = Path(out_path).with_suffix('.parts')
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(c, str(parts_dir / f'{i:04d}.wav'), voice, speed, rate, http_url, use_cache)
+            for i, c in enumerate(chunks)]
+    try:
+        if executor == 'thread':
+            with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix='tts-chunk') as ex:
+                parts = list(ex.map(_synth_part, jobs))
+        else:
+            pool = _process_pool(workers)
+            try:
+                parts = list(pool.map(_synth_part, jobs))
+            except BrokenProcessPool:
+                # a worker died (e.g. killed while loading a model); retry once on a fresh pool
+                parts = list(_process_pool(workers, broken=pool).map(_synth_part, jobs))
+        meta = _join_parts(parts, out_path, pause_ms, trim)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+    meta.update(cached=False, chunks=len(chunks))
+    # a chunk that fell back to another backend would pin the mix under the preferred backend's key
+    if key and all(_backend_name(m, http_url) == backend for m in parts):
         try:
-            tts.tts_to_file(text=text, file_path=out_path, **kwargs)
-        except TypeError:
-            # model may not accept speaker arg
-            tts.tts_to_file(text=text, file_path=out_path)
+            tts_cache.put(key, out_path, meta)
+        except Exception:
+            pass
+    return meta
+
+
+def _synthesize(text: str, out_path: str, voice: Optional[str], speed: Optional[float], rate: Optional[int], http_url: Optional[str]) -> Dict[str, Any]:
+    # Try Coqui TTS first (if installed); the model is loaded once per process
+    try:
+        def _coqui(tts):
+            # Best-effort: if voice is provided, pass as 'speaker' kwarg
+            kwargs = {}
+            if voice:
+                kwargs['speaker'] = voice
+            try:
+                tts.tts_to_file(text=text, file_path=out_path, **kwargs)
+            except TypeError:
+                # model may not accept speaker arg
+                tts.tts_to_file(text=text, file_path=out_path)
+
+        tts_engines.get_engine('coqui').call(_coqui)
         return {'path': out_path, 'voice': voice or 'coqui_default', 'backend': 'coqui', 'format': 'wav'}
     except Exception:
         pass
@@ -109,9 +435,15 @@ def tts_to_wav(text: str, out_path: str, voice: Optional[str] = None, speed: Opt
         except Exception:
             pass
 
-    # Try Piper CLI
+    # Try Piper: a long-lived process per voice, else one CLI call per utterance
+    try:
+        if piper_server.enabled():
+            piper_server.synthesize(text, out_path, voice, speed)
+            return {'path': out_path, 'voice': voice, 'backend': 'piper', 'format': 'wav'}
+    except Exception:
+        pass
     try:
-        if shutil.which('piper'):
+        if shutil.which(piper_server.binary()):
             cmd = _choose_piper_cmd(out_path, text, voice, speed)
             subprocess.run(cmd, check=True)
             if Path(out_path).exists():
@@ -119,34 +451,39 @@ def tts_to_wav(text: str, out_path: str, voice: Optional[str] = None, speed: Opt
     except Exception:
         pass
 
-    # Fallback: pyttsx3 (offline)
+    # Fallback: pyttsx3 (offline); the engine is shared and lives on its own thread
     try:
-        import pyttsx3
+        def _pyttsx3(state):
+            engine = state.engine
+            # rate: prefer explicit rate param; otherwise use speed multiplier if provided
+            if rate:
+                engine.setProperty('rate', rate)
+            elif speed is not None:
+                # pyttsx3 rate is words per minute; choose a baseline 200
+                engine.setProperty('rate', int(200 * float(speed)))
+            else:
+                engine.setProperty('rate', state.rate)
 
-        engine = pyttsx3.init()
-        # rate: prefer explicit rate param; otherwise use speed multiplier if provided
-        if rate:
-            engine.setProperty('rate', rate)
-        elif speed is not None:
-            # pyttsx3 rate is words per minute; choose a baseline 200
-            engine.setProperty('rate', int(200 * float(speed)))
+            used_voice = None
+            engine.setProperty('voice', state.voice)
+            if voice:
+                voices = engine.getProperty('voices')
+                # try to match by id or name substring
+                for v in voices:
+                    if voice in v.id or voice in getattr(v, 'name', ''):
+                        engine.setProperty('voice', v.id)
+                        used_voice = getattr(v, 'name', v.id)
+                        break
 
-        used_voice = None
-        if voice:
-            voices = engine.getProperty('voices')
-            # try to match by id or name substring
-            for v in voices:
-                if voice in v.id or voice in getattr(v, 'name', ''):
-                    engine.setProperty('voice', v.id)
-                    used_voice = getattr(v, 'name', v.id)
-                    break
-
-        tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        tmp_path = tmp.name
-        tmp.close()
-        engine.save_to_file(text, tmp_path)
-        engine.runAndWait()
-        os.replace(tmp_path, out_path)
+            tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+            tmp_path = tmp.name
+            tmp.close()
+            engine.save_to_file(text, tmp_path)
+            engine.runAndWait()
+            os.replace(tmp_path, out_path)
+            return used_voice
+
+        used_voice = tts_engines.get_engine('pyttsx3').call(_pyttsx3)
         return {'path': out_path, 'voice': used_voice or voice or 'pyttsx3_default', 'backend': 'pyttsx3', 'format': 'wav'}
     except Exception:
         pass
@@ -178,50 +515,10 @@ def tts_to_wav(text: str, out_path: str, voice: Optional[str] = None, speed: Opt
     raise RuntimeError('No available TTS backend (install Coqui TTS, Piper CLI or pyttsx3).')
 
 
-def list_voices() -> dict:
-    """Return available voices per backend (best-effort)."""
-    res = {}
-    # pyttsx3
-    try:
-        import pyttsx3
-        engine = pyttsx3.init()
-        voices = engine.getProperty('voices')
-        res['pyttsx3'] = [getattr(v, 'name', v.id) for v in voices]
-    except Exception:
-        res['pyttsx3'] = []
-
-    # piper
-    try:
-        if shutil.which('piper'):
-            out = subprocess.check_output(['piper', '--list-voices'], text=True)
-            # try to parse lines
-            lines = [l.strip() for l in out.splitlines() if l.strip()]
-            res['piper'] = lines
-        else:
-            res['piper'] = []
-    except Exception:
-        res['piper'] = []
-
-    # espeak
-    try:
-        espeak_bin = 'espeak'
-        if shutil.which('espeak') is None and shutil.which('espeak-ng') is not None:
-            espeak_bin = 'espeak-ng'
-        out = subprocess.check_output([espeak_bin, '--voices'], text=True)
-        lines = [l.strip() for l in out.splitlines() if l.strip()]
-        res['espeak'] = lines
-    except Exception:
-        res['espeak'] = []
-
-    # coqui: not standardized — return empty or models if available
-    try:
-        from TTS.api import TTS
-        models = TTS.list_models() if hasattr(TTS, 'list_models') else []
-        res['coqui_models'] = models
-    except Exception:
-        res['coqui_models'] = []
-
-    return res
+def list_voices(refresh: bool = False) -> dict:
+    """Return available voices per backend (best-effort), from the cached `voices` inventory."""
+    from . import voices
+    return voices.by_backend(refresh)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,60 @@
+"""Dyskowy cache zsyntezowanej mowy adresowany treścią.
+
+Klucz to SHA-256 znormalizowanych wejść (tekst, głos, tempo, backend), wpis to
+`<klucz>.wav` + `<klucz>.json` (metadane); eksmisja LRU po rozmiarze (patrz
+`disk_cache`).
+
+Konfiguracja: `TTS_CACHE_DIR` (domyślnie outputs/cache/tts),
+`TTS_CACHE_MAX_BYTES` (domyślnie 512 MiB), `TTS_CACHE_DISABLE=1` wyłącza cache.
+"""
+import os
+from typing import Optional
+
+from .disk_cache import DiskCache, hash_key
+
+_cache = DiskCache(
+    os.environ.get('TTS_CACHE_DIR', os.path.join('outputs', 'cache', 'tts')),
+    int(os.environ.get('TTS_CACHE_MAX_BYTES', str(512 * 1024 * 1024))),
+    '.wav',
+)
+
+
+def enabled() -> bool:
+    return os.environ.get('TTS_CACHE_DISABLE', '').lower() not in ('1', 'true', 'yes')
+
+
+def make_key(text: str, voice: Optional[str] = None, speed=None, backend: Optional[str] = None,
+             rate: Optional[int] = None) -> str:
+    """Hash normalized synthesis inputs; whitespace-only differences share a key."""
+    try:
+        speed = round(float(speed), 3) if speed is not None else None
+    except (TypeError, ValueError):
+        speed = str(speed)
+    return hash_key({
+        'text': ' '.join((text or '').split()),
+        'voice': voice or None,
+        'speed': speed,
+        'rate': int(rate) if rate else None,
+        'backend': backend or None,
+    })
+
+
+def get(key: str, out_path: Optional[str] = None) -> Optional[dict]:
+    """Return cached metadata or None; with `out_path` the data is copied there ('path')."""
+    return _cache.get(key, out_path)
+
+
+def put(key: str, src_path: str, meta: dict) -> dict:
+    return _cache.put(key, src_path, meta)
+
+
+def put_bytes(key: str, data: bytes, meta: dict) -> dict:
+    return _cache.put_bytes(key, data, meta)
+
+
+def stats() -> dict:
+    return _cache.stats()
+
+
+def clear():
+    _cache.clear()
@@ -0,0 +1,155 @@
+"""Długo żyjące silniki TTS ładowane raz na proces.
+
+Coqui `TTS()` i `pyttsx3.init()` są drogie w tworzeniu i nie są bezpieczne
+wątkowo, więc każdy silnik (backend + model) ma własny wątek roboczy, który
+ładuje model raz i obsługuje zlecenia z ograniczonej kolejki. Rejestr jest
+bezpieczny dla wielu wątków (gunicorn --threads) i odtwarza się po fork().
+
+`call()` czeka najwyżej `TTS_CALL_TIMEOUT` s (domyślnie 300, razem z kolejką):
+zlecenie, które jeszcze czeka, jest anulowane, a gdy zawiesi się samo
+wywołanie (np. `runAndWait` pyttsx3 na zepsutym sterowniku audio), silnik jest
+oznaczany jako zablokowany i kolejne zlecenia od razu dostają błąd, aż
+wywołanie się skończy — wołający przechodzi do następnego backendu.
+
+Użycie:
+    from yt_brainrot import tts_engines
+    tts_engines.get_engine('coqui').call(lambda tts: tts.tts_to_file(text=..., file_path=...))
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from types import SimpleNamespace
+from typing import Callable, Dict, Optional, Tuple
+
+QUEUE_SIZE = int(os.environ.get('TTS_QUEUE_SIZE', '16'))
+SUBMIT_TIMEOUT = float(os.environ.get('TTS_SUBMIT_TIMEOUT', '30'))
+CALL_TIMEOUT = float(os.environ.get('TTS_CALL_TIMEOUT', '300'))
+
+
+def _load_coqui(model: Optional[str]):
+    from TTS.api import TTS
+    return TTS(model) if model else TTS()
+
+
+def _load_pyttsx3(model: Optional[str]):
+    import pyttsx3
+    engine = pyttsx3.init()
+    # remember defaults so per-call rate/voice changes can be undone
+    return SimpleNamespace(engine=engine, rate=engine.getProperty('rate'),
+                           voice=engine.getProperty('voice'))
+
+
+LOADERS: Dict[str, Callable[[Optional[str]], object]] = {
+    'coqui': _load_coqui,
+    'pyttsx3': _load_pyttsx3,
+}
+
+
+class EngineWorker:
+    """Owns one loaded engine and runs every call on its own thread."""
+
+    def __init__(self, backend: str, model: Optional[str] = None, max_queue: int = QUEUE_SIZE):
+        self.backend = backend
+        self.model = model
+        self.ready = threading.Event()
+        self.load_error: Optional[BaseException] = None
+        # a call a caller gave up on while it was running
+        self._timed_out: Optional[Future] = None
+        self._engine = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name=f'tts-{backend}', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._engine = LOADERS[self.backend](self.model)
+        except BaseException as e:
+            self.load_error = e
+        self.ready.set()
+        while True:
+            fn, fut = self._queue.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            if self.load_error is not None:
+                fut.set_exception(self.load_error)
+                continue
+            try:
+                fut.set_result(fn(self._engine))
+            except BaseException as e:
+                fut.set_exception(e)
+
+    @property
+    def stuck(self) -> bool:
+        """True while a timed-out call is still occupying the worker thread."""
+        fut = self._timed_out
+        return fut is not None and not fut.done()
+
+    def submit(self, fn: Callable[[object], object], timeout: float = SUBMIT_TIMEOUT) -> Future:
+        """Queue `fn(engine)`; raises RuntimeError when the queue stays full."""
+        if self.load_error is not None:
+            raise RuntimeError(f'TTS backend {self.backend} failed to load: {self.load_error}')
+        if self.stuck:
+            raise RuntimeError(f'TTS backend {self.backend} is stuck in a call that timed out')
+        fut: Future = Future()
+        try:
+            self._queue.put((fn, fut), timeout=timeout)
+        except queue.Full:
+            raise RuntimeError(f'TTS backend {self.backend} is busy ({self._queue.maxsize} requests queued)')
+        return fut
+
+    def call(self, fn: Callable[[object], object], timeout: Optional[float] = CALL_TIMEOUT):
+        """Run `fn(engine)` on the worker thread; RuntimeError if it takes longer than `timeout`."""
+        fut = self.submit(fn)
+        try:
+            return fut.result(timeout)
+        except FutureTimeout:
+            if not fut.cancel():
+                # already running: the thread cannot be interrupted, keep new work off it
+                self._timed_out = fut
+            raise RuntimeError(f'TTS backend {self.backend} did not finish within {timeout}s')
+
+    def status(self) -> dict:
+        return {
+            'backend': self.backend,
+            'model': self.model,
+            'ready': self.ready.is_set(),
+            'error': str(self.load_error) if self.load_error else None,
+            'stuck': self.stuck,
+            'queued': self._queue.qsize(),
+        }
+
+
+_workers: Dict[Tuple[str, Optional[str]], EngineWorker] = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def get_engine(backend: str, model: Optional[str] = None) -> EngineWorker:
+    """Return the process-wide worker for (backend, model), starting it on first use."""
+    global _pid
+    if backend not in LOADERS:
+        raise ValueError(f'Unknown TTS backend: {backend}')
+    with _lock:
+        if _pid != os.getpid():
+            # worker threads do not survive fork (gunicorn --preload)
+            _workers.clear()
+            _pid = os.getpid()
+        w = _workers.get((backend, model))
+        if w is None:
+            w = EngineWorker(backend, model)
+            _workers[(backend, model)] = w
+        return w
+
+
+def warm_up(backends=('coqui', 'pyttsx3'), timeout: Optional[float] = None) -> dict:
+    """Start and wait for the given backends; returns their status."""
+    workers = [get_engine(b) for b in backends]
+    for w in workers:
+        w.ready.wait(timeout)
+    return {w.backend: w.status() for w in workers}
+
+
+def status() -> list:
+    with _lock:
+        return [w.status() for w in _workers.values()]
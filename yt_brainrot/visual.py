@@ -1,18 +1,124 @@
 """Generowanie obrazu tła. Fallback: generuj prosty obraz 1080x1920 z tekstem.
 Opcjonalnie: można podpiąć Stable Diffusion (diffusers) jeśli dostępne.
+
+Fallback liczony jest na tablicach NumPy (gradient, pola szumu/plazmy mapowane
+przez paletę 256 kolorów), w kilku stylach (`STYLES`) powtarzalnych dla `seed`.
 """
 from PIL import Image, ImageDraw, ImageFont
-import random
+import numpy as np
 from pathlib import Path
 import os
-from . import sd_a1111
+from functools import lru_cache
+from typing import Optional
 import subprocess
 
 
-def create_background_from_prompt(prompt: str, out_path: str, size=(1080, 1920)) -> str:
+def _vertical_gradient(h: int, w: int, top, bottom) -> np.ndarray:
+    """uint8 (h, w, 3) gradient; one row is computed and broadcast."""
+    t = np.linspace(0.0, 1.0, h, dtype=np.float32)[:, None, None]
+    top = np.asarray(top, np.float32)
+    col = (top + t * (np.asarray(bottom, np.float32) - top)).astype(np.uint8)
+    return np.repeat(col, w, axis=1)
+
+
+def _palette(rng: np.random.Generator) -> np.ndarray:
+    """256-entry cosine palette; styles index it with a uint8 field (one lookup per pixel)."""
+    t = np.linspace(0.0, 1.0, 256, dtype=np.float32)[:, None]
+    phase = rng.uniform(0, 2 * np.pi, 3).astype(np.float32)
+    return (127.5 + 127.5 * np.cos(2 * np.pi * t + phase)).astype(np.uint8)
+
+
+def _draw_rings(img: Image.Image, rng: np.random.Generator, count: int = 30):
+    """Ring outlines at seeded positions; PIL draws them natively on the finished image."""
+    w, h = img.size
+    draw = ImageDraw.Draw(img)
+    for x, y, r, color in zip(rng.integers(0, w + 1, count), rng.integers(0, h + 1, count),
+                              rng.integers(20, 201, count), rng.integers(100, 256, (count, 3))):
+        draw.ellipse([x - r, y - r, x + r, y + r], outline=tuple(int(c) for c in color), width=2)
+
+
+def _style_gradient(h, w, rng):
+    return _vertical_gradient(h, w, (30, 10, 40), (230, 130, 200))
+
+
+def _style_plasma(h, w, rng):
+    y = np.linspace(0, 2 * np.pi, h, dtype=np.float32)[:, None]
+    x = np.linspace(0, 2 * np.pi, w, dtype=np.float32)[None, :]
+    fx, fy, fd = rng.uniform(2, 8, 3).astype(np.float32)
+    px, py, pd = rng.uniform(0, 2 * np.pi, 3).astype(np.float32)
+    # the x and y terms are separable: sin over one row/column, broadcast on add
+    v = np.sin(fd * (x + y) + pd)
+    v += np.sin(fx * x + px)
+    v += np.sin(fy * y + py)
+    idx = ((v + 3.0) * (255.0 / 6.0)).astype(np.uint8)
+    return np.take(_palette(rng), idx, axis=0)
+
+
+def _style_noise(h, w, rng):
+    # value noise: a coarse random grid upscaled bicubically, tinted by a gradient
+    coarse = rng.integers(0, 256, (max(2, h // 160), max(2, w // 160)), dtype=np.uint8)
+    field = np.asarray(Image.fromarray(coarse).resize((w, h), Image.BICUBIC), np.uint16)
+    t = np.linspace(0.0, 1.0, h, dtype=np.float32)[:, None, None]
+    top, bottom = rng.integers(0, 80, 3), rng.integers(150, 256, 3)
+    base = (top + t * (bottom - top)).astype(np.uint16)  # (h, 1, 3)
+    # base * (0.35 + 0.65 * field) in 8.8 fixed point
+    scale = 90 + (field * 166 >> 8)
+    return (base * scale[..., None] >> 8).astype(np.uint8)
+
+
+def _style_radial(h, w, rng):
+    cy, cx = rng.uniform(0.2, 0.8) * h, rng.uniform(0.2, 0.8) * w
+    yy = ((np.arange(h, dtype=np.float32) - cy) ** 2)[:, None]
+    xx = ((np.arange(w, dtype=np.float32) - cx) ** 2)[None, :]
+    d = np.sqrt(yy + xx) * np.float32(1.6 / np.hypot(h, w))
+    idx = (np.minimum(d, 1.0) * 255).astype(np.uint8)
+    # the palette carries both the inner->outer blend and the concentric bands
+    t = np.linspace(0.0, 1.0, 256, dtype=np.float32)[:, None]
+    inner, outer = rng.integers(150, 256, 3), rng.integers(0, 60, 3)
+    bands = 0.8 + 0.2 * (0.5 + 0.5 * np.cos(t / 1.6 * rng.uniform(40, 90)))
+    lut = ((inner + t * (outer - inner)) * bands).astype(np.uint8)
+    return np.take(lut, idx, axis=0)
+
+
+# styles that get ring outlines on top of the field
+RINGED = {'gradient'}
+
+STYLES = {
+    'gradient': _style_gradient,
+    'plasma': _style_plasma,
+    'noise': _style_noise,
+    'radial': _style_radial,
+}
+
+
+def render_background(size=(1080, 1920), style: str = 'gradient', seed: Optional[int] = None,
+                      grain: int = 0) -> Image.Image:
+    """Render a procedural background with NumPy; same (size, style, seed) -> same image.
+
+    `grain` adds +-grain of seeded per-pixel noise (costs roughly as much as the style itself).
+    """
+    if style not in STYLES:
+        raise ValueError(f'Unknown background style: {style} (available: {", ".join(STYLES)})')
+    w, h = size
+    rng = np.random.default_rng(seed)
+    arr = STYLES[style](h, w, rng)
+    if grain:
+        g = int(grain)
+        noise = rng.integers(-g, g + 1, (h, w, 1), dtype=np.int16)
+        arr = np.clip(arr + noise, 0, 255).astype(np.uint8)
+    img = Image.fromarray(arr, 'RGB')
+    if style in RINGED:
+        _draw_rings(img, rng)
+    return img
+
+
+def create_background_from_prompt(prompt: str, out_path: str, size=(1080, 1920),
+                                  style: str = 'gradient', seed: Optional[int] = None) -> str:
     out_path = str(out_path)
     # Prefer A1111 if available — generate at 720x1280 to save VRAM, then upscale later
     try:
+        # imported here: the procedural fallback should not pay for requests/urllib3
+        from . import sd_a1111
         host = os.environ.get('A1111_HOST', 'http://127.0.0.1:7860')
         if sd_a1111.is_server_alive(host):
             small_w, small_h = 720, 1280
@@ -25,44 +131,15 @@ def create_background_from_prompt(prompt: str, out_path: str, size=(1080, 1920))
     except Exception:
         pass
 
-    # Fallback: create simple gradient + text at requested size (default 1080x1920)
+    # Fallback: procedural background + text at requested size (default 1080x1920)
     try:
-        img = Image.new('RGB', size, color='black')
+        img = render_background(size, style=style, seed=seed)
         draw = ImageDraw.Draw(img)
-        # gradient
-        for y in range(size[1]):
-            r = int(30 + (y / size[1]) * 200)
-            g = int(10 + (y / size[1]) * 120)
-            b = int(40 + (y / size[1]) * 160)
-            draw.line([(0, y), (size[0], y)], fill=(r, g, b))
-
-        # draw noisy circles
-        for _ in range(30):
-            x = random.randint(0, size[0])
-            y = random.randint(0, size[1])
-            r = random.randint(20, 200)
-            color = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
-            draw.ellipse((x - r, y - r, x + r, y + r), outline=color, width=2)
 
         # overlay prompt text
-        try:
-            font = ImageFont.truetype("DejaVuSans-Bold.ttf", 42)
-        except Exception:
-            font = ImageFont.load_default()
-
-        lines = _wrap_text(prompt, font, size[0] - 80)
+        font = load_font("DejaVuSans-Bold.ttf", 42)
         y0 = 120
-        for line in lines:
-            # measure text size (font API may vary across Pillow versions)
-            try:
-                bbox = font.getbbox(line)
-                w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-            except Exception:
-                try:
-                    w, h = font.getsize(line)
-                except Exception:
-                    # fallback guess
-                    w, h = (len(line) * 10, 20)
+        for line, w, h in layout_text(prompt, font, size[0] - 80):
             draw.text(((size[0] - w) / 2, y0), line, font=font, fill=(255, 255, 255))
             y0 += h + 8
 
@@ -73,30 +150,65 @@ def create_background_from_prompt(prompt: str, out_path: str, size=(1080, 1920))
         raise
 
 
-def _wrap_text(text, font, max_width):
-    words = text.split()
-    lines = []
-    cur = ''
-    for w in words:
-        test = (cur + ' ' + w).strip()
-        # measure text width safely
+@lru_cache(maxsize=32)
+def load_font(name: str = "DejaVuSans-Bold.ttf", size: int = 42):
+    """Process-wide font cache; falls back to PIL's default bitmap font."""
+    try:
+        return ImageFont.truetype(name, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=8192)
+def measure_text(font, text: str):
+    """(width, height) of `text`; font API may vary across Pillow versions."""
+    try:
+        bbox = font.getbbox(text)
+        return bbox[2] - bbox[0], bbox[3] - bbox[1]
+    except Exception:
         try:
-            bbox = font.getbbox(test)
-            test_w = bbox[2] - bbox[0]
+            return tuple(font.getsize(text))
         except Exception:
-            try:
-                test_w = font.getsize(test)[0]
-            except Exception:
-                test_w = len(test) * 10
-        if test_w <= max_width:
-            cur = test
+            # fallback guess
+            return len(text) * 10, 20
+
+
+def _advance(font, text: str) -> float:
+    try:
+        return font.getlength(text)
+    except Exception:
+        return measure_text(font, text)[0]
+
+
+@lru_cache(maxsize=8192)
+def _word_advance(font, word: str) -> float:
+    return _advance(font, word)
+
+
+def layout_text(text: str, font, max_width: int):
+    """Greedy word wrap; returns [(line, width, height), ...].
+
+    Line widths grow by the memoized advance of each word plus a space, so
+    wrapping is linear in the text length; every finished line is measured once.
+    """
+    space = _word_advance(font, ' ')
+    lines, cur, cur_w = [], [], 0.0
+    for word in text.split():
+        word_w = _word_advance(font, word)
+        test_w = cur_w + space + word_w if cur else word_w
+        if test_w <= max_width or not cur:
+            cur.append(word)
+            cur_w = test_w
         else:
-            if cur:
-                lines.append(cur)
-            cur = w
+            lines.append(' '.join(cur))
+            cur, cur_w = [word], word_w
     if cur:
-        lines.append(cur)
-    return lines
+        lines.append(' '.join(cur))
+    return [(line, *measure_text(font, line)) for line in lines]
+
+
+def _wrap_text(text, font, max_width):
+    return [line for line, _, _ in layout_text(text, font, max_width)]
 
 
 if __name__ == '__main__':
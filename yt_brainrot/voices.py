@@ -0,0 +1,177 @@
+"""Inwentarz głosów TTS budowany leniwie i trzymany w pamięci.
+
+Pierwsze zapytanie sprawdza backendy równolegle (pyttsx3 przez współdzielony
+silnik z `tts_engines`, `piper --list-voices`, `espeak --voices`, modele
+Coqui) i zapamiętuje wynik. Kolejne zapytania dostają gotową listę; inwentarz
+budowany jest od nowa, gdy zmieni się odcisk backendów (ścieżka, rozmiar i
+mtime binarek / pakietów, sprawdzany co `VOICES_CHECK_INTERVAL` s, domyślnie
+30), po `VOICES_TTL` s (domyślnie 3600) albo na żądanie (`refresh=True`).
+
+Każdy głos to {'id', 'name', 'backend', 'language', 'gender'}; `id` to
+wartość, którą przyjmuje dany backend.
+"""
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from . import piper_server, tts_engines
+
+CHECK_INTERVAL = float(os.environ.get('VOICES_CHECK_INTERVAL', '30'))
+TTL = float(os.environ.get('VOICES_TTL', '3600'))
+PROBE_TIMEOUT = float(os.environ.get('VOICES_PROBE_TIMEOUT', '10'))
+
+
+def _voice(backend: str, vid: str, name: Optional[str] = None, language: Optional[str] = None,
+           gender: Optional[str] = None) -> dict:
+    return {'id': vid, 'name': name or vid, 'backend': backend, 'language': language, 'gender': gender}
+
+
+def _espeak_bin() -> str:
+    if shutil.which('espeak') is None and shutil.which('espeak-ng') is not None:
+        return 'espeak-ng'
+    return 'espeak'
+
+
+def _probe_pyttsx3() -> List[dict]:
+    if importlib.util.find_spec('pyttsx3') is None:
+        return []
+
+    def read(state):
+        out = []
+        for v in state.engine.getProperty('voices'):
+            langs = [l.decode('utf-8', 'replace') if isinstance(l, bytes) else str(l)
+                     for l in (getattr(v, 'languages', None) or [])]
+            out.append(_voice('pyttsx3', v.id, getattr(v, 'name', None) or v.id,
+                              (langs[0].lstrip('\x05') if langs else None), getattr(v, 'gender', None)))
+        return out
+    return tts_engines.get_engine('pyttsx3').call(read, timeout=PROBE_TIMEOUT)
+
+
+def _probe_piper() -> List[dict]:
+    if shutil.which(piper_server.binary()) is None:
+        return []
+    out = subprocess.check_output([piper_server.binary(), '--list-voices'], text=True, timeout=PROBE_TIMEOUT)
+    voices = []
+    for line in out.splitlines():
+        vid = line.strip()
+        if not vid:
+            continue
+        # model names look like pl_PL-gosia-medium
+        m = re.match(r'([a-z]{2,3}_[A-Z]{2})-', vid)
+        voices.append(_voice('piper', vid, language=m.group(1) if m else None))
+    return voices
+
+
+def _probe_espeak() -> List[dict]:
+    binary = _espeak_bin()
+    if shutil.which(binary) is None:
+        return []
+    out = subprocess.check_output([binary, '--voices'], text=True, timeout=PROBE_TIMEOUT)
+    voices = []
+    # Pty Language       Age/Gender VoiceName          File                 Other Languages
+    for line in out.splitlines()[1:]:
+        cols = line.split()
+        if len(cols) < 4:
+            continue
+        gender = {'M': 'male', 'F': 'female'}.get(cols[2].split('/')[-1].upper())
+        voices.append(_voice(binary, cols[1], cols[3], cols[1], gender))
+    return voices
+
+
+def _probe_coqui() -> List[dict]:
+    if importlib.util.find_spec('TTS') is None:
+        return []
+    from TTS.api import TTS
+    models = TTS.list_models() if hasattr(TTS, 'list_models') else []
+    if hasattr(models, 'list_models'):  # newer versions return a ModelManager
+        models = models.list_models()
+    voices = []
+    for name in models or []:
+        parts = str(name).split('/')
+        voices.append(_voice('coqui', str(name), language=parts[1] if len(parts) > 2 else None))
+    return voices
+
+
+PROBES: Dict[str, Callable[[], List[dict]]] = {
+    'pyttsx3': _probe_pyttsx3,
+    'piper': _probe_piper,
+    'espeak': _probe_espeak,
+    'coqui': _probe_coqui,
+}
+
+
+def _stat(path: Optional[str]):
+    try:
+        st = os.stat(path)
+        return (path, st.st_size, int(st.st_mtime))
+    except (OSError, TypeError):
+        return None
+
+
+def fingerprint() -> tuple:
+    """Cheap identity of the installed backends (no imports, no subprocesses)."""
+    items = []
+    for binary in (piper_server.binary(), 'espeak', 'espeak-ng'):
+        items.append(_stat(shutil.which(binary)))
+    for module in ('pyttsx3', 'TTS'):
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError):
+            spec = None
+        items.append(_stat(spec.origin if spec else None))
+    return tuple(items)
+
+
+_state: dict = {'inventory': None, 'fingerprint': None, 'built': 0.0, 'checkedAt': 0.0}
+_lock = threading.Lock()
+
+
+def _build() -> dict:
+    t0 = time.perf_counter()
+    backends = {}
+
+    def run(name):
+        start = time.perf_counter()
+        try:
+            voices, error = PROBES[name](), None
+        except Exception as e:
+            voices, error = [], str(e) or type(e).__name__
+        backends[name] = {'count': len(voices), 'seconds': round(time.perf_counter() - start, 3), 'error': error}
+        return voices
+
+    with ThreadPoolExecutor(max_workers=len(PROBES), thread_name_prefix='voices') as ex:
+        results = list(ex.map(run, PROBES))
+    return {'voices': [v for vs in results for v in vs], 'backends': backends,
+            'builtAt': time.time(), 'buildSeconds': round(time.perf_counter() - t0, 3)}
+
+
+def inventory(refresh: bool = False) -> dict:
+    """Cached voice inventory; built on first use and when backends change."""
+    with _lock:
+        now = time.monotonic()
+        inv = _state['inventory']
+        stale = refresh or inv is None or now - _state['built'] > TTL
+        if not stale and now - _state['checkedAt'] > CHECK_INTERVAL:
+            _state['checkedAt'] = now
+            stale = fingerprint() != _state['fingerprint']
+        if stale:
+            _state['fingerprint'] = fingerprint()
+            _state['inventory'] = inv = _build()
+            _state['built'] = _state['checkedAt'] = time.monotonic()
+        return inv
+
+
+def by_backend(refresh: bool = False) -> dict:
+    """{backend: [voice names]} — the shape `tts.list_voices` has always returned."""
+    inv = inventory(refresh)
+    res = {name: [] for name in ('pyttsx3', 'piper', 'espeak', 'coqui_models')}
+    for v in inv['voices']:
+        key = 'coqui_models' if v['backend'] == 'coqui' else ('espeak' if v['backend'].startswith('espeak') else v['backend'])
+        res.setdefault(key, []).append(v['id'] if key == 'coqui_models' else v['name'])
+    return res